@@ -0,0 +1,4 @@
+"""
+Benchmarks de performance du Quiz TikTok.
+Exécutés par run_benchmarks.py à la racine du projet.
+"""
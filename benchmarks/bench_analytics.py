@@ -0,0 +1,73 @@
+"""
+Benchmarks des statistiques par question: coût de la capture sur le chemin
+des réponses et export d'une journée de live (CSV, et Parquet si pyarrow est installé).
+"""
+
+import os
+import random
+import tempfile
+from array import array
+
+from benchmarks.harness import benchmark
+from quiz_analytics import AnalyticsColumns, QuizAnalytics, load_pyarrow, write_analytics
+
+# Une journée chargée: 5000 questions, 1M réponses vérifiées
+DAY_QUESTIONS = 5000
+DAY_ANSWERS = 1_000_000
+
+_export_dir = tempfile.TemporaryDirectory(prefix="quiz_bench_analytics_")
+
+
+class _Question:
+    text = "Qui a peint la Joconde?"
+    answer = "Léonard de Vinci"
+    time_limit = 40
+
+
+def make_day_columns(seed: int = 42) -> AnalyticsColumns:
+    rng = random.Random(seed)
+    columns = AnalyticsColumns()
+    for number in range(DAY_QUESTIONS):
+        columns.questions.append(number % 1500)
+        columns.texts.append(f"Question numéro {number}: quelle est la bonne réponse?")
+        columns.answers.append(f"Réponse {number % 2000}")
+        columns.started_at.append(1_700_000_000 + number * 17.5)
+        columns.time_limits.append(40)
+        columns.first_correct_ms.append(rng.randrange(-1, 40000))
+        columns.attempts.append(rng.randrange(300))
+        columns.participants.append(rng.randrange(200))
+        columns.expired.append(rng.random() < 0.2)
+    columns.answer_rows = array("I", (rng.randrange(DAY_QUESTIONS) for _ in range(DAY_ANSWERS)))
+    columns.answer_latency_ms = array("I", (rng.randrange(40000) for _ in range(DAY_ANSWERS)))
+    columns.answer_correct = array("B", (rng.random() < 0.05 for _ in range(DAY_ANSWERS)))
+    return columns
+
+
+@benchmark("analytics.capture_comment_and_answer", number=100000)
+def bench_capture():
+    analytics = QuizAnalytics("bench", _export_dir.name)
+    analytics.start_question(0, _Question())
+    users = [f"viewer{i}" for i in range(1000)]
+    state = {"i": 0}
+
+    def operation():
+        i = state["i"] = (state["i"] + 1) % len(users)
+        analytics.comment(users[i])
+        analytics.answer(False)
+    return operation
+
+
+@benchmark("analytics.export_day_csv", number=1, repeat=3, quick=False)
+def bench_export_csv():
+    columns = make_day_columns()
+    path = os.path.join(_export_dir.name, "day")
+    return lambda: write_analytics(columns, path, "csv")
+
+
+if load_pyarrow() is not None:
+    # Sans pyarrow, l'export retomberait sur le CSV déjà mesuré ci-dessus
+    @benchmark("analytics.export_day_parquet", number=1, repeat=3, quick=False)
+    def bench_export_parquet():
+        columns = make_day_columns()
+        path = os.path.join(_export_dir.name, "day")
+        return lambda: write_analytics(columns, path, "parquet")
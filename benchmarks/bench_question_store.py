@@ -0,0 +1,189 @@
+"""
+Benchmarks de la représentation des questions: banque en colonnes et Question
+à __slots__ comparées aux anciennes classes (QuestionSpec par question, Question
+avec __dict__ et liste d'indices révélés), sur une banque synthétique de 100k questions.
+
+La mémoire par question se mesure à part:
+    python -m benchmarks.bench_question_store
+"""
+
+import json
+import random
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from benchmarks.harness import benchmark
+from question_bank import compile_question_bank
+
+BANK_SIZE = 100_000
+
+
+def make_questions_data(size: int = BANK_SIZE, seed: int = 42) -> List[Dict[str, Any]]:
+    """Banque synthétique: réponses et thèmes très répétés, comme les vraies banques importées"""
+    rng = random.Random(seed)
+    answers = [f"Réponse {i}" for i in range(2000)] + ["Paris", "Léonard de Vinci", "Mercure"]
+    themes = [f"Thème {i}" for i in range(40)]
+    data = []
+    for i in range(size):
+        question = {"text": f"Question numéro {i}: quelle est la bonne réponse?",
+                    "answer": rng.choice(answers), "theme": rng.choice(themes)}
+        if i % 10 == 0:
+            question["revealed_indices"] = [0, 2]
+        data.append(question)
+    return data
+
+
+# --- Anciennes classes, conservées ici comme référence de comparaison ----------
+
+class LegacyQuestionSpec(NamedTuple):
+    text: str
+    answer: str
+    revealed_indices: Optional[Tuple[int, ...]]
+    points: int
+    time_limit: int
+    theme: Optional[str]
+
+
+class LegacyQuestion:
+    def __init__(self, text, answer, revealed_indices=None, points=10, time_limit=40):
+        self.text = text
+        self.answer = answer
+        self.revealed_indices = revealed_indices or self.get_default_revealed_indices()
+        self.points = points
+        self.time_limit = time_limit
+        self.active = False
+        self.start_time = None
+
+    def get_default_revealed_indices(self):
+        answer_length = len(self.answer)
+        if answer_length <= 2:
+            return []
+        if answer_length <= 4:
+            return [random.randrange(answer_length)]
+        return random.sample(range(answer_length), max(1, int(answer_length * 0.25)))
+
+    def get_masked_answer(self):
+        masked = []
+        for i, char in enumerate(self.answer):
+            if i in self.revealed_indices or char == ' ':
+                masked.append(char)
+            else:
+                masked.append('_')
+        return ' '.join(masked)
+
+
+def legacy_compile(questions_data) -> Tuple[LegacyQuestionSpec, ...]:
+    return tuple(LegacyQuestionSpec(q["text"], q["answer"],
+                                    tuple(q["revealed_indices"]) if q.get("revealed_indices") else None,
+                                    q.get("points", 10), q.get("time_limit", 40), q.get("theme"))
+                 for q in questions_data)
+
+
+def legacy_load(bank) -> List[LegacyQuestion]:
+    return [LegacyQuestion(spec.text, spec.answer,
+                           list(spec.revealed_indices) if spec.revealed_indices else None,
+                           spec.points, spec.time_limit)
+            for spec in bank]
+
+
+def store_load(bank) -> List[Any]:
+    """Même chargement que QuizManager.load_questions"""
+    from quiz_manager import Question
+
+    return [Question(text, answer, points=points, time_limit=time_limit,
+                     revealed_mask=mask, masked_answer=masked)
+            for text, answer, mask, masked, points, time_limit in zip(
+                bank.texts, bank.answers, bank.revealed_masks, bank.masked_answers,
+                bank.points, bank.time_limits)]
+
+
+_json_text: List[str] = []
+
+
+def _questions_json() -> str:
+    if not _json_text:
+        _json_text.append(json.dumps(make_questions_data(), ensure_ascii=False))
+    return _json_text[0]
+
+
+def _questions_data() -> List[Dict[str, Any]]:
+    """Comme après json.load: une chaîne distincte par valeur, même répétée"""
+    return json.loads(_questions_json())
+
+
+# --- Temps de compilation et de chargement ----------------------------------
+
+@benchmark("question_store.compile_100k", number=1, repeat=3, quick=False)
+def bench_store_compile():
+    data = _questions_data()
+    return lambda: compile_question_bank(data)
+
+
+@benchmark("question_store.legacy_compile_100k", number=1, repeat=3, quick=False)
+def bench_legacy_compile():
+    data = _questions_data()
+    return lambda: legacy_compile(data)
+
+
+@benchmark("question_store.load_session_100k", number=1, repeat=3, quick=False)
+def bench_store_load():
+    bank = compile_question_bank(_questions_data())
+    return lambda: store_load(bank)
+
+
+@benchmark("question_store.legacy_load_session_100k", number=1, repeat=3, quick=False)
+def bench_legacy_load():
+    bank = legacy_compile(_questions_data())
+    return lambda: legacy_load(bank)
+
+
+@benchmark("question.get_masked_answer", number=100000)
+def bench_masked_answer():
+    from quiz_manager import Question
+
+    random.seed(42)
+    question = Question("Qui a peint la Joconde?", "Léonard de Vinci")
+    return question.get_masked_answer
+
+
+@benchmark("question.legacy_get_masked_answer", number=100000)
+def bench_legacy_masked_answer():
+    random.seed(42)
+    question = LegacyQuestion("Qui a peint la Joconde?", "Léonard de Vinci")
+    return question.get_masked_answer
+
+
+# --- Mémoire -------------------------------------------------------------------
+
+def measure_memory(build: Callable[[], Any]) -> int:
+    """Octets alloués (et toujours vivants) par la construction"""
+    tracemalloc.start()
+    try:
+        result = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    text = _questions_json()
+    legacy_bank = legacy_compile(json.loads(text))
+    store_bank = compile_question_bank(json.loads(text))
+    rows = [
+        # Le JSON décodé est libéré après compilation: seule la banque reste en mémoire
+        ("banque (compilée une fois par processus)",
+         measure_memory(lambda: legacy_compile(json.loads(text))),
+         measure_memory(lambda: compile_question_bank(json.loads(text)))),
+        ("questions d'une session",
+         measure_memory(lambda: legacy_load(legacy_bank)), measure_memory(lambda: store_load(store_bank))),
+    ]
+    print(f"Mémoire pour {BANK_SIZE} questions")
+    print(f"{'':<42} {'avant':>12} {'après':>12}")
+    for label, legacy, store in rows:
+        print(f"{label:<42} {legacy / BANK_SIZE:>9.0f} o/q {store / BANK_SIZE:>9.0f} o/q  ({store / legacy:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Benchmarks des chemins critiques du quiz: vérification des réponses,
+traitement des commentaires, classement, persistance des scores et
+chargement des banques de questions.
+"""
+
+import itertools
+import os
+import random
+import tempfile
+
+from benchmarks.harness import benchmark
+from question_bank import clear_question_bank_cache
+from validators import validate_questions_file
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+QUESTIONS_FILE = os.path.join(PROJECT_ROOT, "questionsAnglais.json")
+
+# Les fichiers de scores des benchmarks ne touchent jamais le vrai classement
+_scores_dir = tempfile.TemporaryDirectory(prefix="quiz_bench_")
+_scores_counter = itertools.count()
+
+
+def make_manager(users: int = 0, seed: int = 42):
+    """Crée un QuizManager isolé avec `users` joueurs au classement"""
+    from quiz_manager import QuizManager
+
+    scores_file = os.path.join(_scores_dir.name, f"scores_{next(_scores_counter)}.json")
+    manager = QuizManager(QUESTIONS_FILE, scores_file=scores_file,
+                          analytics_dir=os.path.join(_scores_dir.name, "analytics"))
+    rng = random.Random(seed)
+    manager.scores = {
+        f"user{i}": {"score": rng.randrange(10, 5000, 10), "name": f"Spectateur{i}"}
+        for i in range(users)
+    }
+    return manager
+
+
+def make_question(answer: str = "Léonard de Vinci"):
+    from quiz_manager import Question
+
+    random.seed(42)
+    return Question("Qui a peint la Joconde?", answer)
+
+
+# --- Question.check_answer ---------------------------------------------------
+
+@benchmark("check_answer.hit", number=20000)
+def bench_check_answer_hit():
+    question = make_question()
+    return lambda: question.check_answer("Léonard de Vinci")
+
+
+@benchmark("check_answer.hit_with_article", number=20000)
+def bench_check_answer_article():
+    question = make_question("Seine")
+    return lambda: question.check_answer("la seine")
+
+
+@benchmark("check_answer.miss", number=20000)
+def bench_check_answer_miss():
+    question = make_question()
+    return lambda: question.check_answer("Michel-Ange")
+
+
+@benchmark("check_answer.typo", number=20000)
+def bench_check_answer_typo():
+    question = make_question()
+    return lambda: question.check_answer("Léonadr de Vinci")
+
+
+@benchmark("check_answer.long_input", number=5000)
+def bench_check_answer_long():
+    question = make_question()
+    comment = "je pense que c'est vraiment " * 40
+    return lambda: question.check_answer(comment)
+
+
+# --- QuizManager.process_answer ---------------------------------------------
+
+@benchmark("process_answer.wrong_answer", number=10000)
+def bench_process_answer_wrong():
+    manager = make_manager(users=1000)
+    manager.next_question()
+    # 1000 spectateurs différents par question, comme pendant un live animé
+    users = [f"viewer{i}" for i in range(1000)]
+    state = {"i": 0}
+
+    def operation():
+        i = state["i"] = (state["i"] + 1) % len(users)
+        if i == 0:
+            manager.answered_users = []
+        manager.process_answer(users[i], "Spectateur", "mauvaise réponse")
+    return operation
+
+
+@benchmark("process_answer.rejected_noise", number=20000)
+def bench_process_answer_noise():
+    manager = make_manager(users=1000)
+    manager.next_question()
+    return lambda: manager.process_answer("viewer", "Spectateur", "salut tout le monde 😂😂")
+
+
+@benchmark("process_answer.correct_with_save", number=50)
+def bench_process_answer_correct():
+    manager = make_manager(users=1000)
+    question = manager.next_question()
+
+    def operation():
+        manager.answered_users = []
+        manager.correct_answer_found = False
+        manager.process_answer("winner", "Gagnant", question.answer)
+    return operation
+
+
+# --- QuizManager.get_leaderboard ---------------------------------------------
+
+@benchmark("get_leaderboard.1k_users", number=1000)
+def bench_leaderboard_1k():
+    manager = make_manager(users=1000)
+    return lambda: manager.get_leaderboard(10)
+
+
+@benchmark("get_leaderboard.100k_users", number=10, repeat=3)
+def bench_leaderboard_100k():
+    manager = make_manager(users=100_000)
+    return lambda: manager.get_leaderboard(10)
+
+
+@benchmark("get_leaderboard.1m_users", number=2, repeat=3, quick=False)
+def bench_leaderboard_1m():
+    manager = make_manager(users=1_000_000)
+    return lambda: manager.get_leaderboard(10)
+
+
+# --- Persistance des scores --------------------------------------------------
+
+@benchmark("save_scores.1k_users", number=50)
+def bench_save_scores_1k():
+    manager = make_manager(users=1000)
+    return manager.save_scores
+
+
+@benchmark("save_scores.100k_users", number=2, repeat=3, quick=False)
+def bench_save_scores_100k():
+    manager = make_manager(users=100_000)
+    return manager.save_scores
+
+
+@benchmark("load_scores.1k_users", number=50)
+def bench_load_scores_1k():
+    manager = make_manager(users=1000)
+    manager.save_scores()
+    return manager.load_scores
+
+
+@benchmark("load_scores.100k_users", number=2, repeat=3, quick=False)
+def bench_load_scores_100k():
+    manager = make_manager(users=100_000)
+    manager.save_scores()
+    return manager.load_scores
+
+
+# --- Banques de questions ----------------------------------------------------
+
+@benchmark("validate_questions_file.questionsAnglais", number=5)
+def bench_validate_questions_file():
+    return lambda: validate_questions_file(QUESTIONS_FILE)
+
+
+@benchmark("load_questions.questionsAnglais_cold", number=5)
+def bench_load_questions_cold():
+    manager = make_manager()
+
+    def operation():
+        clear_question_bank_cache()
+        manager.questions = []
+        manager.load_questions(QUESTIONS_FILE)
+    return operation
+
+
+@benchmark("load_questions.questionsAnglais_shared_bank", number=20)
+def bench_load_questions_cached():
+    manager = make_manager()
+
+    def operation():
+        manager.questions = []
+        manager.load_questions(QUESTIONS_FILE)
+    return operation
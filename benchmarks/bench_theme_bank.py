@@ -0,0 +1,49 @@
+"""
+Benchmarks des banques par thème: chargement d'un thème et tirage parmi
+plusieurs thèmes, comparés au chargement du fichier complet questionsAnglais.json.
+"""
+
+import os
+import random
+import tempfile
+
+from benchmarks.harness import benchmark
+from question_bank import clear_question_bank_cache, load_question_bank
+from theme_bank import bank_selection_path, build_theme_bank
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+QUESTIONS_FILE = os.path.join(PROJECT_ROOT, "questionsAnglais.json")
+
+_bank_dir = tempfile.TemporaryDirectory(prefix="quiz_bench_bank_")
+
+
+def bank_dir() -> str:
+    """Banque par thème construite une fois à partir de questionsAnglais.json"""
+    if not os.path.exists(os.path.join(_bank_dir.name, "catalog.json")):
+        build_theme_bank([QUESTIONS_FILE], _bank_dir.name)
+    return _bank_dir.name
+
+
+@benchmark("theme_bank.full_file_cold", number=5)
+def bench_full_file_cold():
+    def operation():
+        clear_question_bank_cache()
+        load_question_bank(QUESTIONS_FILE)
+    return operation
+
+
+@benchmark("theme_bank.one_theme_cold", number=20)
+def bench_one_theme_cold():
+    path = os.path.join(bank_dir(), "history.jsonl")
+
+    def operation():
+        clear_question_bank_cache()
+        load_question_bank(path)
+    return operation
+
+
+@benchmark("theme_bank.sample_20_from_3_themes", number=50)
+def bench_sample():
+    random.seed(42)
+    path = bank_selection_path(bank_dir(), ["history", "geography", "science_computers"], 20)
+    return lambda: load_question_bank(path)
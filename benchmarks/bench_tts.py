@@ -0,0 +1,58 @@
+"""
+Benchmarks de la chaîne de synthèse vocale avec le moteur muet: délai entre
+la mise en file d'une annonce et sa lecture, et rendu du cache audio.
+"""
+
+import itertools
+import tempfile
+import threading
+
+from benchmarks.harness import benchmark
+from tts_backends import NullBackend
+from tts_cache import TTSCache
+from tts_worker import PRIORITY_QUESTION, TTSWorker
+
+_cache_dir = tempfile.TemporaryDirectory(prefix="quiz_bench_tts_")
+
+
+class _SignalingBackend(NullBackend):
+    """Moteur muet qui signale chaque lecture terminée"""
+    def __init__(self):
+        super().__init__()
+        self.spoken_event = threading.Event()
+
+    def _speak(self, text: str):
+        self.spoken_event.set()
+
+
+@benchmark("tts.enqueue_to_speech_null", number=2000)
+def bench_enqueue_to_speech():
+    backend = _SignalingBackend()
+    worker = TTSWorker(lambda: backend, use_cache=False)
+    worker.start()
+    worker.ready.wait()
+    counter = itertools.count()
+
+    def operation():
+        backend.spoken_event.clear()
+        key = next(counter)
+        worker.set_current_question(key)
+        worker.speak(f"Question {key}", PRIORITY_QUESTION, key)
+        backend.spoken_event.wait()
+    return operation
+
+
+@benchmark("tts_cache.render_null", number=200)
+def bench_cache_render():
+    backend = NullBackend()
+    cache = TTSCache(_cache_dir.name, voice=backend.voice_id)
+    counter = itertools.count()
+    return lambda: cache.render(backend, f"Quelle est la capitale numéro {next(counter)}?")
+
+
+@benchmark("tts_cache.lookup_hit", number=20000)
+def bench_cache_lookup():
+    backend = NullBackend()
+    cache = TTSCache(_cache_dir.name, voice=backend.voice_id)
+    cache.render(backend, "Quiz terminé!")
+    return lambda: cache.get("Quiz terminé!")
@@ -0,0 +1,133 @@
+"""
+Outils communs des benchmarks: enregistrement, mesure et comparaison des résultats.
+"""
+
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+# Registre des benchmarks: {nom: Benchmark}
+BENCHMARKS: Dict[str, "Benchmark"] = {}
+
+
+class Benchmark:
+    """Un benchmark: une fonction de préparation qui retourne l'opération à chronométrer"""
+    def __init__(self, name: str, setup: Callable[[], Callable[[], Any]],
+                 number: int, repeat: int, quick: bool):
+        self.name = name
+        self.setup = setup
+        self.number = number
+        self.repeat = repeat
+        self.quick = quick  # inclus dans le mode rapide
+
+    def run(self) -> Dict[str, float]:
+        """Exécute le benchmark et retourne les temps par opération (µs)"""
+        operation = self.setup()
+        # Un tour à vide pour chauffer les caches
+        operation()
+        timings = []
+        gc_was_enabled = gc.isenabled()
+        gc.collect()
+        gc.disable()
+        try:
+            for _ in range(self.repeat):
+                start = time.perf_counter_ns()
+                for _ in range(self.number):
+                    operation()
+                timings.append((time.perf_counter_ns() - start) / self.number / 1000)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        return {
+            "median_us": statistics.median(timings),
+            "min_us": min(timings),
+            "max_us": max(timings),
+            "number": self.number,
+            "repeat": self.repeat,
+        }
+
+
+def benchmark(name: str, number: int = 1000, repeat: int = 5, quick: bool = True):
+    """Décorateur enregistrant une fonction de préparation de benchmark"""
+    def register(setup: Callable[[], Callable[[], Any]]):
+        if name in BENCHMARKS:
+            raise ValueError(f"Benchmark déjà défini: {name}")
+        BENCHMARKS[name] = Benchmark(name, setup, number, repeat, quick)
+        return setup
+    return register
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_benchmarks(name_filter: Optional[str] = None, quick: bool = False) -> Dict[str, Any]:
+    """Exécute les benchmarks sélectionnés et retourne un rapport sérialisable en JSON"""
+    results = {}
+    for name in sorted(BENCHMARKS):
+        bench = BENCHMARKS[name]
+        if name_filter and name_filter not in name:
+            continue
+        if quick and not bench.quick:
+            continue
+        result = bench.run()
+        results[name] = result
+        print(f"{name:<45} {result['median_us']:>12.2f} µs/op  (min {result['min_us']:.2f})")
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "git_revision": _git_revision(),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any],
+                    threshold: float = 0.10) -> List[str]:
+    """
+    Compare deux rapports et affiche l'évolution de chaque benchmark.
+
+    Returns:
+        list: Noms des benchmarks dont la médiane s'est dégradée de plus de `threshold`
+    """
+    regressions = []
+    print(f"{'benchmark':<45} {'avant':>12} {'après':>12} {'écart':>9}")
+    for name in sorted(set(baseline["results"]) | set(current["results"])):
+        old = baseline["results"].get(name)
+        new = current["results"].get(name)
+        if old is None or new is None:
+            status = "nouveau" if old is None else "absent"
+            print(f"{name:<45} {status:>12}")
+            continue
+        change = (new["median_us"] - old["median_us"]) / old["median_us"] if old["median_us"] else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  ⚠️ RÉGRESSION"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = "  ✅ amélioration"
+        print(f"{name:<45} {old['median_us']:>10.2f}µs {new['median_us']:>10.2f}µs {change:>+8.1%}{flag}")
+    return regressions
+
+
+def load_report(file_path: str) -> Dict[str, Any]:
+    with open(file_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_report(report: Dict[str, Any], file_path: str):
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=4)
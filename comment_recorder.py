@@ -0,0 +1,210 @@
+"""
+Enregistrement et rejeu des commentaires d'un live TikTok.
+Les commentaires reçus sont ajoutés à un fichier binaire compact, qui peut
+ensuite être rejoué hors ligne contre n'importe quelle banque de questions
+pour mesurer débit et latence du traitement des réponses.
+"""
+
+import asyncio
+import os
+import struct
+import time
+from datetime import datetime
+from typing import Iterator, NamedTuple, Optional
+
+from config import COMMENT_RECORDINGS_DIR, REPLAY_PAUSE_BETWEEN_QUESTIONS
+from logger_setup import logger
+from metrics import summarize_latencies
+
+# Format: en-tête puis enregistrements
+# <horodatage monotonic_ns:int64><len user_id:uint16><len nickname:uint16><len comment:uint16> + textes UTF-8
+RECORDING_MAGIC = b"QCR1\n"
+_RECORD_HEADER = struct.Struct("<qHHH")
+_MAX_FIELD_BYTES = 0xFFFF
+
+
+class RecordedComment(NamedTuple):
+    """Commentaire tel qu'il a été reçu pendant le live"""
+    timestamp_ns: int
+    user_id: str
+    nickname: str
+    comment: str
+
+
+def _encode_field(value) -> bytes:
+    return str(value or "").encode("utf-8")[:_MAX_FIELD_BYTES]
+
+
+class CommentRecorder:
+    """Écrit chaque commentaire reçu à la fin d'un fichier d'enregistrement"""
+    def __init__(self, file_path: str, flush_interval: float = 1.0):
+        self.file_path = file_path
+        self.flush_interval = flush_interval
+        self.records_written = 0
+        directory = os.path.dirname(file_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        new_file = not os.path.exists(file_path) or os.path.getsize(file_path) == 0
+        self._file = open(file_path, "ab", buffering=64 * 1024)
+        if new_file:
+            self._file.write(RECORDING_MAGIC)
+        self._last_flush = time.monotonic()
+
+    @classmethod
+    def for_stream(cls, tiktok_username: str, recordings_dir: str = COMMENT_RECORDINGS_DIR) -> "CommentRecorder":
+        """Crée un enregistrement horodaté pour un compte TikTok"""
+        file_name = f"{tiktok_username.lstrip('@')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.qcr"
+        return cls(os.path.join(recordings_dir, file_name))
+
+    def record(self, user_id: str, nickname: str, comment: str, timestamp_ns: Optional[int] = None):
+        """Ajoute un commentaire à l'enregistrement"""
+        if self._file is None:
+            return
+        user_bytes = _encode_field(user_id)
+        nickname_bytes = _encode_field(nickname)
+        comment_bytes = _encode_field(comment)
+        self._file.write(_RECORD_HEADER.pack(
+            timestamp_ns if timestamp_ns is not None else time.monotonic_ns(),
+            len(user_bytes), len(nickname_bytes), len(comment_bytes)
+        ))
+        self._file.write(user_bytes + nickname_bytes + comment_bytes)
+        self.records_written += 1
+
+        # Vider le tampon régulièrement pour ne pas perdre le live en cas de plantage
+        now = time.monotonic()
+        if now - self._last_flush >= self.flush_interval:
+            self._file.flush()
+            self._last_flush = now
+
+    def close(self):
+        """Vide le tampon et ferme le fichier"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            logger.info(f"Enregistrement fermé: {self.file_path} ({self.records_written} commentaires)")
+
+
+def read_recording(file_path: str) -> Iterator[RecordedComment]:
+    """
+    Lit un enregistrement de commentaires.
+
+    Un enregistrement tronqué (plantage pendant l'écriture) est lu jusqu'au
+    dernier commentaire complet.
+
+    Raises:
+        ValueError: Si le fichier n'est pas un enregistrement de commentaires
+    """
+    with open(file_path, "rb") as f:
+        if f.read(len(RECORDING_MAGIC)) != RECORDING_MAGIC:
+            raise ValueError(f"Le fichier {file_path} n'est pas un enregistrement de commentaires")
+        while True:
+            header = f.read(_RECORD_HEADER.size)
+            if len(header) < _RECORD_HEADER.size:
+                return
+            timestamp_ns, user_len, nickname_len, comment_len = _RECORD_HEADER.unpack(header)
+            payload = f.read(user_len + nickname_len + comment_len)
+            if len(payload) < user_len + nickname_len + comment_len:
+                logger.warning(f"Enregistrement tronqué: {file_path}")
+                return
+            yield RecordedComment(
+                timestamp_ns,
+                payload[:user_len].decode("utf-8", errors="replace"),
+                payload[user_len:user_len + nickname_len].decode("utf-8", errors="replace"),
+                payload[user_len + nickname_len:].decode("utf-8", errors="replace")
+            )
+
+
+class CommentReplayer:
+    """
+    Rejoue un enregistrement contre un QuizManager.
+
+    Le déroulement du quiz (expiration des questions, pause entre deux questions)
+    suit le temps de l'enregistrement, quelle que soit la vitesse de rejeu.
+    """
+    def __init__(self, quiz_manager, speed: Optional[float] = 1.0,
+                 pause_between_questions: float = REPLAY_PAUSE_BETWEEN_QUESTIONS,
+                 loop_questions: bool = True):
+        # speed=None: aussi vite que possible
+        if speed is not None and speed <= 0:
+            raise ValueError("La vitesse de rejeu doit être positive")
+        self.quiz_manager = quiz_manager
+        self.speed = speed
+        self.pause_ns = int(pause_between_questions * 1e9)
+        self.loop_questions = loop_questions
+        self.latencies_ns = []
+        self.comments = 0
+        self.correct_answers = 0
+        self.questions_asked = 0
+
+    def _start_next_question(self) -> bool:
+        question = self.quiz_manager.next_question()
+        if question is None and self.loop_questions and self.quiz_manager.questions:
+            self.quiz_manager.current_question_index = -1
+            question = self.quiz_manager.next_question()
+        if question is not None:
+            self.questions_asked += 1
+        return question is not None
+
+    async def replay(self, records) -> dict:
+        """Injecte les commentaires dans le quiz et retourne les statistiques du rejeu"""
+        manager = self.quiz_manager
+        process_answer = manager.process_answer
+        latencies = self.latencies_ns
+        first_ts = None
+        wall_start = time.perf_counter()
+        question_start_ns = 0
+        next_question_at_ns: Optional[int] = 0
+
+        for record in records:
+            if first_ts is None:
+                first_ts = record.timestamp_ns
+            offset_ns = record.timestamp_ns - first_ts
+
+            # Respecter le rythme de l'enregistrement
+            if self.speed is not None:
+                delay = offset_ns / 1e9 / self.speed - (time.perf_counter() - wall_start)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            # Faire avancer le quiz selon le temps de l'enregistrement
+            question = manager.current_question
+            if question is not None and question.active \
+                    and offset_ns - question_start_ns > question.time_limit * 1e9:
+                question.deactivate()
+                next_question_at_ns = offset_ns + self.pause_ns
+            if next_question_at_ns is not None and offset_ns >= next_question_at_ns:
+                if not self._start_next_question():
+                    break
+                question_start_ns = offset_ns
+                next_question_at_ns = None
+
+            self.comments += 1
+            started = time.perf_counter_ns()
+            is_correct, _ = process_answer(record.user_id, record.nickname, record.comment)
+            latencies.append(time.perf_counter_ns() - started)
+
+            if is_correct:
+                self.correct_answers += 1
+                manager.current_question.deactivate()
+                next_question_at_ns = offset_ns + self.pause_ns
+
+        elapsed = time.perf_counter() - wall_start
+        return {
+            "comments": self.comments,
+            "correct_answers": self.correct_answers,
+            "questions_asked": self.questions_asked,
+            "elapsed_seconds": elapsed,
+            "comments_per_second": self.comments / elapsed if elapsed > 0 else 0.0,
+            "latency": summarize_latencies(latencies),
+        }
+
+
+def print_replay_report(stats: dict):
+    """Affiche les statistiques d'un rejeu"""
+    latency = stats["latency"]
+    print("\n----- RÉSULTATS DU REJEU -----")
+    print(f"Commentaires traités: {stats['comments']} en {stats['elapsed_seconds']:.2f}s "
+          f"({stats['comments_per_second']:.0f}/s)")
+    print(f"Questions posées: {stats['questions_asked']} - bonnes réponses: {stats['correct_answers']}")
+    print(f"Latence process_answer: p50 {latency['p50_us']:.1f}µs, p90 {latency['p90_us']:.1f}µs, "
+          f"p99 {latency['p99_us']:.1f}µs, max {latency['max_us']:.1f}µs")
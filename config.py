@@ -34,4 +34,93 @@ WARNING_COLOR = "orange"
 # Configuration du TTS (Text-to-Speech)
 TTS_ENABLED = True  # Réactivé avec la nouvelle gestion des threads
 TTS_VOICE_RATE = 200  # Augmentation de la vitesse (était à 150)
-TTS_VOICE_VOLUME = 0.5  # Volume baissé (était à 0.8) 
\ No newline at end of file
+TTS_VOICE_VOLUME = 0.5  # Volume baissé (était à 0.8) 
+
+# Paramètres de reconnexion au live TikTok
+RECONNECT_BASE_DELAY = 1.0  # secondes, délai de la première tentative
+RECONNECT_MAX_DELAY = 30.0  # secondes, plafond du backoff exponentiel
+RECONNECT_FAILURE_THRESHOLD = 5  # échecs consécutifs avant ouverture du disjoncteur
+RECONNECT_CIRCUIT_COOLDOWN = 120  # secondes de pause quand le disjoncteur est ouvert
+
+# Paramètres du mode multi-live (plusieurs comptes dans un même processus)
+HOST_METRICS_INTERVAL = 60  # secondes entre deux résumés de débit dans les logs
+HOST_SCORES_FILE_PATTERN = "quiz_scores_{username}.json"  # un classement par compte
+
+# Paramètres du mode multi-processus (sessions réparties sur les cœurs)
+SHARD_REPORT_INTERVAL = 10  # secondes entre deux remontées de métriques des workers
+SHARD_SCORES_FILE = "quiz_scores_global.json"  # classement central tous lives confondus
+SHARD_METRICS_BASE_PORT = 9120  # /metrics du worker n sur ce port + n (0 pour désactiver)
+
+# Enregistrement et rejeu des commentaires
+COMMENT_RECORDING_ENABLED = False  # activable aussi avec l'option --record
+COMMENT_RECORDINGS_DIR = "recordings"
+REPLAY_PAUSE_BETWEEN_QUESTIONS = 5  # secondes (temps de l'enregistrement)
+REPLAY_SCORES_FILE = "quiz_scores_replay.json"  # ne jamais écraser le vrai classement
+LOADTEST_SCORES_FILE = "quiz_scores_loadtest.json"  # classement jetable du test de charge
+
+# Export des métriques (endpoint Prometheus local et résumé périodique)
+METRICS_HTTP_HOST = "127.0.0.1"
+METRICS_HTTP_PORT = 9108  # 0 pour désactiver l'endpoint /metrics
+METRICS_LOG_INTERVAL = 60  # secondes entre deux résumés dans les logs (0 pour désactiver)
+
+# Profilage à la demande (option --profile, ou à chaud par signal / socket locale)
+PROFILE_OUTPUT_DIR = "logs"
+PROFILE_SAMPLE_INTERVAL = 0.005  # secondes entre deux échantillons de piles
+PROFILE_SIGNAL = "SIGUSR1"  # SIGBREAK (Ctrl+Pause) est utilisé sous Windows
+PROFILE_CONTROL_HOST = "127.0.0.1"
+PROFILE_CONTROL_PORT = 9109  # 0 pour désactiver la socket de contrôle
+
+# Détection des blocages de la boucle asyncio et de l'interface Tk
+STALL_DETECTION_ENABLED = True
+STALL_THRESHOLD = 0.1  # secondes de retard avant de signaler un blocage
+STALL_HEARTBEAT_INTERVAL = 0.05  # secondes entre deux battements de chaque boucle
+STALL_STACK_DEPTH = 12  # frames de pile journalisées par blocage
+
+# Cache audio de la synthèse vocale (questions pré-rendues en fichiers WAV)
+TTS_CACHE_ENABLED = True
+TTS_CACHE_DIR = "tts_cache"
+TTS_MAX_QUEUE_DELAY = 8  # secondes d'attente maximales avant d'abandonner une annonce
+TTS_BACKEND = "auto"  # "sapi5", "espeak", "null" ou "auto" (SAPI5 sous Windows, sinon espeak)
+TTS_ESPEAK_VOICE = "fr"
+
+# Rendu de l'overlay (changements regroupés et appliqués une fois par image)
+GUI_RENDER_FPS = 30
+LIKES_GOAL = 1000  # objectif affiché par la barre de likes
+ENGAGEMENT_REFRESH_INTERVAL = 0.25  # secondes minimum entre deux mises à jour de la barre de likes
+
+# Mise en page du texte (plus grande police qui tient dans la zone du label)
+QUESTION_TEXT_BOX = (350, 160)  # largeur, hauteur en pixels
+QUESTION_FONT_SIZES = range(12, 25, 2)
+ANSWER_TEXT_BOX = (360, 80)
+ANSWER_FONT_SIZES = range(12, 27, 2)
+TEXT_LAYOUT_CACHE_SIZE = 4096  # mises en page gardées en mémoire par zone
+
+# Rendu sans affichage de l'overlay (serveurs d'encodage Linux, Pillow)
+HEADLESS_OVERLAY_SIZE = (400, 700)  # mêmes dimensions que la fenêtre Tk
+HEADLESS_RENDER_FPS = 30
+HEADLESS_OUTPUT = os.path.join("overlay_frames", "overlay.png")  # ou "pipe:<fifo>", "shm:<nom>"
+HEADLESS_FONT_FILE = "DejaVuSans.ttf"  # cherchée aussi dans les dossiers de polices du système
+HEADLESS_FONT_BOLD_FILE = "DejaVuSans-Bold.ttf"
+
+# Serveur local de l'overlay (page + WebSocket pour les sources navigateur d'OBS)
+OVERLAY_SERVER_HOST = "127.0.0.1"
+OVERLAY_SERVER_PORT = 9110  # 0 pour désactiver
+OVERLAY_SERVER_PUSH_INTERVAL = 0.05  # secondes entre deux envois de changements
+OVERLAY_SERVER_MAX_BUFFER = 256 * 1024  # octets en attente au-delà desquels un client lent est déconnecté
+
+# Import de dumps de questions (Open Trivia DB en JSON, JSONL ou CSV)
+TRIVIA_IMPORT_BATCH_SIZE = 500  # questions validées par lot dans le pool de processus
+TRIVIA_IMPORT_DIR = os.path.join(QUESTIONNAIRES_DIR, "trivia")  # banque par thème alimentée par les imports
+TRIVIA_IMPORT_SHARD_SIZE = 2000  # questions maximum par fichier de thème
+TRIVIA_IMPORT_READ_CHUNK = 64 * 1024  # caractères lus à la fois dans les dumps JSON
+
+# Banques par thème (un fichier JSONL par thème, index des positions et catalogue)
+THEME_BANK_CATALOG = "catalog.json"
+THEME_BANK_PART_SIZE_MB = MAX_FILE_SIZE_MB  # au-delà, le thème continue dans <thème>_2.jsonl
+THEME_BANK_SAMPLE_SIZE = 15  # questions tirées pour un questionnaire qui mélange plusieurs thèmes
+
+# Statistiques par question (exportées en fin de quiz: Parquet si pyarrow est installé, sinon CSV)
+ANALYTICS_DIR = "analytics"  # None pour désactiver la capture
+ANALYTICS_FORMAT = "auto"  # "auto", "parquet" ou "csv"
+REPLAY_ANALYTICS_DIR = os.path.join(ANALYTICS_DIR, "replay") if ANALYTICS_DIR else None  # jamais mélangées aux lives
+LOADTEST_ANALYTICS_DIR = os.path.join(ANALYTICS_DIR, "loadtest") if ANALYTICS_DIR else None
@@ -0,0 +1,195 @@
+"""
+Supervision de la connexion au live TikTok.
+Centralise la reconnexion (backoff exponentiel avec jitter et disjoncteur)
+et expose des métriques de santé de la connexion.
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Callable, Dict, Optional
+
+from config import (
+    RECONNECT_BASE_DELAY, RECONNECT_MAX_DELAY,
+    RECONNECT_FAILURE_THRESHOLD, RECONNECT_CIRCUIT_COOLDOWN
+)
+from logger_setup import logger
+
+
+class ConnectionSupervisor:
+    """Maintient un client TikTokLive connecté sans toucher à l'état du quiz"""
+
+    # États du disjoncteur
+    CLOSED = "closed"        # Fonctionnement normal
+    OPEN = "open"            # Trop d'échecs, tentatives suspendues
+    HALF_OPEN = "half_open"  # Tentative d'essai après la pause
+
+    def __init__(self, client, name: str = "",
+                 base_delay: float = RECONNECT_BASE_DELAY,
+                 max_delay: float = RECONNECT_MAX_DELAY,
+                 failure_threshold: int = RECONNECT_FAILURE_THRESHOLD,
+                 circuit_cooldown: float = RECONNECT_CIRCUIT_COOLDOWN,
+                 on_circuit_open: Optional[Callable[[], Any]] = None):
+        self.client = client
+        self.name = name or getattr(client, "unique_id", "")
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.circuit_cooldown = circuit_cooldown
+        self.on_circuit_open = on_circuit_open
+
+        self.circuit_state = self.CLOSED
+        self.connected = False
+        self.consecutive_failures = 0
+        self._circuit_opened_at = 0.0
+        self._stopping = False
+        self._session_established = False
+        self._wakeup: Optional[asyncio.Event] = None
+
+        # Métriques de santé
+        self.attempts = 0
+        self.successful_connections = 0
+        self.disconnects = 0
+        self.failures = 0
+        self.circuit_trips = 0
+        self.last_error: Optional[str] = None
+        self.connected_since: Optional[float] = None
+        self.disconnected_since: Optional[float] = time.monotonic()
+        self.total_downtime = 0.0
+        self.last_recovery_seconds: Optional[float] = None
+
+    def next_delay(self) -> float:
+        """Calcule le délai avant la prochaine tentative (backoff exponentiel, "equal jitter")"""
+        # L'exposant est borné pour éviter un dépassement après de longues coupures
+        cap = min(self.max_delay, self.base_delay * (2 ** min(self.consecutive_failures, 16)))
+        # La moitié du délai est fixe, l'autre moitié aléatoire pour désynchroniser les clients
+        return cap / 2 + random.uniform(0, cap / 2)
+
+    def notify_connected(self):
+        """À appeler depuis l'écouteur ConnectEvent: la session est établie"""
+        now = time.monotonic()
+        if self.disconnected_since is not None:
+            downtime = now - self.disconnected_since
+            self.total_downtime += downtime
+            # Ne mesurer le temps de rétablissement qu'après une vraie coupure
+            if self.successful_connections > 0:
+                self.last_recovery_seconds = downtime
+                logger.info(f"[{self.name}] Connexion rétablie en {downtime:.1f}s")
+        self.connected = True
+        self._session_established = True
+        self.connected_since = now
+        self.disconnected_since = None
+        self.consecutive_failures = 0
+        self.successful_connections += 1
+        if self.circuit_state != self.CLOSED:
+            logger.info(f"[{self.name}] Disjoncteur refermé")
+        self.circuit_state = self.CLOSED
+
+    def notify_disconnected(self):
+        """À appeler depuis l'écouteur DisconnectEvent (ne tente pas de reconnexion)"""
+        if not self.connected:
+            return
+        self.connected = False
+        self.connected_since = None
+        self.disconnected_since = time.monotonic()
+        self.disconnects += 1
+
+    def _record_failure(self, error: Optional[BaseException]):
+        """Enregistre une tentative qui n'a pas abouti à une session"""
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_error = str(error) if error else "Connexion terminée avant l'établissement"
+        logger.error(f"[{self.name}] Échec de connexion ({self.consecutive_failures} consécutifs): {self.last_error}")
+
+        if (self.circuit_state == self.HALF_OPEN
+                or self.consecutive_failures >= self.failure_threshold):
+            self.circuit_state = self.OPEN
+            self._circuit_opened_at = time.monotonic()
+            self.circuit_trips += 1
+            logger.warning(f"[{self.name}] Disjoncteur ouvert: nouvelle tentative dans {self.circuit_cooldown}s")
+            if self.on_circuit_open:
+                try:
+                    self.on_circuit_open()
+                except Exception as e:
+                    logger.error(f"[{self.name}] Erreur dans le rappel du disjoncteur: {e}")
+
+    async def _sleep(self, delay: float):
+        """Attente interrompue immédiatement par stop()"""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+    async def run(self):
+        """Boucle de supervision: connecte, attend la fin de la session, puis reconnecte"""
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+
+        while not self._stopping:
+            if self.circuit_state == self.OPEN:
+                remaining = self._circuit_opened_at + self.circuit_cooldown - time.monotonic()
+                if remaining > 0:
+                    await self._sleep(remaining)
+                    continue
+                self.circuit_state = self.HALF_OPEN
+                logger.info(f"[{self.name}] Disjoncteur semi-ouvert: tentative d'essai")
+
+            self.attempts += 1
+            self._session_established = False
+            error = None
+            try:
+                # connect() rend la main à la fin de la session (ou lève une exception)
+                await self.client.connect()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = e
+
+            if self._stopping:
+                break
+
+            # Fin d'une session établie sans DisconnectEvent reçu
+            self.notify_disconnected()
+
+            if not self._session_established:
+                self._record_failure(error)
+                if self.circuit_state == self.OPEN:
+                    continue
+
+            delay = self.next_delay()
+            logger.info(f"[{self.name}] Reconnexion dans {delay:.1f}s (tentative {self.attempts + 1})")
+            await self._sleep(delay)
+
+        self.connected = False
+
+    async def stop(self):
+        """Arrête la supervision et ferme proprement la connexion"""
+        self._stopping = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+        try:
+            await self.client.disconnect()
+        except Exception as e:
+            logger.debug(f"[{self.name}] Erreur lors de la déconnexion: {e}")
+
+    def get_health(self) -> Dict[str, Any]:
+        """Retourne un instantané des métriques de santé de la connexion"""
+        now = time.monotonic()
+        downtime = self.total_downtime
+        if self.disconnected_since is not None:
+            downtime += now - self.disconnected_since
+        return {
+            "name": self.name,
+            "connected": self.connected,
+            "circuit_state": self.circuit_state,
+            "attempts": self.attempts,
+            "successful_connections": self.successful_connections,
+            "disconnects": self.disconnects,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "circuit_trips": self.circuit_trips,
+            "last_error": self.last_error,
+            "uptime_seconds": (now - self.connected_since) if self.connected_since else 0.0,
+            "downtime_seconds": downtime,
+            "last_recovery_seconds": self.last_recovery_seconds,
+        }
@@ -330,6 +330,7 @@ def generer_questions_manquantes(limite=1500):
     print(f"1. Ajouter environ {questions_a_generer // len(questions_data.keys())} questions par thème existant")
     print(f"2. Ou créer environ {questions_a_generer // 20} nouveaux thèmes avec 20 questions chacun")
     print(f"3. Ou utiliser l'API Open Trivia Database et traduire les questions avec l'API DeepL")
+    print("   puis importer le dump: python quiz_tiktok.py import_trivia dump.json")
 
 if __name__ == "__main__":
     total = compter_questions()
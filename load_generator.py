@@ -0,0 +1,327 @@
+"""
+Générateur de charge synthétique pour le Quiz TikTok.
+Remplace TikTokLiveClient par un flux de commentaires configurable (débit,
+nombre de spectateurs, proportion de bonnes réponses, fautes de frappe...)
+construit à partir des vraies banques de questions, et mesure la marge de
+capacité du moteur de quiz.
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Tuple
+
+from config import LOADTEST_ANALYTICS_DIR, LOADTEST_SCORES_FILE
+from logger_setup import logger
+from metrics import summarize_latencies
+from question_bank import QuestionSpec, load_question_bank
+from quiz_manager import QuizManager
+
+# Banques utilisées par défaut: tous les questionnaires livrés avec le projet
+DEFAULT_BANK_PATTERNS = ("questionnaire*.json", "questionsAnglais.json")
+# Banque jouée par le quiz pendant le test (la plus grande)
+DEFAULT_QUIZ_BANK = "questionsAnglais.json"
+
+# Commentaires hors sujet typiques d'un live
+NOISE_COMMENTS = (
+    "lol", "trop fort", "salut tout le monde", "bonjour", "❤️❤️❤️", "c'est quoi la question?",
+    "first", "hello from Belgium", "😂😂", "ok", "je sais pas", "encore une question",
+    "tu peux dire bonjour à Marie?", "🔥", "gg", "test", "coucou", "jsp", "ahah", "next",
+)
+
+ACCENT_STRIP = str.maketrans("éèêëàâäîïôöùûüçÉÈÊËÀÂÄÎÏÔÖÙÛÜÇ", "eeeeaaaiioouuucEEEEAAAIIOOUUUC")
+ACCENT_ADD = {"e": "éèê", "a": "àâ", "i": "î", "o": "ô", "u": "ùû", "c": "ç"}
+KEYBOARD_NEIGHBOURS = {
+    "a": "zqs", "z": "aes", "e": "zrd", "r": "etf", "t": "ryg", "y": "tuh", "u": "yij", "i": "uok",
+    "o": "ipl", "p": "olm", "q": "asw", "s": "qdz", "d": "sfe", "f": "dgr", "g": "fht", "h": "gjy",
+    "j": "hku", "k": "jli", "l": "kmo", "m": "lp", "w": "xq", "x": "wc", "c": "xv", "v": "cb",
+    "b": "vn", "n": "bm",
+}
+
+
+def load_banks(patterns=DEFAULT_BANK_PATTERNS) -> List[QuestionSpec]:
+    """Charge et concatène les banques de questions correspondant aux motifs"""
+    questions: List[QuestionSpec] = []
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)):
+            try:
+                questions.extend(load_question_bank(path))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Banque ignorée {path}: {e}")
+    if not questions:
+        raise ValueError("Aucune banque de questions trouvée pour le test de charge")
+    return questions
+
+
+def estimate_manager_memory(quiz_manager) -> int:
+    """
+    Estime la mémoire (octets) de l'état qui grandit avec l'audience: scores,
+    participants de la question en cours et colonnes des statistiques
+    """
+    size = sys.getsizeof(quiz_manager.scores)
+    for user_id, data in quiz_manager.scores.items():
+        size += sys.getsizeof(user_id) + sys.getsizeof(data)
+        size += sum(sys.getsizeof(v) for v in data.values())
+    # Les identifiants partagés par answered_users et les participants des statistiques ne comptent qu'une fois
+    participants = set(quiz_manager.answered_users)
+    size += sys.getsizeof(quiz_manager.answered_users)
+    analytics = quiz_manager.analytics
+    if analytics is not None:
+        participants.update(analytics._users)
+        size += sys.getsizeof(analytics._users)
+        # Une ligne par question posée et une entrée par réponse vérifiée
+        size += sum(sys.getsizeof(column) for column in vars(analytics.columns).values())
+    size += sum(sys.getsizeof(user_id) for user_id in participants)
+    return size
+
+
+class CommentGenerator:
+    """Produit des commentaires réalistes pour la question en cours"""
+    def __init__(self, questions: List[QuestionSpec], users: int = 5000,
+                 correct_ratio: float = 0.05, near_miss_ratio: float = 0.15,
+                 noise_ratio: float = 0.5, duplicate_ratio: float = 0.1,
+                 accent_ratio: float = 0.3, typo_ratio: float = 0.2,
+                 seed: Optional[int] = None, variants_per_question: int = 64):
+        if correct_ratio + near_miss_ratio + noise_ratio > 1:
+            raise ValueError("La somme des proportions bonne réponse/presque/bruit dépasse 1")
+        self.rng = random.Random(seed)
+        self.questions = questions
+        self.user_ids = [f"user{i}" for i in range(users)]
+        self.nicknames = [f"Spectateur{i}" for i in range(users)]
+        self.correct_ratio = correct_ratio
+        self.near_miss_ratio = near_miss_ratio
+        self.noise_ratio = noise_ratio
+        self.duplicate_ratio = duplicate_ratio
+        self.accent_ratio = accent_ratio
+        self.typo_ratio = typo_ratio
+        self.variants_per_question = variants_per_question
+        self.last_comment: Dict[int, str] = {}
+        # Variantes précalculées par réponse pour que la génération pèse peu dans la mesure
+        self._variants: Dict[str, Tuple[List[str], List[str]]] = {}
+
+    def add_typo(self, text: str) -> str:
+        """Ajoute une faute de frappe (inversion, oubli, doublon ou touche voisine)"""
+        if len(text) < 2:
+            return text
+        i = self.rng.randrange(len(text) - 1)
+        kind = self.rng.random()
+        if kind < 0.25:
+            return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+        if kind < 0.5:
+            return text[:i] + text[i + 1:]
+        if kind < 0.75:
+            return text[:i] + text[i] + text[i:]
+        neighbours = KEYBOARD_NEIGHBOURS.get(text[i].lower())
+        if not neighbours:
+            return text
+        return text[:i] + self.rng.choice(neighbours) + text[i + 1:]
+
+    def vary_accents(self, text: str) -> str:
+        """Supprime les accents, ou en ajoute un là où il n'y en a pas"""
+        stripped = text.translate(ACCENT_STRIP)
+        if stripped != text:
+            return stripped
+        positions = [i for i, c in enumerate(text) if c in ACCENT_ADD]
+        if not positions:
+            return text
+        i = self.rng.choice(positions)
+        return text[:i] + self.rng.choice(ACCENT_ADD[text[i]]) + text[i + 1:]
+
+    def vary_case(self, text: str) -> str:
+        return self.rng.choice((text, text.lower(), text.upper(), text.capitalize()))
+
+    def _build_variants(self, answer: str) -> Tuple[List[str], List[str]]:
+        correct, near = [], []
+        for _ in range(self.variants_per_question):
+            text = self.vary_case(answer)
+            if self.rng.random() < self.accent_ratio:
+                text = self.vary_accents(text)
+            if self.rng.random() < self.typo_ratio:
+                text = self.add_typo(text)
+            correct.append(text)
+            # Presque: plusieurs fautes, ou la réponse d'une autre question
+            if self.rng.random() < 0.5:
+                miss = answer
+                for _ in range(self.rng.randint(2, 3)):
+                    miss = self.add_typo(miss)
+            else:
+                miss = self.rng.choice(self.questions).answer
+            near.append(miss)
+        return correct, near
+
+    def next_comment(self, answer: str) -> Tuple[str, str, str]:
+        """Retourne (user_id, pseudo, commentaire) pour une question dont la réponse est donnée"""
+        rng = self.rng
+        user = rng.randrange(len(self.user_ids))
+        previous = self.last_comment.get(user)
+        if previous is not None and rng.random() < self.duplicate_ratio:
+            return self.user_ids[user], self.nicknames[user], previous
+
+        variants = self._variants.get(answer)
+        if variants is None:
+            variants = self._variants[answer] = self._build_variants(answer)
+
+        roll = rng.random()
+        if roll < self.correct_ratio:
+            text = rng.choice(variants[0])
+        elif roll < self.correct_ratio + self.near_miss_ratio:
+            text = rng.choice(variants[1])
+        elif roll < self.correct_ratio + self.near_miss_ratio + self.noise_ratio:
+            text = rng.choice(NOISE_COMMENTS)
+        else:
+            text = rng.choice(self.questions).answer
+        self.last_comment[user] = text
+        return self.user_ids[user], self.nicknames[user], text
+
+
+def run_load_test(quiz_manager, generator: CommentGenerator, rate: float = 10000,
+                  duration: float = 30.0, memory_interval: float = 1.0) -> dict:
+    """
+    Injecte des commentaires au débit demandé et mesure le moteur de quiz.
+
+    Le débit soutenu inclut le coût de génération; la latence ne mesure que
+    process_answer (le verdict).
+    """
+    manager = quiz_manager
+    process_answer = manager.process_answer
+    latencies: List[int] = []
+    memory_samples: List[Tuple[float, int]] = []
+    sent = 0
+    correct = 0
+    questions_asked = 0
+
+    def start_question():
+        nonlocal questions_asked
+        question = manager.next_question()
+        if question is None:
+            manager.current_question_index = -1
+            question = manager.next_question()
+        questions_asked += 1
+        return question
+
+    question = start_question()
+    question_started = time.perf_counter()
+    # Référence prise une fois la première question ouverte (ligne de statistiques et
+    # listes de participants déjà créées): la croissance ne mesure que l'audience
+    memory_start = estimate_manager_memory(manager)
+    start = time.perf_counter()
+    next_memory_sample = start + memory_interval
+
+    while True:
+        now = time.perf_counter()
+        elapsed = now - start
+        if elapsed >= duration:
+            break
+        if now >= next_memory_sample:
+            memory_samples.append((elapsed, estimate_manager_memory(manager)))
+            next_memory_sample += memory_interval
+        if now - question_started > question.time_limit:
+            question = start_question()
+            question_started = now
+
+        due = int(elapsed * rate) - sent
+        if due <= 0:
+            time.sleep(min(0.001, (sent + 1) / rate - elapsed))
+            continue
+
+        # Traiter au plus 1 ms de retard d'un coup pour garder des mesures régulières
+        for _ in range(min(due, max(1, int(rate / 1000)))):
+            user_id, nickname, text = generator.next_comment(question.answer)
+            t0 = time.perf_counter_ns()
+            is_correct, _ = process_answer(user_id, nickname, text)
+            latencies.append(time.perf_counter_ns() - t0)
+            sent += 1
+            if is_correct:
+                correct += 1
+                question = start_question()
+                question_started = time.perf_counter()
+
+    elapsed = time.perf_counter() - start
+    memory_end = estimate_manager_memory(manager)
+    return {
+        "target_rate": rate,
+        "comments": sent,
+        "elapsed_seconds": elapsed,
+        "sustained_comments_per_second": sent / elapsed if elapsed > 0 else 0.0,
+        "correct_answers": correct,
+        "questions_asked": questions_asked,
+        "users_with_score": len(manager.scores),
+        "latency": summarize_latencies(latencies),
+        "memory": {
+            "start_bytes": memory_start,
+            "end_bytes": memory_end,
+            "growth_bytes": memory_end - memory_start,
+            "samples": memory_samples,
+        },
+    }
+
+
+def print_load_report(report: dict):
+    """Affiche le résultat d'un test de charge"""
+    latency = report["latency"]
+    memory = report["memory"]
+    print("\n----- TEST DE CHARGE -----")
+    print(f"Débit visé: {report['target_rate']:.0f}/s - soutenu: "
+          f"{report['sustained_comments_per_second']:.0f}/s ({report['comments']} commentaires "
+          f"en {report['elapsed_seconds']:.1f}s)")
+    print(f"Questions: {report['questions_asked']} - bonnes réponses: {report['correct_answers']} - "
+          f"joueurs classés: {report['users_with_score']}")
+    print(f"Latence du verdict: p50 {latency['p50_us']:.1f}µs, p99 {latency['p99_us']:.1f}µs, "
+          f"max {latency['max_us']:.1f}µs")
+    print(f"Mémoire QuizManager (scores, participants, statistiques): {memory['start_bytes'] / 1024:.0f} Ko -> {memory['end_bytes'] / 1024:.0f} Ko "
+          f"(+{memory['growth_bytes'] / 1024:.0f} Ko)")
+    if "tracemalloc_peak_bytes" in memory:
+        print(f"Pic d'allocation Python (tracemalloc): {memory['tracemalloc_peak_bytes'] / 1024 / 1024:.1f} Mo")
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande du test de charge"""
+    parser = argparse.ArgumentParser(prog="quiz_tiktok.py loadtest",
+                                     description="Test de charge synthétique du moteur de quiz")
+    parser.add_argument("--rate", type=float, default=10000, help="commentaires par seconde visés")
+    parser.add_argument("--duration", type=float, default=30, help="durée du test en secondes")
+    parser.add_argument("--users", type=int, default=5000, help="nombre de spectateurs simulés")
+    parser.add_argument("--correct", type=float, default=0.05, help="proportion de bonnes réponses")
+    parser.add_argument("--near-miss", type=float, default=0.15, help="proportion de réponses presque justes")
+    parser.add_argument("--noise", type=float, default=0.5, help="proportion de commentaires hors sujet")
+    parser.add_argument("--duplicates", type=float, default=0.1, help="proportion de messages répétés")
+    parser.add_argument("--accents", type=float, default=0.3, help="probabilité de variation d'accents")
+    parser.add_argument("--typos", type=float, default=0.2, help="probabilité de faute de frappe")
+    parser.add_argument("--questions", default=None, help="banque de questions du quiz (défaut: toutes)")
+    parser.add_argument("--seed", type=int, default=None, help="graine aléatoire pour un test reproductible")
+    parser.add_argument("--tracemalloc", action="store_true", help="mesurer aussi le pic d'allocation Python")
+    parser.add_argument("--json", default=None, help="écrire le rapport dans ce fichier JSON")
+    args = parser.parse_args(argv)
+
+    bank_patterns = (args.questions,) if args.questions else DEFAULT_BANK_PATTERNS
+    questions = load_banks(bank_patterns)
+    generator = CommentGenerator(
+        questions, users=args.users, correct_ratio=args.correct,
+        near_miss_ratio=args.near_miss, noise_ratio=args.noise,
+        duplicate_ratio=args.duplicates, accent_ratio=args.accents,
+        typo_ratio=args.typos, seed=args.seed
+    )
+
+    if os.path.exists(LOADTEST_SCORES_FILE):
+        os.remove(LOADTEST_SCORES_FILE)
+    manager = QuizManager(args.questions or DEFAULT_QUIZ_BANK, scores_file=LOADTEST_SCORES_FILE,
+                          analytics_dir=LOADTEST_ANALYTICS_DIR)
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    report = run_load_test(manager, generator, rate=args.rate, duration=args.duration)
+    if args.tracemalloc:
+        report["memory"]["tracemalloc_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    manager.export_analytics(background=False)
+
+    print_load_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=4)
+    return report
@@ -0,0 +1,324 @@
+"""
+Métriques de fonctionnement du Quiz TikTok.
+Compteurs et histogrammes de latence légers mis à jour sur le chemin critique
+des commentaires, exportés au format texte Prometheus et résumés dans les logs.
+"""
+
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from config import METRICS_HTTP_HOST, METRICS_HTTP_PORT, METRICS_LOG_INTERVAL
+from logger_setup import logger
+
+# Histogramme "à la HDR": 16 sous-intervalles par puissance de 2 (précision ~6%)
+_SUB_BUCKET_BITS = 4
+_SUB_BUCKET_COUNT = 1 << _SUB_BUCKET_BITS
+_EXACT_LIMIT = _SUB_BUCKET_COUNT * 2
+_BUCKET_COUNT = _EXACT_LIMIT + 64 * _SUB_BUCKET_COUNT
+
+
+def _bucket_lower_bound(index: int) -> int:
+    """Plus petite valeur (ns) rangée dans l'intervalle `index`"""
+    if index < _EXACT_LIMIT:
+        return index
+    shift, sub = divmod(index - _EXACT_LIMIT, _SUB_BUCKET_COUNT)
+    return (_SUB_BUCKET_COUNT + sub) << (shift + 1)
+
+
+class LatencyHistogram:
+    """Histogramme de latences en nanosecondes, à coût d'enregistrement constant"""
+
+    __slots__ = ("counts", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * _BUCKET_COUNT
+        self.total = 0
+        self.max = 0
+
+    def record(self, value_ns: int):
+        """Ajoute une mesure (~0,4 µs, appelé à chaque commentaire)"""
+        if value_ns < _EXACT_LIMIT:
+            index = value_ns if value_ns > 0 else 0
+        else:
+            # 16 intervalles par puissance de 2: index = shift * 16 + les 5 bits de poids fort
+            shift = value_ns.bit_length() - _SUB_BUCKET_BITS - 1
+            index = (shift << _SUB_BUCKET_BITS) + (value_ns >> shift)
+        self.counts[index] += 1
+        self.total += value_ns
+        if value_ns > self.max:
+            self.max = value_ns
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def percentile(self, q: float) -> int:
+        """Retourne le centile q (0-100) en nanosecondes (borne basse de l'intervalle)"""
+        count = self.count
+        if not count:
+            return 0
+        target = max(1, math.ceil(q / 100 * count))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return min(_bucket_lower_bound(index), self.max)
+        return self.max
+
+    def mean(self) -> float:
+        count = self.count
+        return self.total / count if count else 0.0
+
+
+class SessionMetrics:
+    """Compteurs de débit et latences d'une session de quiz (un live TikTok)"""
+
+    COUNTERS = ("comments", "comments_ignored", "answers_checked", "correct_answers",
+                "rejections", "questions_asked")
+
+    # Étapes chronométrées: (attribut, nom Prometheus, description). Une seule
+    # mesure par commentaire pour rester sous la microseconde d'instrumentation
+    STAGES = (
+        ("verdict_latency", "quiz_comment_verdict_seconds",
+         "Temps entre la réception du commentaire et le verdict"),
+        ("overlay_latency", "quiz_overlay_update_seconds",
+         "Temps entre la réception de la bonne réponse et la mise à jour de l'affichage"),
+    )
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self.started_at = time.monotonic()
+        self.comments = 0
+        self.comments_ignored = 0
+        self.answers_checked = 0
+        self.correct_answers = 0
+        self.rejections = 0
+        self.questions_asked = 0
+        self.verdict_latency = LatencyHistogram()
+        self.overlay_latency = LatencyHistogram()
+        # Débit sur le dernier intervalle de résumé
+        self.recent_comments_per_second = 0.0
+        self._last_rate_sample: Tuple[float, int] = (self.started_at, 0)
+
+    def rate_since(self, sample: Tuple[float, int]) -> Tuple[float, Tuple[float, int]]:
+        """Débit de commentaires depuis un échantillon (instant, total) et le nouvel échantillon"""
+        now = time.monotonic()
+        last_time, last_comments = sample
+        rate = (self.comments - last_comments) / (now - last_time) if now > last_time else 0.0
+        return rate, (now, self.comments)
+
+    def update_recent_rate(self):
+        """Calcule le débit de commentaires depuis le dernier résumé des logs"""
+        self.recent_comments_per_second, self._last_rate_sample = self.rate_since(self._last_rate_sample)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Retourne les compteurs et les débits moyens depuis le démarrage"""
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        data = {"name": self.name, "elapsed_seconds": elapsed}
+        for counter in self.COUNTERS:
+            data[counter] = getattr(self, counter)
+        data["comments_per_second"] = self.comments / elapsed
+        data["answers_per_second"] = self.answers_checked / elapsed
+        for attribute, _, _ in self.STAGES:
+            histogram = getattr(self, attribute)
+            data[f"{attribute}_p50_us"] = histogram.percentile(50) / 1000
+            data[f"{attribute}_p99_us"] = histogram.percentile(99) / 1000
+        return data
+
+
+def aggregate_snapshots(snapshots: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Additionne les instantanés de plusieurs sessions"""
+    snapshots = list(snapshots)
+    total: Dict[str, Any] = {"name": "total", "sessions": len(snapshots)}
+    for counter in SessionMetrics.COUNTERS + ("comments_per_second", "answers_per_second"):
+        total[counter] = sum(s.get(counter, 0) for s in snapshots)
+    total["elapsed_seconds"] = max((s["elapsed_seconds"] for s in snapshots), default=0.0)
+    return total
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Retourne le centile q (0-100) d'une liste déjà triée (méthode du rang le plus proche)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summarize_latencies(latencies_ns: Sequence[int]) -> Dict[str, float]:
+    """Résume une série de latences (en nanosecondes) en microsecondes"""
+    values = sorted(latencies_ns)
+    return {
+        "count": len(values),
+        "p50_us": percentile(values, 50) / 1000,
+        "p90_us": percentile(values, 90) / 1000,
+        "p99_us": percentile(values, 99) / 1000,
+        "max_us": (values[-1] / 1000) if values else 0.0,
+        "mean_us": (sum(values) / len(values) / 1000) if values else 0.0,
+    }
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """Regroupe les métriques de toutes les sessions du processus pour l'export"""
+
+    QUANTILES = (0.5, 0.9, 0.99, 0.999)
+    # Intervalle minimal entre deux calculs du débit à la collecte (collectes rapprochées)
+    RATE_MIN_INTERVAL = 1.0
+
+    def __init__(self):
+        self.sessions: List[SessionMetrics] = []
+        # Jauges calculées au moment de l'export: {nom: (fonction, description)}
+        self.gauges: Dict[str, Tuple[Callable[[], float], str]] = {}
+        # Latences hors session (ex: rendu d'une image de l'overlay): {nom: (histogramme, description)}
+        self.histograms: Dict[str, Tuple[LatencyHistogram, str]] = {}
+        # Débit exporté, calculé entre deux collectes /metrics: {session: (débit, (instant, total))}.
+        # Indépendant du résumé des logs, que les modes host et shard ne démarrent pas
+        self._scrape_rates: Dict[SessionMetrics, Tuple[float, Tuple[float, int]]] = {}
+        self._lock = threading.Lock()
+
+    def add_session(self, session_metrics: SessionMetrics):
+        with self._lock:
+            self.sessions.append(session_metrics)
+
+    def add_gauge(self, name: str, callback: Callable[[], float], help_text: str):
+        """Enregistre une jauge (ex: profondeur de file d'attente) lue à chaque export"""
+        with self._lock:
+            self.gauges[name] = (callback, help_text)
+
+    def add_histogram(self, name: str, histogram: LatencyHistogram, help_text: str):
+        """Enregistre un histogramme (nanosecondes) exporté comme résumé en secondes"""
+        with self._lock:
+            self.histograms[name] = (histogram, help_text)
+
+    def _scrape_rate(self, session: SessionMetrics) -> float:
+        """Débit de commentaires depuis la collecte précédente (depuis le démarrage à la première)"""
+        rate, sample = self._scrape_rates.get(session, (0.0, (session.started_at, 0)))
+        if time.monotonic() - sample[0] >= self.RATE_MIN_INTERVAL or session not in self._scrape_rates:
+            rate, sample = session.rate_since(sample)
+            self._scrape_rates[session] = (rate, sample)
+        return rate
+
+    def render_prometheus(self) -> str:
+        """Retourne toutes les métriques au format texte Prometheus 0.0.4"""
+        with self._lock:
+            sessions = list(self.sessions)
+            gauges = dict(self.gauges)
+            histograms = dict(self.histograms)
+            rates = [self._scrape_rate(session) for session in sessions]
+        lines = []
+        for counter in SessionMetrics.COUNTERS:
+            name = f"quiz_{counter}_total"
+            lines.append(f"# TYPE {name} counter")
+            for session in sessions:
+                lines.append(f'{name}{{session="{_escape_label(session.name)}"}} {getattr(session, counter)}')
+
+        lines.append("# HELP quiz_comments_per_second Débit de commentaires depuis la collecte précédente")
+        lines.append("# TYPE quiz_comments_per_second gauge")
+        for session, rate in zip(sessions, rates):
+            lines.append(f'quiz_comments_per_second{{session="{_escape_label(session.name)}"}} {rate:.3f}')
+
+        for attribute, name, help_text in SessionMetrics.STAGES:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} summary")
+            for session in sessions:
+                histogram = getattr(session, attribute)
+                label = f'session="{_escape_label(session.name)}"'
+                for quantile in self.QUANTILES:
+                    value = histogram.percentile(quantile * 100) / 1e9
+                    lines.append(f'{name}{{{label},quantile="{quantile}"}} {value:.9f}')
+                lines.append(f"{name}_sum{{{label}}} {histogram.total / 1e9:.9f}")
+                lines.append(f"{name}_count{{{label}}} {histogram.count}")
+
+        for name, (histogram, help_text) in histograms.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} summary")
+            for quantile in self.QUANTILES:
+                lines.append(f'{name}{{quantile="{quantile}"}} {histogram.percentile(quantile * 100) / 1e9:.9f}')
+            lines.append(f"{name}_sum {histogram.total / 1e9:.9f}")
+            lines.append(f"{name}_count {histogram.count}")
+
+        for name, (callback, help_text) in gauges.items():
+            try:
+                value = float(callback())
+            except Exception:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def log_summary(self):
+        """Écrit un résumé des débits et latences dans les logs"""
+        with self._lock:
+            sessions = list(self.sessions)
+        for session in sessions:
+            session.update_recent_rate()
+            verdict = session.verdict_latency
+            overlay = session.overlay_latency
+            logger.info(
+                f"[métriques {session.name}] {session.recent_comments_per_second:.1f} commentaires/s, "
+                f"{session.correct_answers} bonnes réponses, {session.rejections} rejets - "
+                f"verdict p50 {verdict.percentile(50) / 1000:.0f}µs p99 {verdict.percentile(99) / 1000:.0f}µs, "
+                f"affichage p99 {overlay.percentile(99) / 1e6:.1f}ms"
+            )
+
+
+# Registre du processus, partagé par toutes les sessions (comme le logger)
+registry = MetricsRegistry()
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = registry
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Pas de ligne de log à chaque collecte
+        pass
+
+
+def start_metrics_server(port: int = METRICS_HTTP_PORT, host: str = METRICS_HTTP_HOST,
+                         metrics_registry: MetricsRegistry = registry) -> Optional[ThreadingHTTPServer]:
+    """Démarre l'endpoint /metrics local dans un thread (port 0 ou occupé: désactivé)"""
+    if not port:
+        return None
+    handler = type("MetricsRequestHandler", (_MetricsRequestHandler,), {"registry": metrics_registry})
+    try:
+        server = ThreadingHTTPServer((host, port), handler)
+    except OSError as e:
+        logger.warning(f"Endpoint de métriques indisponible sur {host}:{port}: {e}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info(f"Métriques Prometheus disponibles sur http://{host}:{port}/metrics")
+    return server
+
+
+def start_metrics_reporter(interval: float = METRICS_LOG_INTERVAL,
+                           metrics_registry: MetricsRegistry = registry) -> Optional[threading.Event]:
+    """Journalise périodiquement le résumé des métriques; retourne l'événement d'arrêt"""
+    if interval <= 0:
+        return None
+    stop_event = threading.Event()
+
+    def report():
+        while not stop_event.wait(interval):
+            metrics_registry.log_summary()
+
+    threading.Thread(target=report, name="metrics-reporter", daemon=True).start()
+    return stop_event
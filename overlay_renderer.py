@@ -0,0 +1,385 @@
+"""
+Rendu de l'overlay du Quiz TikTok sans Tk (serveurs d'encodage Linux).
+Le même overlay que TikTokQuizGUI (date, timer, question, réponse masquée,
+objectif de likes, top 10) est dessiné avec Pillow dans une image RGBA en
+mémoire. Seules les zones des champs modifiés sont redessinées, et les images
+sont envoyées à la cadence voulue vers un fichier PNG, un pipe (vidéo brute
+pour ffmpeg) ou une mémoire partagée.
+"""
+
+import abc
+import os
+import struct
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:  # le mode headless est alors indisponible, le reste du quiz fonctionne
+    Image = ImageDraw = ImageFont = None
+
+from config import (
+    HEADLESS_OVERLAY_SIZE, HEADLESS_RENDER_FPS, HEADLESS_FONT_FILE, HEADLESS_FONT_BOLD_FILE,
+    QUESTION_TEXT_BOX, QUESTION_FONT_SIZES, ANSWER_TEXT_BOX, ANSWER_FONT_SIZES
+)
+from logger_setup import logger
+from metrics import LatencyHistogram, registry as metrics_registry
+from overlay_state import OverlayState, QuizOverlayFeed
+from text_layout import FontMetrics, TextLayoutEngine
+
+Box = Tuple[int, int, int, int]
+
+TRANSPARENT = (0, 0, 0, 0)
+PANEL_COLOR = "#232323"
+TIMER_COLOR = "#FF3333"
+LIKES_COLOR = "#FF69B4"
+
+# Zones de l'overlay (x0, y0, x1, y1), disposées comme les frames de la fenêtre Tk
+REGIONS: Dict[str, Box] = {
+    "date": (10, 5, 210, 65),
+    "question_count": (210, 5, 332, 65),
+    "timer": (332, 5, 390, 65),
+    "question": (10, 70, 390, 250),
+    "answer": (10, 255, 390, 345),
+    "likes": (10, 350, 390, 430),
+}
+SCORES_TOP = 440
+SCORE_ROW_HEIGHT = 25
+
+
+def score_row_box(row: int) -> Box:
+    top = SCORES_TOP + row * SCORE_ROW_HEIGHT
+    return (10, top, 390, top + SCORE_ROW_HEIGHT)
+
+
+def points_to_pixels(size: int) -> int:
+    """Les tailles Tk sont en points (96 ppp), celles de Pillow en pixels"""
+    return round(size * 4 / 3)
+
+
+class PillowFont:
+    """Police Pillow exposant l'interface de tkinter.font.Font utilisée par text_layout"""
+
+    def __init__(self, font_file: str, size: int):
+        try:
+            self.font = ImageFont.truetype(font_file, points_to_pixels(size))
+        except OSError:
+            logger.warning(f"Police {font_file} introuvable, police par défaut de Pillow")
+            try:
+                self.font = ImageFont.load_default(points_to_pixels(size))
+            except TypeError:  # Pillow < 10.1: police bitmap de taille fixe
+                self.font = ImageFont.load_default()
+        try:
+            ascent, descent = self.font.getmetrics()
+            self.linespace = ascent + descent
+        except AttributeError:
+            left, top, right, bottom = self.font.getbbox("Ag")
+            self.linespace = bottom - top + 2
+
+    def measure(self, text: str) -> int:
+        return int(round(self.font.getlength(text)))
+
+    def metrics(self, option: str) -> int:
+        return self.linespace
+
+
+class OverlayRenderer:
+    """
+    Dessine un OverlayState dans une image RGBA.
+    `render()` ne redessine que les zones des champs modifiés et retourne ces zones.
+    """
+
+    def __init__(self, state: OverlayState, size: Tuple[int, int] = HEADLESS_OVERLAY_SIZE,
+                 font_file: str = HEADLESS_FONT_FILE, bold_font_file: str = HEADLESS_FONT_BOLD_FILE):
+        if Image is None:
+            raise RuntimeError("Pillow est requis pour le rendu sans affichage (pip install Pillow)")
+        self.state = state
+        self.size = size
+        self.image = Image.new("RGBA", size, TRANSPARENT)
+        self.draw = ImageDraw.Draw(self.image)
+        self.title_font = PillowFont(bold_font_file, 12)
+        self.timer_font = PillowFont(bold_font_file, 32)
+        self.score_font = PillowFont(font_file, 10)
+        self.score_metrics = FontMetrics(self.score_font)
+        # Même mise en page que la fenêtre Tk (text_layout), avec des polices Pillow
+        self.question_layout = TextLayoutEngine(lambda size: PillowFont(bold_font_file, size),
+                                                QUESTION_TEXT_BOX, QUESTION_FONT_SIZES)
+        self.answer_layout = TextLayoutEngine(lambda size: PillowFont(font_file, size),
+                                              ANSWER_TEXT_BOX, ANSWER_FONT_SIZES)
+        self._rendered_scores: List[Any] = [None] * 10
+        self.frames = 0
+        # Durée de rendu de chaque image (nanosecondes)
+        self.render_time = LatencyHistogram()
+
+    def render(self) -> List[Box]:
+        """Applique les champs modifiés; retourne les zones redessinées"""
+        start = time.perf_counter_ns()
+        changes = self.state.take_dirty()
+        dirty: List[Box] = []
+        if "date" in changes:
+            dirty.append(self._draw_centered("date", changes["date"], self.title_font, "white"))
+        if "question_count" in changes:
+            dirty.append(self._draw_centered("question_count", changes["question_count"],
+                                             self.title_font, "white"))
+        if "timer" in changes:
+            dirty.append(self._draw_centered("timer", changes["timer"], self.timer_font, TIMER_COLOR))
+        if "question" in changes:
+            dirty.append(self._draw_fitted("question", changes["question"], self.question_layout, "white"))
+        if "answer" in changes:
+            text, color = changes["answer"]
+            dirty.append(self._draw_fitted("answer", text, self.answer_layout, color))
+        if "likes" in changes:
+            dirty.append(self._draw_likes(*changes["likes"]))
+        if "scores" in changes:
+            for row, values in enumerate(changes["scores"][:len(self._rendered_scores)]):
+                if self._rendered_scores[row] != values:
+                    dirty.append(self._draw_score_row(row, *values))
+                    self._rendered_scores[row] = values
+        self.frames += 1
+        self.render_time.record(time.perf_counter_ns() - start)
+        return dirty
+
+    def _clear(self, box: Box) -> Box:
+        self.draw.rectangle((box[0], box[1], box[2] - 1, box[3] - 1), fill=PANEL_COLOR)
+        return box
+
+    def _draw_lines(self, box: Box, lines: Sequence[str], font: PillowFont, color: str):
+        """Lignes centrées horizontalement et verticalement dans la zone"""
+        center_x = (box[0] + box[2]) / 2
+        y = (box[1] + box[3]) / 2 - len(lines) * font.linespace / 2
+        for line in lines:
+            x = center_x - font.measure(line) / 2
+            self.draw.text((x, y), line, font=font.font, fill=color)
+            y += font.linespace
+
+    def _draw_centered(self, field: str, text: str, font: PillowFont, color: str) -> Box:
+        box = self._clear(REGIONS[field])
+        self._draw_lines(box, text.split("\n"), font, color)
+        return box
+
+    def _draw_fitted(self, field: str, text: str, engine: TextLayoutEngine, color: str) -> Box:
+        box = self._clear(REGIONS[field])
+        layout = engine.layout(text)
+        self._draw_lines(box, layout.lines, engine.font(layout.size), color)
+        return box
+
+    def _draw_likes(self, current_likes: int, total_likes: int) -> Box:
+        box = self._clear(REGIONS["likes"])
+        x0, y0, x1, _ = box
+        self._draw_lines((x0, y0, x1, y0 + 22), ["OBJECTIF LIKES"], self.title_font, LIKES_COLOR)
+        self._draw_lines((x0, y0 + 22, x1, y0 + 44), [f"{current_likes} / {total_likes}"],
+                         self.title_font, "white")
+        # Barre de progression: fond, remplissage et brillance (comme le canvas Tk)
+        bar_x0, bar_x1, bar_y = x0 + 20, x1 - 20, y0 + 50
+        progress = min(1.0, current_likes / total_likes) if total_likes > 0 else 1.0
+        fill_x1 = bar_x0 + int((bar_x1 - bar_x0) * progress)
+        self.draw.rectangle((bar_x0, bar_y, bar_x1, bar_y + 20), fill="#333333")
+        if fill_x1 > bar_x0:
+            self.draw.rectangle((bar_x0, bar_y, fill_x1, bar_y + 20), fill=LIKES_COLOR)
+            self.draw.rectangle((bar_x0, bar_y, fill_x1, bar_y + 10), fill="#FF99CC")
+        return box
+
+    def _draw_score_row(self, row: int, text: str, color: str) -> Box:
+        box = self._clear(score_row_box(row))
+        # Une ligne par place (alignement des colonnes conservé), tronquée plutôt que repliée
+        line = text
+        while line and self.score_metrics.text_width(line) > box[2] - box[0] - 20:
+            line = line[:-1]
+        self.draw.text((box[0] + 10, box[1] + 4), line, font=self.score_font.font, fill=color)
+        return box
+
+
+class FrameSink(abc.ABC):
+    """Destination des images rendues"""
+
+    @abc.abstractmethod
+    def write(self, image: Any, dirty: List[Box], frame_number: int):
+        """Publie l'image (dirty: zones modifiées depuis l'image précédente)"""
+
+    def close(self):
+        pass
+
+
+class PngFrameSink(FrameSink):
+    """
+    Fichier PNG: remplacé atomiquement à chaque changement (source image d'OBS), ou une
+    image numérotée par frame si le chemin contient {frame} (ex: frames/{frame:06d}.png).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.numbered = "{frame" in path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def write(self, image: Any, dirty: List[Box], frame_number: int):
+        if self.numbered:
+            image.save(self.path.format(frame=frame_number))
+            return
+        if not dirty and frame_number > 0:
+            return
+        temp_path = f"{self.path}.tmp.png"
+        image.save(temp_path)
+        os.replace(temp_path, self.path)
+
+
+class PipeFrameSink(FrameSink):
+    """
+    Vidéo brute RGBA dans un pipe nommé, une image par frame (cadence constante), à lire avec:
+    ffmpeg -f rawvideo -pix_fmt rgba -s 400x700 -r 30 -i <fifo> ...
+    """
+
+    def __init__(self, path: str):
+        if hasattr(os, "mkfifo") and not os.path.exists(path):
+            os.mkfifo(path)
+        print(f"🎞️ En attente d'un lecteur sur {path}...")
+        self.stream = open(path, "wb")
+        self.broken = False
+
+    def write(self, image: Any, dirty: List[Box], frame_number: int):
+        if self.broken:
+            return
+        try:
+            self.stream.write(image.tobytes())
+            self.stream.flush()
+        except (BrokenPipeError, OSError) as e:
+            logger.error(f"Pipe de l'overlay fermé par le lecteur: {e}")
+            self.broken = True
+
+    def close(self):
+        try:
+            self.stream.close()
+        except OSError:
+            pass
+
+
+class SharedMemoryFrameSink(FrameSink):
+    """
+    Image RGBA en mémoire partagée, précédée d'un en-tête (séquence, largeur, hauteur).
+    La séquence est impaire pendant l'écriture: un lecteur relit si elle a changé ou est impaire.
+    Seules les zones modifiées sont copiées.
+    """
+
+    HEADER = struct.Struct("<QII")
+
+    def __init__(self, name: str, size: Tuple[int, int]):
+        from multiprocessing import shared_memory
+
+        self.width, self.height = size
+        self.shm = shared_memory.SharedMemory(name=name, create=True,
+                                              size=self.HEADER.size + self.width * self.height * 4)
+        self.sequence = 0
+        self.HEADER.pack_into(self.shm.buf, 0, self.sequence, self.width, self.height)
+
+    def write(self, image: Any, dirty: List[Box], frame_number: int):
+        if frame_number == 0:
+            dirty = [(0, 0, self.width, self.height)]
+        if not dirty:
+            return
+        buf = self.shm.buf
+        self.sequence += 1
+        self.HEADER.pack_into(buf, 0, self.sequence, self.width, self.height)
+        for x0, y0, x1, y1 in dirty:
+            pixels = image.crop((x0, y0, x1, y1)).tobytes()
+            row_length = (x1 - x0) * 4
+            for row in range(y1 - y0):
+                offset = self.HEADER.size + ((y0 + row) * self.width + x0) * 4
+                buf[offset:offset + row_length] = pixels[row * row_length:(row + 1) * row_length]
+        self.sequence += 1
+        self.HEADER.pack_into(buf, 0, self.sequence, self.width, self.height)
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+def create_frame_sink(output: str, size: Tuple[int, int] = HEADLESS_OVERLAY_SIZE) -> FrameSink:
+    """"pipe:<fifo>", "shm:<nom>" ou chemin d'un fichier PNG"""
+    if output.startswith("pipe:"):
+        return PipeFrameSink(output[len("pipe:"):])
+    if output.startswith("shm:"):
+        return SharedMemoryFrameSink(output[len("shm:"):], size)
+    return PngFrameSink(output)
+
+
+class HeadlessOverlay:
+    """
+    Overlay sans affichage d'un quiz: l'état est alimenté par un QuizOverlayFeed et
+    rendu à `fps` images par seconde dans un thread.
+    """
+
+    def __init__(self, quiz_manager, sinks: List[FrameSink], fps: int = HEADLESS_RENDER_FPS,
+                 feed: Optional[QuizOverlayFeed] = None):
+        self.feed = feed or QuizOverlayFeed(quiz_manager)
+        self.overlay = self.feed.overlay
+        self.engagement = self.feed.engagement
+        self.sinks = sinks
+        self.fps = fps
+        self.renderer = OverlayRenderer(self.overlay)
+        self.frames_late = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        quiz_manager.add_listener(self.on_quiz_event)
+        metrics_registry.add_histogram("quiz_overlay_frame_render_seconds", self.renderer.render_time,
+                                       "Durée de rendu d'une image de l'overlay sans affichage")
+        metrics_registry.add_gauge("quiz_overlay_frames_late_total", lambda: self.frames_late,
+                                   "Images de l'overlay sautées faute de temps")
+
+    def attach_client(self, client):
+        self.feed.attach_client(client)
+
+    def on_quiz_event(self, event_type: str, data: Dict[str, Any]):
+        if event_type == "question_started":
+            self.prefetch_next_layouts(data["index"])
+
+    def prefetch_next_layouts(self, index: int):
+        """Mise en page de la question suivante calculée pendant la question en cours"""
+        questions = self.feed.quiz_manager.questions
+        if index + 1 < len(questions):
+            upcoming = questions[index + 1]
+            self.renderer.question_layout.prefetch([upcoming.text])
+            self.renderer.answer_layout.prefetch([upcoming.get_masked_answer(), upcoming.answer])
+
+    def render_frame(self, frame_number: int):
+        self.feed.tick()
+        dirty = self.renderer.render()
+        for sink in self.sinks:
+            sink.write(self.renderer.image, dirty, frame_number)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="headless-overlay", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        for sink in self.sinks:
+            sink.close()
+        render_time = self.renderer.render_time
+        logger.info(f"Overlay sans affichage: {self.renderer.frames} images, rendu p50 "
+                    f"{render_time.percentile(50) / 1e6:.2f}ms p99 {render_time.percentile(99) / 1e6:.2f}ms, "
+                    f"{self.frames_late} images sautées")
+
+    def _run(self):
+        """Images à cadence fixe; une image en retard est sautée plutôt que de décaler les suivantes"""
+        interval = 1.0 / self.fps
+        frame_number = 0
+        deadline = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self.render_frame(frame_number)
+            except Exception as e:
+                logger.error(f"Erreur de rendu de l'overlay: {e}")
+            frame_number += 1
+            deadline += interval
+            delay = deadline - time.monotonic()
+            if delay < 0:
+                skipped = int(-delay / interval) + 1
+                self.frames_late += skipped
+                frame_number += skipped
+                deadline += skipped * interval
+                delay = deadline - time.monotonic()
+            self._stop.wait(max(0.0, delay))
@@ -0,0 +1,272 @@
+"""
+Serveur local de l'overlay pour les sources navigateur d'OBS.
+Un petit serveur HTTP + WebSocket (asyncio, sans dépendance) tourne dans le
+processus du quiz: il sert la page de l'overlay et pousse aux navigateurs
+abonnés uniquement les changements de l'état (question, timer, lignes du
+classement, gagnant) en messages JSON courts. Chaque changement est encodé une
+seule fois puis écrit tel quel à tous les clients.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import struct
+from typing import Any, Callable, Dict, Optional, Set
+
+from config import (
+    OVERLAY_SERVER_HOST, OVERLAY_SERVER_PORT, OVERLAY_SERVER_PUSH_INTERVAL, OVERLAY_SERVER_MAX_BUFFER
+)
+from logger_setup import logger
+from metrics import registry as metrics_registry
+from overlay_state import OverlayState
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+OPCODE_TEXT = 0x1
+OPCODE_CLOSE = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+
+
+def encode_frame(payload: bytes, opcode: int = OPCODE_TEXT) -> bytes:
+    """Trame WebSocket serveur -> client (jamais masquée)"""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 65536:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+async def read_frame(reader: asyncio.StreamReader):
+    """Lit une trame client (toujours masquée); retourne (opcode, données)"""
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", await reader.readexactly(8))[0]
+    mask = await reader.readexactly(4) if second & 0x80 else b"\x00\x00\x00\x00"
+    payload = await reader.readexactly(length)
+    return first & 0x0F, bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+
+
+def state_delta(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Champs modifiés; le classement n'envoie que les lignes qui ont changé ({rang: ligne})"""
+    delta = {}
+    for field, value in current.items():
+        old = previous.get(field)
+        if old == value:
+            continue
+        if field == "scores" and old is not None:
+            delta[field] = {str(rank): row for rank, row in enumerate(value)
+                            if rank >= len(old) or old[rank] != row}
+        else:
+            delta[field] = value
+    return delta
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    return encode_frame(json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+class OverlayServer:
+    """
+    Diffuse un OverlayState aux pages d'overlay connectées.
+
+    Args:
+        state: État à diffuser (lu par instantanés, sans le consommer: le rendu Tk
+            ou sans affichage peut lire le même état)
+        tick: Appelée avant chaque comparaison (ex: QuizOverlayFeed.tick pour le timer)
+    """
+
+    def __init__(self, state: OverlayState, tick: Optional[Callable[[], None]] = None,
+                 host: str = OVERLAY_SERVER_HOST, port: int = OVERLAY_SERVER_PORT,
+                 push_interval: float = OVERLAY_SERVER_PUSH_INTERVAL):
+        self.state = state
+        self.tick = tick
+        self.host = host
+        self.port = port
+        self.push_interval = push_interval
+        self.clients: Set[asyncio.StreamWriter] = set()
+        self.sequence = 0
+        self.messages_sent = 0
+        self._sent_state: Dict[str, Any] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def serve(self):
+        """Sert l'overlay jusqu'à l'annulation de la tâche (port 0 ou occupé: désactivé)"""
+        if not self.port:
+            return
+        try:
+            self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        except OSError as e:
+            logger.warning(f"Serveur d'overlay indisponible sur {self.host}:{self.port}: {e}")
+            return
+        metrics_registry.add_gauge("quiz_overlay_clients", lambda: len(self.clients),
+                                   "Pages d'overlay connectées en WebSocket")
+        print(f"🖥️ Overlay pour OBS disponible sur http://{self.host}:{self.port}/")
+        try:
+            while True:
+                self.push_changes()
+                await asyncio.sleep(self.push_interval)
+        finally:
+            self._server.close()
+            for writer in list(self.clients):
+                writer.close()
+            self.clients.clear()
+
+    def push_changes(self):
+        """Envoie à tous les clients les champs modifiés depuis le dernier envoi"""
+        if self.tick is not None:
+            self.tick()
+        current = self.state.snapshot()
+        delta = state_delta(self._sent_state, current)
+        self._sent_state = current
+        if not delta or not self.clients:
+            return
+        self.sequence += 1
+        self.broadcast(encode_message({"seq": self.sequence, "set": delta}))
+
+    def broadcast(self, frame: bytes):
+        """Écrit la même trame à tous les clients; un client trop lent est déconnecté"""
+        for writer in list(self.clients):
+            transport = writer.transport
+            if transport.is_closing() or transport.get_write_buffer_size() > OVERLAY_SERVER_MAX_BUFFER:
+                self.clients.discard(writer)
+                writer.close()
+                continue
+            writer.write(frame)
+            self.messages_sent += 1
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        lines = request.decode("latin-1").split("\r\n")
+        parts = lines[0].split(" ")
+        path = parts[1].split("?")[0] if len(parts) > 1 else "/"
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+            await self._handle_websocket(reader, writer, headers)
+        elif path in ("/", "/index.html"):
+            self._respond(writer, "200 OK", "text/html; charset=utf-8", OVERLAY_PAGE.encode("utf-8"))
+        elif path == "/state":
+            body = json.dumps(self.state.snapshot(), ensure_ascii=False).encode("utf-8")
+            self._respond(writer, "200 OK", "application/json; charset=utf-8", body)
+        else:
+            self._respond(writer, "404 Not Found", "text/plain; charset=utf-8", b"Not found")
+
+    @staticmethod
+    def _respond(writer: asyncio.StreamWriter, status: str, content_type: str, body: bytes):
+        writer.write(f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body)
+        writer.close()
+
+    async def _handle_websocket(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                                headers: Dict[str, str]):
+        key = headers.get("sec-websocket-key", "")
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode("ascii")).digest()).decode()
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode("ascii"))
+        # Le nouveau client reçoit l'état complet, puis les mêmes changements que les autres
+        writer.write(encode_message({"seq": self.sequence, "set": self._sent_state or self.state.snapshot()}))
+        self.clients.add(writer)
+        try:
+            while True:
+                opcode, payload = await read_frame(reader)
+                if opcode == OPCODE_CLOSE:
+                    writer.write(encode_frame(b"", OPCODE_CLOSE))
+                    break
+                if opcode == OPCODE_PING:
+                    writer.write(encode_frame(payload, OPCODE_PONG))
+                # Les messages texte des clients sont ignorés: la page ne fait qu'afficher
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.clients.discard(writer)
+            writer.close()
+
+
+# Page servie aux sources navigateur d'OBS (fond transparent, même disposition que la fenêtre Tk)
+OVERLAY_PAGE = """<!DOCTYPE html>
+<html lang="fr">
+<head>
+<meta charset="utf-8">
+<title>Quiz TikTok</title>
+<style>
+  body { margin: 0; width: 400px; background: transparent; color: white;
+         font-family: Arial, sans-serif; overflow: hidden; }
+  .panel { background: #232323; margin: 5px 10px; padding: 5px; text-align: center; }
+  #header { display: flex; justify-content: space-between; align-items: center; font-weight: bold; }
+  #date { white-space: pre-line; font-size: 16px; }
+  #timer { color: #FF3333; font-size: 42px; }
+  #question { font-size: 24px; font-weight: bold; min-height: 150px; display: flex;
+              align-items: center; justify-content: center; }
+  #answer { font-size: 30px; min-height: 60px; }
+  #likes-title { color: #FF69B4; font-weight: bold; }
+  #likes-bar { background: #333333; height: 20px; margin: 4px 20px; }
+  #likes-fill { background: linear-gradient(#FF99CC 50%, #FF69B4 50%); height: 100%; width: 0; }
+  #scores div { text-align: left; font-size: 13px; padding: 3px 10px; white-space: pre; }
+  #winner { position: absolute; top: 40%; width: 400px; text-align: center; font-size: 28px;
+            font-weight: bold; color: gold; opacity: 0; transition: opacity 0.5s; }
+  #winner.visible { opacity: 1; }
+</style>
+</head>
+<body>
+<div id="header" class="panel"><span id="date"></span><span id="question_count"></span><span id="timer"></span></div>
+<div id="question" class="panel"></div>
+<div id="answer" class="panel"></div>
+<div class="panel"><div id="likes-title">OBJECTIF LIKES ❤️</div><div id="likes-count"></div>
+  <div id="likes-bar"><div id="likes-fill"></div></div></div>
+<div id="scores" class="panel"></div>
+<div id="winner"></div>
+<script>
+const scores = document.getElementById("scores");
+for (let i = 0; i < 10; i++) scores.appendChild(document.createElement("div"));
+const text = (id, value) => { document.getElementById(id).textContent = value; };
+const apply = {
+  date: v => text("date", v),
+  question_count: v => text("question_count", v),
+  timer: v => text("timer", v),
+  question: v => text("question", v),
+  answer: ([value, color]) => { text("answer", value); document.getElementById("answer").style.color = color; },
+  likes: ([current, goal]) => {
+    text("likes-count", current + " / " + goal);
+    document.getElementById("likes-fill").style.width = Math.min(100, goal > 0 ? 100 * current / goal : 100) + "%";
+  },
+  scores: rows => {
+    for (const [rank, [value, color]] of Object.entries(rows)) {
+      const row = scores.children[rank];
+      if (row) { row.textContent = value; row.style.color = color; }
+    }
+  },
+  winner: w => {
+    const banner = document.getElementById("winner");
+    banner.textContent = w ? "🎉 " + w.username + " 🎉" : "";
+    banner.classList.toggle("visible", !!w);
+  },
+};
+function connect() {
+  const socket = new WebSocket("ws://" + location.host + "/ws");
+  socket.onmessage = event => {
+    const message = JSON.parse(event.data);
+    for (const [field, value] of Object.entries(message.set)) {
+      if (apply[field]) apply[field](value);
+    }
+  };
+  socket.onclose = () => setTimeout(connect, 1000);
+}
+connect();
+</script>
+</body>
+</html>
+"""
@@ -0,0 +1,241 @@
+"""
+État affiché par l'overlay du Quiz TikTok.
+Les différentes parties du quiz (timer, questions, scores, likes...) écrivent
+ici au lieu de modifier directement les widgets; chaque changement marque le
+champ comme "sale" et le rendu (Tk ou sans affichage) n'applique, une fois par
+image, que les champs modifiés.
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from config import LIKES_GOAL, ENGAGEMENT_REFRESH_INTERVAL
+from question_timer import display_seconds
+
+# Champs de l'overlay et leur valeur initiale
+OVERLAY_FIELDS: Dict[str, Any] = {
+    "date": "",
+    "question_count": "Question 1/65",
+    "timer": "40",
+    "question": "En attente de connexion...",
+    "answer": ("", "white"),  # (texte, couleur)
+    "scores": (("...", "white"),) * 10,  # une ligne (texte, couleur) par place du top 10
+    "likes": (0, LIKES_GOAL),  # (likes actuels, objectif)
+    "winner": None,  # gagnant de la question en cours: {"username", "answer", "question"}
+}
+
+# Couleurs des lignes du classement
+SCORE_COLORS = ("gold", "silver", "#CD7F32", "#00FF00", "#00FF00")
+
+
+def format_leaderboard_rows(leaderboard: List[Tuple[str, int, str]], size: int = 10) -> Tuple[Tuple[str, str], ...]:
+    """Construit les lignes (texte, couleur) du top `size` à partir du classement"""
+    medals = ("🥇", "🥈", "🥉")
+    rows = []
+    for i in range(size):
+        if i < len(leaderboard):
+            _, score, name = leaderboard[i]
+            # Formater le texte avec une largeur fixe pour un meilleur alignement
+            prefix = medals[i] if i < 3 else f"{i+1}."
+            color = SCORE_COLORS[i] if i < len(SCORE_COLORS) else "white"
+            rows.append((f"{prefix} {name:<20}: {score:>4} points", color))
+        else:
+            rows.append(("...", "white"))
+    return tuple(rows)
+
+
+# Traduction manuelle si la locale ne fonctionne pas
+JOURS_FR = {"Monday": "Lundi", "Tuesday": "Mardi", "Wednesday": "Mercredi", 
+            "Thursday": "Jeudi", "Friday": "Vendredi", "Saturday": "Samedi", 
+            "Sunday": "Dimanche"}
+MOIS_FR = {"January": "Janvier", "February": "Février", "March": "Mars", 
+           "April": "Avril", "May": "Mai", "June": "Juin", 
+           "July": "Juillet", "August": "Août", "September": "Septembre", 
+           "October": "Octobre", "November": "Novembre", "December": "Décembre"}
+
+
+def format_datetime_fr(now: datetime) -> str:
+    """Format : Jour Numéro Mois Année + Heure:Minute:Seconde"""
+    date_text = now.strftime("%A %d %B %Y\n%H:%M:%S")
+    # Remplacer les jours et mois anglais par leurs équivalents français
+    for en, fr in JOURS_FR.items():
+        date_text = date_text.replace(en, fr)
+    for en, fr in MOIS_FR.items():
+        date_text = date_text.replace(en, fr)
+    return date_text
+
+
+class OverlayState:
+    """Valeurs affichées et ensemble des champs modifiés depuis le dernier rendu"""
+
+    def __init__(self):
+        self.values: Dict[str, Any] = dict(OVERLAY_FIELDS)
+        self.dirty: Set[str] = set(OVERLAY_FIELDS)
+        # Écritures reçues / champs réellement rendus, pour mesurer la coalescence
+        self.writes = 0
+        self._lock = threading.Lock()
+
+    def set(self, field: str, value: Any) -> bool:
+        """Change un champ; retourne False si la valeur était déjà affichée"""
+        if field not in self.values:
+            raise KeyError(f"Champ d'overlay inconnu: {field}")
+        with self._lock:
+            self.writes += 1
+            if self.values[field] == value:
+                return False
+            self.values[field] = value
+            self.dirty.add(field)
+            return True
+
+    def get(self, field: str) -> Any:
+        return self.values[field]
+
+    def take_dirty(self) -> Dict[str, Any]:
+        """Retourne les champs modifiés (et leur valeur) puis les marque comme rendus"""
+        with self._lock:
+            if not self.dirty:
+                return {}
+            changes = {field: self.values[field] for field in self.dirty}
+            self.dirty.clear()
+            return changes
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.values)
+
+    def mark_all_dirty(self, fields: Optional[Set[str]] = None):
+        with self._lock:
+            self.dirty.update(fields or self.values)
+
+
+class EngagementCounters:
+    """
+    Likes, cadeaux et follows du live, agrégés dans le thread asyncio.
+    Les événements ne font qu'incrémenter des compteurs; l'overlay les lit à
+    cadence limitée (publish) au lieu d'être redessiné à chaque like.
+    """
+
+    def __init__(self, likes_goal: int = LIKES_GOAL,
+                 refresh_interval: float = ENGAGEMENT_REFRESH_INTERVAL):
+        self.likes_goal = likes_goal
+        self.refresh_interval = refresh_interval
+        self.likes = 0
+        self.gifts = 0
+        self.follows = 0
+        self.events = 0
+        self._last_publish = 0.0
+
+    def add_likes(self, count: int, stream_total: Optional[int] = None):
+        """Un événement de likes (TikTok les envoie par lots); le total du live fait foi s'il est connu"""
+        self.events += 1
+        if stream_total is not None and stream_total >= self.likes:
+            self.likes = stream_total
+        else:
+            self.likes += count
+
+    def add_like_event(self, event):
+        """LikeEvent de TikTokLive (count: likes du lot, total: total du live)"""
+        self.add_likes(getattr(event, "count", 1) or 1, getattr(event, "total", None))
+
+    def add_gift_event(self, event):
+        """GiftEvent de TikTokLive; les cadeaux en série ne sont comptés qu'à la fin de la série"""
+        gift = getattr(event, "gift", None)
+        if getattr(gift, "streakable", False) and not getattr(event, "repeat_end", True):
+            return
+        self.add_gift(getattr(event, "repeat_count", 1) or 1)
+
+    def add_gift(self, count: int = 1):
+        self.events += 1
+        self.gifts += count
+
+    def add_follow(self):
+        self.events += 1
+        self.follows += 1
+
+    def publish(self, overlay: OverlayState, force: bool = False) -> bool:
+        """Pousse les compteurs vers l'overlay au plus une fois par `refresh_interval`"""
+        now = time.monotonic()
+        if not force and now - self._last_publish < self.refresh_interval:
+            return False
+        self._last_publish = now
+        return overlay.set("likes", (self.likes, self.likes_goal))
+
+
+class QuizOverlayFeed:
+    """
+    Alimente un OverlayState à partir des événements d'un QuizManager (mode console
+    et sans affichage; la fenêtre Tk écrit elle-même dans son état).
+    `tick()` met à jour ce qui dépend du temps: horloge, compte à rebours, likes.
+    """
+
+    def __init__(self, quiz_manager, overlay: Optional[OverlayState] = None):
+        self.overlay = overlay or OverlayState()
+        self.engagement = EngagementCounters()
+        self.quiz_manager = None
+        self._last_clock_second = -1
+        self.set_quiz_manager(quiz_manager)
+
+    def set_quiz_manager(self, quiz_manager):
+        """Suit un nouveau questionnaire (le précédent n'est plus écouté)"""
+        if self.quiz_manager is not None:
+            self.quiz_manager.remove_listener(self.on_quiz_event)
+        self.quiz_manager = quiz_manager
+        quiz_manager.add_listener(self.on_quiz_event)
+        self.overlay.set("scores", format_leaderboard_rows(quiz_manager.get_leaderboard(10)))
+
+    def attach_client(self, client):
+        """Compte les likes, cadeaux et follows du live (thread asyncio)"""
+        from TikTokLive.events import FollowEvent, GiftEvent, LikeEvent
+
+        async def on_like(event):
+            self.engagement.add_like_event(event)
+
+        async def on_gift(event):
+            self.engagement.add_gift_event(event)
+
+        async def on_follow(_):
+            self.engagement.add_follow()
+
+        client.add_listener(LikeEvent, on_like)
+        client.add_listener(GiftEvent, on_gift)
+        client.add_listener(FollowEvent, on_follow)
+
+    def on_quiz_event(self, event_type: str, data: Dict[str, Any]):
+        """Traduit les événements du quiz en champs de l'overlay (thread du quiz)"""
+        if event_type == "question_started":
+            question = data["question"]
+            self.overlay.set("winner", None)
+            self.overlay.set("question", question.text)
+            self.overlay.set("question_count", f"Question {data['index'] + 1}/{data['total']}")
+            self.overlay.set("answer", (question.get_masked_answer(), "white"))
+            self.overlay.set("timer", str(question.time_limit))
+        elif event_type == "correct_answer":
+            answer = data["question"].answer
+            self.overlay.set("winner", {"username": data["username"], "answer": answer,
+                                        "question": data["index"] + 1})
+            self.overlay.set("question", f"{data['username']} a trouvé la bonne réponse!")
+            self.overlay.set("answer", (answer, "green"))
+            self.overlay.set("scores", format_leaderboard_rows(self.quiz_manager.get_leaderboard(10)))
+        elif event_type == "scores_reset":
+            self.overlay.set("scores", format_leaderboard_rows([]))
+        elif event_type == "quiz_finished":
+            self.overlay.set("question", "Quiz terminé!")
+            self.overlay.set("answer", ("", "white"))
+            self.overlay.set("timer", "0")
+
+    def tick(self):
+        now = datetime.now()
+        if now.second != self._last_clock_second:
+            self._last_clock_second = now.second
+            self.overlay.set("date", format_datetime_fr(now))
+        question = self.quiz_manager.current_question
+        if question is not None and question.deadline_ns is not None:
+            if question.active and not self.quiz_manager.correct_answer_found:
+                self.overlay.set("timer", str(display_seconds(question.deadline_ns)))
+            elif not question.active and not self.quiz_manager.correct_answer_found:
+                self.overlay.set("timer", "0")
+                self.overlay.set("question", "Temps écoulé!")
+                self.overlay.set("answer", (question.answer, "orange"))
+        self.engagement.publish(self.overlay)
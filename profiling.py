@@ -0,0 +1,260 @@
+"""
+Profilage à la demande du Quiz TikTok en production.
+Démarre/arrête une session cProfile (thread principal) et un profileur par
+échantillonnage (tous les threads) sans redémarrer le quiz, puis écrit un
+fichier pstats et un fichier de piles repliées (flamegraph) dans les logs.
+"""
+
+import os
+import re
+import signal
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple
+
+from config import (
+    PROFILE_OUTPUT_DIR, PROFILE_SAMPLE_INTERVAL, PROFILE_SIGNAL,
+    PROFILE_CONTROL_HOST, PROFILE_CONTROL_PORT
+)
+from logger_setup import logger
+
+if TYPE_CHECKING:
+    import cProfile
+
+
+class StackSampler:
+    """Échantillonne périodiquement la pile de tous les threads (format "piles repliées")"""
+
+    def __init__(self, interval: float = PROFILE_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _frame_label(frame) -> str:
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _sample(self):
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        own_ident = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(self._frame_label(frame))
+                frame = frame.f_back
+            labels.append(thread_names.get(ident, str(ident)))
+            # Les flamegraphs lisent les piles de la racine vers la feuille
+            self.stacks[";".join(reversed(labels))] += 1
+        self.samples += 1
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def write_collapsed(self, file_path: str):
+        """Écrit une ligne "pile;de;fonctions nombre" par pile (flamegraph.pl, speedscope)"""
+        with open(file_path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class RuntimeProfiler:
+    """
+    Session de profilage démarrable et arrêtable pendant que le quiz tourne.
+
+    Args:
+        tag_provider: Retourne l'étiquette des fichiers (questionnaire et question en cours)
+        dispatcher: Exécute une fonction sur le thread à profiler (boucle Tk ou asyncio);
+            cProfile ne mesure que le thread qui l'active
+    """
+
+    def __init__(self, tag_provider: Callable[[], str],
+                 dispatcher: Optional[Callable[[Callable[[], None]], None]] = None,
+                 output_dir: str = PROFILE_OUTPUT_DIR,
+                 sample_interval: float = PROFILE_SAMPLE_INTERVAL):
+        self.tag_provider = tag_provider
+        self.dispatcher = dispatcher
+        self.output_dir = output_dir
+        self.sample_interval = sample_interval
+        self.profile: Optional["cProfile.Profile"] = None
+        self.sampler: Optional[StackSampler] = None
+        self.started_at = 0.0
+        self.start_tag = ""
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        return self.profile is not None
+
+    def dispatch(self, action: Callable[[], None]):
+        """Exécute `action` sur le thread profilé (ou immédiatement sans dispatcher)"""
+        if self.dispatcher is None:
+            action()
+        else:
+            self.dispatcher(action)
+
+    def _tag(self) -> str:
+        try:
+            tag = self.tag_provider()
+        except Exception:
+            tag = "inconnu"
+        return re.sub(r"[^\w.-]+", "_", tag)
+
+    def start(self):
+        with self._lock:
+            if self.profile is not None:
+                return
+            self.start_tag = self._tag()
+            self.started_at = time.monotonic()
+            self.sampler = StackSampler(self.sample_interval)
+            self.sampler.start()
+            # Import tardif: cProfile et pstats ne servent qu'une fois le profilage demandé
+            import cProfile
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        print(f"🔬 Profilage démarré ({self.start_tag})")
+        logger.info(f"Profilage démarré ({self.start_tag})")
+
+    def stop(self) -> Optional[Tuple[str, str]]:
+        """Arrête la session et retourne les chemins (pstats, piles repliées)"""
+        with self._lock:
+            if self.profile is None:
+                return None
+            profile, sampler = self.profile, self.sampler
+            profile.disable()
+            sampler.stop()
+            self.profile = None
+            self.sampler = None
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        end_tag = self._tag()
+        tag = self.start_tag if end_tag == self.start_tag else f"{self.start_tag}-{end_tag}"
+        base_path = os.path.join(self.output_dir, f"profile_{timestamp}_{tag}")
+        stats_path = base_path + ".pstats"
+        collapsed_path = base_path + ".folded"
+        profile.dump_stats(stats_path)
+        sampler.write_collapsed(collapsed_path)
+
+        duration = time.monotonic() - self.started_at
+        print(f"🔬 Profilage arrêté après {duration:.1f}s: {stats_path}, {collapsed_path}")
+        logger.info(f"Profil enregistré ({duration:.1f}s, {sampler.samples} échantillons): "
+                    f"{stats_path}, {collapsed_path}")
+        self.log_top_functions(stats_path)
+        return stats_path, collapsed_path
+
+    def toggle(self):
+        if self.active:
+            self.stop()
+        else:
+            self.start()
+
+    @staticmethod
+    def log_top_functions(stats_path: str, limit: int = 10):
+        """Résume dans les logs les fonctions au temps cumulé le plus élevé"""
+        import pstats
+        stats = pstats.Stats(stats_path)
+        entries = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+        for (file_name, line, function), (_, calls, own_time, cumulative_time, _) in entries:
+            logger.info(f"  {cumulative_time * 1000:9.1f}ms cumulé {own_time * 1000:9.1f}ms propre "
+                        f"{calls:7d} appels  {function} ({os.path.basename(file_name)}:{line})")
+
+
+def _install_signal_toggle(profiler: RuntimeProfiler) -> Optional[str]:
+    """Associe le signal configuré (SIGBREAK sous Windows) au démarrage/arrêt du profilage"""
+    for name in (PROFILE_SIGNAL, "SIGBREAK"):
+        signal_number = getattr(signal, name, None)
+        if signal_number is None:
+            continue
+        try:
+            signal.signal(signal_number, lambda *_: profiler.dispatch(profiler.toggle))
+        except ValueError:
+            # signal.signal n'est autorisé que dans le thread principal
+            return None
+        return name
+    return None
+
+
+def _serve_control_socket(profiler: RuntimeProfiler, server: socket.socket):
+    """Commandes texte d'une ligne: start, stop, toggle, status"""
+    commands: Dict[str, Callable[[], None]] = {
+        "start": profiler.start, "stop": profiler.stop, "toggle": profiler.toggle
+    }
+    while True:
+        try:
+            connection, _ = server.accept()
+        except OSError:
+            return
+        with connection:
+            try:
+                command = connection.recv(64).decode("ascii", "ignore").strip().lower()
+                if command in commands:
+                    profiler.dispatch(commands[command])
+                    reply = "ok"
+                elif command == "status":
+                    reply = "actif" if profiler.active else "inactif"
+                else:
+                    reply = "commandes: start, stop, toggle, status"
+                connection.sendall(f"{reply}\n".encode("utf-8"))
+            except OSError:
+                continue
+
+
+def install_profiling_controls(profiler: RuntimeProfiler,
+                               port: int = PROFILE_CONTROL_PORT,
+                               host: str = PROFILE_CONTROL_HOST):
+    """Active les commandes de profilage à chaud (signal et socket locale)"""
+    signal_name = _install_signal_toggle(profiler)
+    if signal_name:
+        logger.info(f"Profilage à chaud: envoyer {signal_name} au processus {os.getpid()}")
+
+    if not port:
+        return
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        server.bind((host, port))
+        server.listen(1)
+    except OSError as e:
+        server.close()
+        logger.warning(f"Socket de contrôle du profilage indisponible sur {host}:{port}: {e}")
+        return
+    threading.Thread(target=_serve_control_socket, args=(profiler, server),
+                     name="profile-control", daemon=True).start()
+    logger.info(f"Profilage à chaud: 'toggle' sur {host}:{port} (ex: python profiling.py toggle)")
+
+
+def send_profiling_command(command: str, port: int = PROFILE_CONTROL_PORT,
+                           host: str = PROFILE_CONTROL_HOST) -> str:
+    """Envoie une commande au quiz en cours d'exécution et retourne sa réponse"""
+    with socket.create_connection((host, port), timeout=5) as connection:
+        connection.sendall(f"{command}\n".encode("ascii"))
+        return connection.recv(256).decode("utf-8").strip()
+
+
+if __name__ == "__main__":
+    # Pilotage d'un quiz déjà lancé: python profiling.py [start|stop|toggle|status]
+    try:
+        print(send_profiling_command(sys.argv[1] if len(sys.argv) > 1 else "toggle"))
+    except OSError as e:
+        print(f"❌ Aucun quiz à l'écoute sur {PROFILE_CONTROL_HOST}:{PROFILE_CONTROL_PORT}: {e}")
+        sys.exit(1)
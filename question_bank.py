@@ -0,0 +1,180 @@
+"""
+Banques de questions partagées en lecture seule.
+Une banque est validée et compilée une seule fois par processus, puis partagée
+entre toutes les sessions de quiz qui l'utilisent. Elle est stockée en colonnes
+(chaînes internées, entiers dans des array, lettres révélées en masques de bits)
+pour rester compacte avec des banques de centaines de milliers de questions.
+"""
+
+import os
+import sys
+import threading
+from array import array
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from config import DEFAULT_POINTS, DEFAULT_TIME_LIMIT
+from logger_setup import logger
+from theme_bank import ThemeBank, catalog_path, parse_bank_path
+from validators import validate_questions_file
+
+
+class QuestionSpec(NamedTuple):
+    """Définition immuable d'une question telle que lue dans le fichier"""
+    text: str
+    answer: str
+    revealed_indices: Optional[Tuple[int, ...]]
+    points: int
+    time_limit: int
+    theme: Optional[str]
+
+
+def indices_to_mask(indices: Iterable[int]) -> int:
+    """Positions révélées -> masque de bits (bit i: lettre i révélée)"""
+    mask = 0
+    for index in indices:
+        if index >= 0:  # un indice négatif ne désigne aucune lettre
+            mask |= 1 << index
+    return mask
+
+
+def mask_to_indices(mask: int) -> Tuple[int, ...]:
+    indices = []
+    index = 0
+    while mask:
+        if mask & 1:
+            indices.append(index)
+        mask >>= 1
+        index += 1
+    return tuple(indices)
+
+
+def mask_answer(answer: str, mask: int) -> str:
+    """Réponse affichée: lettres révélées et espaces conservés, les autres remplacées par _"""
+    return ' '.join(char if (mask >> i) & 1 or char == ' ' else '_' for i, char in enumerate(answer))
+
+
+class QuestionStore:
+    """
+    Banque compilée, une colonne par champ.
+    Les réponses et thèmes répétés ne sont stockés qu'une fois (sys.intern); points et
+    durées tiennent dans des array d'entiers. Quand le fichier fixe les lettres révélées,
+    le masque et la réponse masquée sont calculés ici une fois pour toutes les sessions;
+    sinon (None) chaque session tire ses lettres au chargement.
+    """
+
+    __slots__ = ("texts", "answers", "revealed_masks", "masked_answers", "points", "time_limits", "themes")
+
+    def __init__(self, texts: Sequence[str], answers: Sequence[str],
+                 revealed_masks: Sequence[Optional[int]], masked_answers: Sequence[Optional[str]],
+                 points: array, time_limits: array, themes: Sequence[Optional[str]]):
+        self.texts = texts
+        self.answers = answers
+        self.revealed_masks = revealed_masks
+        self.masked_answers = masked_answers
+        self.points = points
+        self.time_limits = time_limits
+        self.themes = themes
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def spec(self, index: int) -> QuestionSpec:
+        mask = self.revealed_masks[index]
+        return QuestionSpec(
+            text=self.texts[index],
+            answer=self.answers[index],
+            revealed_indices=mask_to_indices(mask) if mask else None,
+            points=self.points[index],
+            time_limit=self.time_limits[index],
+            theme=self.themes[index]
+        )
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.spec(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return self.spec(index)
+
+    def __iter__(self) -> Iterator[QuestionSpec]:
+        for index in range(len(self)):
+            yield self.spec(index)
+
+
+QuestionBank = QuestionStore
+
+# Cache des banques compilées: {chemin absolu: (mtime, taille, banque)}
+_bank_cache: Dict[str, Tuple[float, int, QuestionBank]] = {}
+_bank_lock = threading.Lock()
+
+
+def compile_question_bank(questions_data) -> QuestionBank:
+    """Transforme une liste de questions validées en banque immuable (en colonnes)"""
+    intern = sys.intern
+    texts: List[str] = []
+    answers: List[str] = []
+    revealed_masks: List[Optional[int]] = []
+    masked_answers: List[Optional[str]] = []
+    points = array("i")
+    time_limits = array("i")
+    themes: List[Optional[str]] = []
+    for q_data in questions_data:
+        answer = intern(q_data["answer"])
+        revealed = q_data.get("revealed_indices")
+        mask = indices_to_mask(revealed) if revealed else None
+        texts.append(intern(q_data["text"]))
+        answers.append(answer)
+        revealed_masks.append(mask)
+        masked_answers.append(intern(mask_answer(answer, mask)) if mask else None)
+        points.append(q_data.get("points", DEFAULT_POINTS))
+        time_limits.append(q_data.get("time_limit", DEFAULT_TIME_LIMIT))
+        theme = q_data.get("theme")
+        themes.append(intern(theme) if theme else theme)
+    return QuestionStore(tuple(texts), tuple(answers), tuple(revealed_masks), tuple(masked_answers),
+                         points, time_limits, tuple(themes))
+
+
+def load_question_bank(file_path: str) -> QuestionBank:
+    """
+    Retourne la banque compilée d'un fichier de questions.
+
+    Le fichier n'est relu et revalidé que s'il a été modifié depuis le dernier chargement.
+    Les chemins de banques par thème (voir theme_bank) ne lisent que les thèmes
+    demandés; un tirage aléatoire ("...?sample=20") donne une nouvelle banque à chaque appel.
+
+    Args:
+        file_path (str): Chemin vers le fichier de questions, ou vers tout ou partie d'une banque par thème
+
+    Returns:
+        QuestionStore: Banque partagée et non modifiable (itérable en QuestionSpec)
+
+    Raises:
+        ValueError: Si le fichier est invalide
+    """
+    selection = parse_bank_path(file_path)
+    if selection is not None and selection.sample is not None:
+        return compile_question_bank(ThemeBank(selection.bank_dir).load(selection))
+
+    key = os.path.abspath(file_path)
+    # Une banque par thème change avec son catalogue, réécrit à chaque construction
+    stat = os.stat(catalog_path(selection.bank_dir) if selection is not None else key)
+
+    with _bank_lock:
+        cached = _bank_cache.get(key)
+        if cached and cached[0] == stat.st_mtime and cached[1] == stat.st_size:
+            return cached[2]
+
+        if selection is not None:
+            questions_data = ThemeBank(selection.bank_dir).load(selection)
+        else:
+            questions_data = validate_questions_file(file_path)
+        bank = compile_question_bank(questions_data)
+        _bank_cache[key] = (stat.st_mtime, stat.st_size, bank)
+        logger.debug(f"Banque de questions compilée: {file_path} ({len(bank)} questions)")
+        return bank
+
+
+def clear_question_bank_cache():
+    """Vide le cache des banques compilées"""
+    with _bank_lock:
+        _bank_cache.clear()
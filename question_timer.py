@@ -0,0 +1,104 @@
+"""
+Chronométrage des questions du quiz sur l'horloge monotone.
+Chaque question active porte une échéance absolue (time.monotonic_ns): les
+affichages en déduisent le temps restant, et la fin du temps imparti est
+déclenchée par un seul rappel planifié à l'échéance (boucle asyncio ou Tk), au
+lieu d'un décompte seconde par seconde qui dérive de la latence de chaque rappel.
+"""
+
+import math
+import time
+from typing import Any, Callable, Optional
+
+NS_PER_SECOND = 1_000_000_000
+
+
+def deadline_after(seconds: float) -> int:
+    """Échéance absolue (monotonic_ns) dans `seconds` secondes"""
+    return time.monotonic_ns() + int(seconds * NS_PER_SECOND)
+
+
+def remaining_seconds(deadline_ns: int, now_ns: Optional[int] = None) -> float:
+    """Temps restant avant l'échéance (0 une fois passée)"""
+    now_ns = time.monotonic_ns() if now_ns is None else now_ns
+    return max(0, deadline_ns - now_ns) / NS_PER_SECOND
+
+
+def deadline_passed(deadline_ns: int, now_ns: Optional[int] = None) -> bool:
+    """Vrai une fois l'échéance atteinte (même règle pour le rappel, les réponses et les statistiques)"""
+    now_ns = time.monotonic_ns() if now_ns is None else now_ns
+    return now_ns >= deadline_ns
+
+
+def display_seconds(deadline_ns: int, now_ns: Optional[int] = None) -> int:
+    """Secondes affichées par le compte à rebours (arrondi supérieur: 40, 39... 1, 0)"""
+    return math.ceil(remaining_seconds(deadline_ns, now_ns))
+
+
+class QuestionTimer:
+    """
+    Déclenche la fin du temps d'une question à son échéance.
+
+    Args:
+        schedule: Planifie un rappel: schedule(délai en secondes, rappel) -> identifiant
+        cancel: Annule un rappel planifié à partir de son identifiant
+    """
+
+    def __init__(self, schedule: Callable[[float, Callable[[], None]], Any],
+                 cancel: Callable[[Any], None]):
+        self.schedule = schedule
+        self.cancel_callback = cancel
+        self.question = None
+        self.on_expired: Optional[Callable[[Any], None]] = None
+        self.expired_count = 0
+        self._handle = None
+
+    @classmethod
+    def for_asyncio(cls, loop) -> "QuestionTimer":
+        """Rappels sur une boucle asyncio (à utiliser depuis le thread de la boucle)"""
+        return cls(lambda delay, callback: loop.call_later(delay, callback), lambda handle: handle.cancel())
+
+    @classmethod
+    def for_tk(cls, root) -> "QuestionTimer":
+        """Rappels sur la boucle Tkinter (à utiliser depuis le thread Tk)"""
+        return cls(lambda delay, callback: root.after(max(1, math.ceil(delay * 1000)), callback),
+                   root.after_cancel)
+
+    def start(self, question, on_expired: Callable[[Any], None]):
+        """Suit une question déjà activée; on_expired(question) est appelé à son échéance"""
+        self.cancel()
+        self.question = question
+        self.on_expired = on_expired
+        self._arm()
+
+    def cancel(self):
+        """Oublie la question en cours (bonne réponse trouvée, arrêt du quiz)"""
+        if self._handle is not None:
+            try:
+                self.cancel_callback(self._handle)
+            except Exception:
+                pass
+        self._handle = None
+        self.question = None
+
+    def remaining_seconds(self) -> float:
+        if self.question is None or self.question.deadline_ns is None:
+            return 0.0
+        return remaining_seconds(self.question.deadline_ns)
+
+    def _arm(self):
+        self._handle = self.schedule(self.remaining_seconds(), self._fire)
+
+    def _fire(self):
+        self._handle = None
+        question = self.question
+        if question is None or not question.active:
+            return
+        if not question.deadline_passed():
+            # Rappel légèrement en avance (arrondi à la milliseconde de Tk): replanifier
+            self._arm()
+            return
+        self.question = None
+        question.deactivate()
+        self.expired_count += 1
+        self.on_expired(question)
@@ -0,0 +1,259 @@
+"""
+Questionnaires multiples: rotation entre les fichiers du dossier des
+questionnaires et création de leur structure (mode create_structure).
+Une entrée de l'index peut aussi désigner un thème d'une banque par thème
+("file": "anglais/history.jsonl") ou un tirage parmi plusieurs thèmes
+({"bank": "anglais", "themes": ["history", "art"], "sample": 20}).
+"""
+
+import json
+import os
+import shutil
+
+# Importation des modules d'amélioration
+from config import DEFAULT_QUESTIONNAIRE, THEME_BANK_SAMPLE_SIZE
+from theme_bank import ThemeBank, bank_selection_path, catalog_path
+
+
+class QuestionnaireManager:
+    """Gestionnaire des questionnaires multiples"""
+    def __init__(self, questionnaires_dir="questionnaires"):
+        self.questionnaires_dir = questionnaires_dir
+        self.index_file = os.path.join(questionnaires_dir, "index.json")
+        self.current_questionnaire_index = 0
+        self.questionnaires_list = []
+        
+        # Vérifier si le dossier existe
+        if not os.path.exists(questionnaires_dir):
+            os.makedirs(questionnaires_dir)
+            print(f"Dossier '{questionnaires_dir}' créé avec succès!")
+            
+        # Charger l'index s'il existe, sinon le créer
+        self.load_questionnaires_index()
+            
+    def load_questionnaires_index(self):
+        """Charge la liste des questionnaires disponibles"""
+        if os.path.exists(self.index_file):
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    self.questionnaires_list = json.load(f)
+                print(f"Index des questionnaires chargé: {len(self.questionnaires_list)} questionnaires disponibles")
+            except Exception as e:
+                print(f"Erreur lors du chargement de l'index: {e}")
+                self.create_default_index()
+        else:
+            print("Index des questionnaires non trouvé, création d'un index par défaut")
+            self.create_default_index()
+            
+    def create_default_index(self):
+        """Crée un index par défaut avec les questionnaires existants"""
+        self.questionnaires_list = []
+        
+        # Chercher les fichiers existants dans le dossier
+        files = [f for f in os.listdir(self.questionnaires_dir) 
+                if f.startswith("questionnaire_") and f.endswith(".json")]
+        
+        # Si des fichiers existent, les ajouter à l'index
+        if files:
+            for file in sorted(files):
+                theme = file.replace("questionnaire_", "").replace(".json", "")
+                id = int(theme) if theme.isdigit() else len(self.questionnaires_list) + 1
+                self.questionnaires_list.append({"id": id, "theme": f"Questionnaire {id}", "file": file})
+
+        # Banques par thème: un questionnaire par thème (fichier JSONL du thème)
+        for bank in sorted(os.listdir(self.questionnaires_dir)):
+            bank_dir = os.path.join(self.questionnaires_dir, bank)
+            if not os.path.exists(catalog_path(bank_dir)):
+                continue
+            try:
+                entries = ThemeBank(bank_dir).entries
+            except (OSError, ValueError, TypeError) as e:
+                print(f"Banque par thème ignorée {bank_dir}: {e}")
+                continue
+            for entry in entries:
+                id = len(self.questionnaires_list) + 1
+                self.questionnaires_list.append({"id": id, "theme": entry.theme, "file": f"{bank}/{entry.file}"})
+        
+        # Si aucun fichier n'existe, ajouter les deux questionnaires originaux
+        if not self.questionnaires_list:
+            self.questionnaires_list = [
+                {"id": 1, "theme": "Culture générale", "file": "questionnaire_1.json"},
+                {"id": 2, "theme": "Divertissement", "file": "questionnaire_2.json"}
+            ]
+            
+        # Enregistrer l'index
+        self.save_index()
+    
+    def save_index(self):
+        """Enregistre l'index des questionnaires"""
+        try:
+            with open(self.index_file, 'w', encoding='utf-8') as f:
+                json.dump(self.questionnaires_list, f, ensure_ascii=False, indent=4)
+            print("Index des questionnaires sauvegardé avec succès!")
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde de l'index: {e}")
+    
+    def get_next_questionnaire_path(self):
+        """Retourne le chemin du prochain questionnaire à utiliser"""
+        # Charger ou rafraîchir l'index pour s'assurer que nous avons les dernières mises à jour
+        self.load_questionnaires_index()
+        
+        # Vérifier si l'index contient des questionnaires
+        if self.questionnaires_list:
+            # Incrémenter l'index du questionnaire actuel
+            self.current_questionnaire_index = (self.current_questionnaire_index + 1) % len(self.questionnaires_list)
+            questionnaire = self.questionnaires_list[self.current_questionnaire_index]
+            
+            # Questionnaire tiré d'une banque par thème: seules les questions tirées sont lues
+            if "bank" in questionnaire:
+                bank_dir = os.path.join(self.questionnaires_dir, questionnaire["bank"])
+                if os.path.exists(catalog_path(bank_dir)):
+                    path = bank_selection_path(bank_dir, questionnaire.get("themes"),
+                                               questionnaire.get("sample", THEME_BANK_SAMPLE_SIZE))
+                    print(f"Utilisation de la banque par thème {path}")
+                    return path
+                print(f"Banque {bank_dir} sans catalogue, recherche d'une alternative...")
+            # Construire le chemin du fichier
+            if "file" in questionnaire:
+                file_path = os.path.join(self.questionnaires_dir, questionnaire["file"])
+            else:
+                file_path = os.path.join(self.questionnaires_dir, f"questionnaire{questionnaire['id']}.json")
+            
+            # Vérifier si le fichier existe
+            if os.path.exists(file_path):
+                print(f"Utilisation du questionnaire {file_path}")
+                return file_path
+            
+            # Si le fichier n'existe pas dans le dossier questionnaires, essayer à la racine
+            root_path = questionnaire.get("file", "")
+            if root_path and os.path.exists(root_path):
+                print(f"Utilisation du questionnaire à la racine: {root_path}")
+                return root_path
+            
+            print(f"Questionnaire {file_path} non trouvé, recherche d'une alternative...")
+        else:
+            print("Aucun questionnaire listé dans l'index.")
+                
+        # Plan B: rechercher directement les fichiers questionnaire*.json dans le dossier
+        questionnaire_files = []
+        if os.path.exists(self.questionnaires_dir):
+            for file in os.listdir(self.questionnaires_dir):
+                if file.startswith("questionnaire") and file.endswith(".json") and "index" not in file:
+                    questionnaire_files.append(os.path.join(self.questionnaires_dir, file))
+            
+            if questionnaire_files:
+                selected_file = questionnaire_files[0]  # Prendre le premier trouvé
+                print(f"Utilisation du questionnaire trouvé automatiquement: {selected_file}")
+                return selected_file
+                
+        # Plan C: fallback sur les questionnaires à la racine du projet
+        root_questionnaires = []
+        for i in range(1, 6):  # Chercher questionnaire1.json à questionnaire5.json
+            file_path = f"questionnaire{i}.json"
+            if os.path.exists(file_path):
+                root_questionnaires.append(file_path)
+                
+        if root_questionnaires:
+            selected_path = root_questionnaires[0]  # Prendre le premier disponible
+            print(f"Utilisation du questionnaire à la racine: {selected_path}")
+            return selected_path
+            
+        # Dernier recours: utiliser le questionnaire par défaut
+        print("Aucun questionnaire trouvé, utilisation du questionnaire par défaut")
+        return DEFAULT_QUESTIONNAIRE
+    
+    def get_current_theme(self):
+        """Retourne le thème du questionnaire actuel"""
+        # Si on utilise les questionnaires de la racine
+        root_questionnaires = []
+        for i in range(1, 6):
+            file_path = f"questionnaire{i}.json"
+            if os.path.exists(file_path):
+                root_questionnaires.append(file_path)
+                
+        if root_questionnaires and 0 <= self.current_questionnaire_index < len(root_questionnaires):
+            current_file = root_questionnaires[self.current_questionnaire_index]
+            # Déterminer le thème en fonction du nom du fichier
+            themes = {
+                "questionnaire1.json": "Culture générale 1",
+                "questionnaire2.json": "Cinéma et séries",
+                "questionnaire3.json": "Culture générale 2",
+                "questionnaire4.json": "Culture générale 3",
+                "questionnaire5.json": "Musique"
+            }
+            return themes.get(current_file, "Questionnaire")
+        
+        # Si on utilise les questionnaires de l'index
+        if not self.questionnaires_list:
+            return "Culture générale"
+            
+        return self.questionnaires_list[self.current_questionnaire_index].get("theme", "Questionnaire")
+
+def create_questionnaires():
+    """Crée 40 fichiers de questionnaires dans un dossier dédié"""
+    
+    # Création du dossier pour les questionnaires s'il n'existe pas
+    questionnaires_dir = "questionnaires"
+    if not os.path.exists(questionnaires_dir):
+        os.makedirs(questionnaires_dir)
+        print(f"Dossier '{questionnaires_dir}' créé avec succès!")
+    
+    # Liste des thèmes pour les questionnaires
+    themes = [
+        "Culture générale", "Cinéma et séries", "Musique", "Sport", "Géographie",
+        "Histoire", "Sciences", "Littérature", "Technologie", "Gastronomie",
+        "Jeux vidéo", "Animaux", "Art", "Mythologie", "Mode", 
+        "Astronomie", "Médecine", "Langue française", "Inventions", "Architecture",
+        "Bandes dessinées", "Voitures", "Politique", "Religion", "Économie",
+        "Célébrités", "Voyages", "Nature", "Océans", "Mathématiques",
+        "Intelligence artificielle", "Culture internet", "Photographie", "Danse", "Théâtre",
+        "Philosophie", "Psychologie", "Événements actuels", "Traditions", "Records du monde"
+    ]
+    
+    # Questionnaire modèle
+    template_questions = []
+    for i in range(1, 16):
+        template_questions.append({
+            "text": f"Question {i}",
+            "answer": f"Réponse {i}",
+            "points": 10,
+            "time_limit": 40
+        })
+    
+    # Génération des 40 questionnaires
+    questionnaires_index = []
+    for i, theme in enumerate(themes, 1):
+        # Créer le modèle de base du questionnaire
+        questionnaire = template_questions.copy()
+        
+        # Personnaliser le questionnaire selon le thème
+        for j in range(len(questionnaire)):
+            questionnaire[j]["text"] = f"Question {j+1} sur le thème '{theme}'"
+        
+        # Enregistrer le questionnaire dans un fichier
+        file_name = f"questionnaire_{i}.json"
+        file_path = os.path.join(questionnaires_dir, file_name)
+        
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(questionnaire, f, ensure_ascii=False, indent=4)
+        
+        # Ajouter à l'index
+        questionnaires_index.append({
+            "id": i,
+            "theme": theme,
+            "file": file_name
+        })
+        
+        print(f"Questionnaire {i}: {theme} - créé avec succès!")
+    
+    # Enregistrer l'index
+    with open(os.path.join(questionnaires_dir, "index.json"), 'w', encoding='utf-8') as f:
+        json.dump(questionnaires_index, f, ensure_ascii=False, indent=4)
+    
+    print(f"40 questionnaires créés avec succès dans le dossier '{questionnaires_dir}'!")
+    
+    # Conserver les fichiers originaux à la racine pour compatibilité
+    shutil.copy(os.path.join(questionnaires_dir, "questionnaire_1.json"), "questionnaire1.json")
+    shutil.copy(os.path.join(questionnaires_dir, "questionnaire_2.json"), "questionnaire2.json")
+    
+    print("Fichiers originaux copiés à la racine pour compatibilité.")
@@ -0,0 +1,222 @@
+"""
+Statistiques par question, pour voir après le live quelles questions étaient
+trop difficiles ou trop faciles.
+Pendant le quiz, chaque question posée occupe une ligne de colonnes (array):
+délai de la première bonne réponse, tentatives, participants distincts et
+expiration; chaque réponse vérifiée ajoute sa latence à des array en ajout
+seul. La capture ne coûte donc que quelques append par commentaire.
+En fin de quiz les colonnes sont écrites en Parquet si pyarrow est installé,
+sinon en CSV: <dossier>/<questionnaire>_<date>_questions.* et _answers.*
+"""
+
+import csv
+import os
+import threading
+import time
+from array import array
+from datetime import datetime
+from typing import Any, List, Optional, Set
+
+from config import ANALYTICS_DIR, ANALYTICS_FORMAT
+from logger_setup import logger
+
+NO_CORRECT_ANSWER = -1  # first_correct_ms d'une question sans bonne réponse
+
+QUESTION_COLUMNS = ("question_row", "question_index", "text", "answer", "started_at", "time_limit",
+                    "first_correct_ms", "attempts", "participants", "expired")
+ANSWER_COLUMNS = ("question_row", "latency_ms", "correct")
+
+
+def load_pyarrow():
+    """Modules pyarrow et pyarrow.parquet, ou None (import différé: pyarrow est long à importer)"""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        return None
+    return pyarrow, pyarrow.parquet
+
+
+class AnalyticsColumns:
+    """Colonnes des questions posées et des réponses vérifiées"""
+
+    def __init__(self):
+        # Une ligne par question posée
+        self.questions = array("I")  # index de la question dans le questionnaire
+        self.texts: List[str] = []
+        self.answers: List[str] = []
+        self.started_at = array("d")  # horodatage (secondes depuis l'epoch)
+        self.time_limits = array("I")
+        self.first_correct_ms = array("i")
+        self.attempts = array("I")
+        self.participants = array("I")
+        self.expired = array("B")
+        # Une ligne par réponse vérifiée
+        self.answer_rows = array("I")  # ligne de la question
+        self.answer_latency_ms = array("I")  # depuis le début de la question
+        self.answer_correct = array("B")
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+
+class QuizAnalytics:
+    """
+    Capture des statistiques d'un quiz (une instance par QuizManager).
+
+    Args:
+        questionnaire: Nom du questionnaire, utilisé pour nommer les fichiers exportés
+        output_dir: Dossier des exports
+        file_format: "parquet", "csv" ou "auto" (Parquet si pyarrow est disponible)
+    """
+
+    def __init__(self, questionnaire: str, output_dir: str = ANALYTICS_DIR, file_format: str = ANALYTICS_FORMAT):
+        self.questionnaire = questionnaire
+        self.output_dir = output_dir
+        self.file_format = file_format
+        self.columns = AnalyticsColumns()
+        # Question en cours
+        self._row = -1
+        self._started_ns = 0
+        self._attempts = 0
+        self._users: Set[str] = set()
+
+    @property
+    def question_open(self) -> bool:
+        return self._row >= 0
+
+    def start_question(self, number: int, question: Any):
+        columns = self.columns
+        self._row = len(columns.questions)
+        self._started_ns = time.monotonic_ns()
+        self._attempts = 0
+        self._users = set()
+        columns.questions.append(number)
+        columns.texts.append(question.text)
+        columns.answers.append(question.answer)
+        columns.started_at.append(time.time())
+        columns.time_limits.append(question.time_limit)
+        columns.first_correct_ms.append(NO_CORRECT_ANSWER)
+        columns.attempts.append(0)
+        columns.participants.append(0)
+        columns.expired.append(0)
+
+    def comment(self, user_id: str):
+        """Commentaire reçu pendant la question (avant tout filtrage)"""
+        self._attempts += 1
+        self._users.add(user_id)
+
+    def answer(self, correct: bool):
+        """Réponse vérifiée: sa latence depuis le début de la question"""
+        columns = self.columns
+        latency_ms = (time.monotonic_ns() - self._started_ns) // 1_000_000
+        columns.answer_rows.append(self._row)
+        columns.answer_latency_ms.append(latency_ms)
+        columns.answer_correct.append(correct)
+        if correct and columns.first_correct_ms[self._row] == NO_CORRECT_ANSWER:
+            columns.first_correct_ms[self._row] = latency_ms
+
+    def end_question(self, expired: bool):
+        if self._row < 0:
+            return
+        columns = self.columns
+        columns.attempts[self._row] = self._attempts
+        columns.participants[self._row] = len(self._users)
+        columns.expired[self._row] = expired
+        self._row = -1
+        self._users = set()
+
+    def export(self, background: bool = True) -> Optional[threading.Thread]:
+        """
+        Écrit les questions terminées et repart de colonnes vides.
+        À appeler entre deux questions; en arrière-plan, le thread n'est pas démon
+        pour que l'export se termine même si le programme s'arrête.
+        """
+        if self.question_open or not len(self.columns):
+            return None
+        columns, self.columns = self.columns, AnalyticsColumns()
+        base_path = os.path.join(self.output_dir,
+                                 f"{self.questionnaire}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}")
+        if not background:
+            write_analytics(columns, base_path, self.file_format)
+            return None
+        thread = threading.Thread(target=write_analytics, args=(columns, base_path, self.file_format),
+                                  name="analytics-export")
+        thread.start()
+        return thread
+
+
+def write_analytics(columns: AnalyticsColumns, base_path: str, file_format: str = ANALYTICS_FORMAT) -> List[str]:
+    """Écrit <base>_questions et <base>_answers; retourne les chemins écrits (aucun en cas d'erreur)"""
+    start = time.perf_counter()
+    pyarrow_modules = load_pyarrow() if file_format in ("auto", "parquet") else None
+    if file_format == "parquet" and pyarrow_modules is None:
+        logger.warning("pyarrow n'est pas installé: statistiques exportées en CSV")
+    try:
+        directory = os.path.dirname(base_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if pyarrow_modules is not None:
+            paths = _write_parquet(columns, base_path, *pyarrow_modules)
+        else:
+            paths = _write_csv(columns, base_path)
+    except Exception as e:
+        logger.error(f"Erreur lors de l'export des statistiques du quiz: {e}")
+        return []
+    logger.info(f"Statistiques du quiz exportées en {time.perf_counter() - start:.2f}s: "
+                f"{len(columns)} questions, {len(columns.answer_rows)} réponses ({paths[0]})")
+    return paths
+
+
+def _question_rows(columns: AnalyticsColumns):
+    for row in range(len(columns)):
+        first_correct = columns.first_correct_ms[row]
+        yield (row, columns.questions[row], columns.texts[row], columns.answers[row],
+               datetime.fromtimestamp(columns.started_at[row]).isoformat(timespec="seconds"),
+               columns.time_limits[row], "" if first_correct == NO_CORRECT_ANSWER else first_correct,
+               columns.attempts[row], columns.participants[row], columns.expired[row])
+
+
+def _write_csv(columns: AnalyticsColumns, base_path: str) -> List[str]:
+    questions_path = base_path + "_questions.csv"
+    answers_path = base_path + "_answers.csv"
+    with open(questions_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(QUESTION_COLUMNS)
+        writer.writerows(_question_rows(columns))
+    with open(answers_path, "w", encoding="utf-8", newline="", buffering=1024 * 1024) as f:
+        writer = csv.writer(f)
+        writer.writerow(ANSWER_COLUMNS)
+        writer.writerows(zip(columns.answer_rows, columns.answer_latency_ms, columns.answer_correct))
+    return [questions_path, answers_path]
+
+
+def _numeric_column(pa, values: array, arrow_type):
+    """Colonne Arrow qui réutilise la mémoire de l'array, sans conversion élément par élément"""
+    return pa.Array.from_buffers(arrow_type, len(values), [None, pa.py_buffer(values)])
+
+
+def _write_parquet(columns: AnalyticsColumns, base_path: str, pa, pq) -> List[str]:
+    questions_path = base_path + "_questions.parquet"
+    answers_path = base_path + "_answers.parquet"
+    questions = pa.table({
+        "question_row": pa.array(range(len(columns)), pa.uint32()),
+        "question_index": _numeric_column(pa, columns.questions, pa.uint32()),
+        "text": pa.array(columns.texts, pa.string()),
+        "answer": pa.array(columns.answers, pa.string()),
+        "started_at": pa.array([datetime.fromtimestamp(value) for value in columns.started_at], pa.timestamp("ms")),
+        "time_limit": _numeric_column(pa, columns.time_limits, pa.uint32()),
+        "first_correct_ms": pa.array([None if value == NO_CORRECT_ANSWER else value
+                                      for value in columns.first_correct_ms], pa.int32()),
+        "attempts": _numeric_column(pa, columns.attempts, pa.uint32()),
+        "participants": _numeric_column(pa, columns.participants, pa.uint32()),
+        "expired": _numeric_column(pa, columns.expired, pa.uint8()).cast(pa.bool_()),
+    })
+    answers = pa.table({
+        "question_row": _numeric_column(pa, columns.answer_rows, pa.uint32()),
+        "latency_ms": _numeric_column(pa, columns.answer_latency_ms, pa.uint32()),
+        "correct": _numeric_column(pa, columns.answer_correct, pa.uint8()).cast(pa.bool_()),
+    })
+    pq.write_table(questions, questions_path)
+    pq.write_table(answers, answers_path)
+    return [questions_path, answers_path]
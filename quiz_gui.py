@@ -0,0 +1,774 @@
+"""
+Interface graphique Tkinter du quiz, connectée au live TikTok.
+tkinter et la locale française ne sont chargés que par ce mode.
+"""
+
+from TikTokLive import TikTokLiveClient
+from TikTokLive.events import CommentEvent, ConnectEvent, DisconnectEvent, LikeEvent, GiftEvent, FollowEvent
+import asyncio
+import collections
+import json
+import os
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import tkinter as tk
+from tkinter import font
+import time
+import threading
+import locale
+
+# Importation des modules d'amélioration
+from config import (
+    TTS_ENABLED, COMMENT_RECORDING_ENABLED, STALL_DETECTION_ENABLED, GUI_RENDER_FPS,
+    QUESTION_TEXT_BOX, QUESTION_FONT_SIZES, ANSWER_TEXT_BOX, ANSWER_FONT_SIZES
+)
+from logger_setup import logger
+from connection_supervisor import ConnectionSupervisor
+from metrics import SessionMetrics, registry as metrics_registry
+from comment_recorder import CommentRecorder
+from profiling import RuntimeProfiler
+from stall_detector import stall_watchdog
+from tts_worker import (
+    TTSWorker, clean_text_for_tts,
+    PRIORITY_WINNER, PRIORITY_ANNOUNCEMENT, PRIORITY_QUESTION
+)
+from tts_cache import texts_to_prerender
+from tts_backends import create_tts_backend
+from overlay_state import (
+    EngagementCounters, OverlayState, format_datetime_fr, format_leaderboard_rows
+)
+from overlay_server import OverlayServer
+from question_timer import QuestionTimer, display_seconds
+from text_layout import TextLayoutEngine
+from quiz_manager import QuizManager, profile_tag_for
+from questionnaire_manager import QuestionnaireManager
+from startup_graph import StartupGraph
+from startup_profile import startup_profile
+
+
+def setup_french_locale():
+    """Essaie de définir la locale française (une seule fois: setlocale est coûteux)"""
+    try:
+        locale.setlocale(locale.LC_TIME, 'fr_FR.UTF-8')  # Pour Linux/Mac
+    except locale.Error:
+        try:
+            locale.setlocale(locale.LC_TIME, 'fra_fra')  # Pour Windows
+        except locale.Error:
+            try:
+                locale.setlocale(locale.LC_TIME, 'fr')  # Alternative simplifiée
+            except locale.Error:
+                print("Impossible de définir la locale en français, utilisation de la locale par défaut")
+
+class TikTokQuizGUI:
+    """Classe combinant l'interface graphique et la connexion TikTok Live"""
+    def __init__(self, root, tiktok_username, questions_file=None, start_question=1,
+                 record_comments=COMMENT_RECORDING_ENABLED):
+        self.root = root
+        self.root.title("Quiz TikTok Live")
+        self.root.geometry("400x700")
+        self.root.configure(bg="#000000")
+        
+        # Configurer la transparence de la fenêtre
+        self.root.attributes('-alpha', 0.9)  # Légère transparence pour la fenêtre
+        self.root.attributes('-transparentcolor', '#000000')  # Rendre le noir transparent
+        
+        # Questionnaires, questions, moteur TTS et client TikTok sont créés en
+        # parallèle par le graphe de démarrage (voir build_startup_graph)
+        self.tiktok_username = tiktok_username
+        self.questionnaire_manager: Optional[QuestionnaireManager] = None
+        self.quiz_manager: Optional[QuizManager] = None
+        self.tts_worker: Optional[TTSWorker] = None
+        self.tiktok_client: Optional[TikTokLiveClient] = None
+        self.connection_supervisor: Optional[ConnectionSupervisor] = None
+        self.tiktok_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # État affiché, appliqué aux widgets une fois par image par render_tick
+        self.overlay = OverlayState()
+        self.engagement = EngagementCounters()
+        for counter in ("likes", "gifts", "follows"):
+            metrics_registry.add_gauge(f"quiz_live_{counter}_total",
+                                       lambda counter=counter: getattr(self.engagement, counter),
+                                       f"{counter} reçus pendant le live")
+        self.render_interval_ms = max(1, int(1000 / GUI_RENDER_FPS))
+        self._rendered_scores: List[Any] = [None] * 10
+        self._last_clock_second = -1
+        self._pending_overlay_ns: List[int] = []
+        # Bonnes réponses trouvées dans le thread TikTok, affichées par render_tick dans le thread Tk:
+        # (question, pseudo, réception du commentaire)
+        self._verdicts: Deque[Tuple[Any, str, int]] = collections.deque()
+        
+        # Création des polices et interface, affichée tout de suite en état de chargement
+        with startup_profile.phase("Interface"):
+            self.setup_gui()
+        self.overlay.set("question", "Chargement du quiz...")
+        
+        # Variables pour suivre l'état du quiz
+        self.current_question_index = 0
+        # Fin du temps de chaque question: un seul rappel Tk à l'échéance
+        self.question_timer = QuestionTimer.for_tk(self.root)
+        self.is_running = True
+        self.timer_id = None  # Pour stocker l'identifiant du timer actuel
+        
+        # Si une question de départ est spécifiée, la configurer
+        self.start_question = start_question
+
+        self.comment_recorder = CommentRecorder.for_stream(tiktok_username) if record_comments else None
+        self.metrics = SessionMetrics(tiktok_username)
+        metrics_registry.add_session(self.metrics)
+        
+        # Le chargement commence pendant la fin de l'initialisation; les étapes
+        # d'interface attendent la boucle Tk
+        self.startup = self.build_startup_graph()
+        self.startup.start()
+
+    def build_startup_graph(self) -> StartupGraph:
+        """Étapes du démarrage et leurs dépendances (questions, TTS et connexion en parallèle)"""
+        graph = StartupGraph(dispatch_main=lambda action: self.root.after(0, action),
+                             on_error=self.on_startup_error,
+                             on_complete=lambda: startup_profile.ready("Initialisation terminée"))
+        graph.add("Questionnaires", self.load_questionnaires)
+        graph.add("Questions et scores", self.load_quiz_manager, after=["Questionnaires"])
+        graph.add("Connexion TikTok", self.start_tiktok_connection)
+        if TTS_ENABLED:
+            graph.add("Synthèse vocale", self.init_tts_engine)
+            graph.add("Pré-rendu TTS", self.prerender_tts, after=["Synthèse vocale", "Questions et scores"])
+        # Les polices Tk ne se mesurent que dans le thread Tk
+        graph.add("Mise en page", self.prefetch_layouts, after=["Questions et scores"], main_thread=True)
+        graph.add("Démarrage du quiz", self.begin_quiz, after=["Mise en page"], main_thread=True)
+        return graph
+
+    def load_questionnaires(self) -> str:
+        """Charge l'index des questionnaires et retourne le fichier de départ"""
+        self.questionnaire_manager = QuestionnaireManager()
+        
+        # Forcer l'utilisation du questionnaire culture_quizz au démarrage
+        questions_file = os.path.join("questionnaires", "questions_culture_quizz.json")
+        if not os.path.exists(questions_file):
+            print(f"Questionnaire {questions_file} non trouvé!")
+            questions_file = self.questionnaire_manager.get_next_questionnaire_path()
+        return questions_file
+
+    def load_quiz_manager(self):
+        self.quiz_manager = QuizManager(self.startup.result("Questionnaires"))
+
+    def start_tiktok_connection(self):
+        """Crée le client TikTok Live et lance la connexion dans son propre thread"""
+        self.tiktok_client = TikTokLiveClient(unique_id=self.tiktok_username)
+        self.connection_supervisor = ConnectionSupervisor(self.tiktok_client, name=self.tiktok_username)
+        self.setup_tiktok_listeners()
+        threading.Thread(target=self.run_tiktok, name="tiktok", daemon=True).start()
+
+    def run_tiktok(self):
+        self.tiktok_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.tiktok_loop)
+        if STALL_DETECTION_ENABLED:
+            self.tiktok_loop.call_soon(stall_watchdog.watch_asyncio, self.tiktok_loop, "asyncio tiktok")
+        # La page d'overlay pour OBS lit le même état que la fenêtre
+        self.tiktok_loop.create_task(OverlayServer(self.overlay).serve())
+        self.tiktok_loop.run_until_complete(self.connection_supervisor.run())
+
+    def begin_quiz(self):
+        """Dernière étape du démarrage: les questions sont chargées et mises en page"""
+        if not self.is_running:
+            return
+        startup_profile.mark("Quiz prêt")
+        self.start_quiz()
+
+    def on_startup_error(self, name: str, error: BaseException):
+        """Affiche l'étape du démarrage qui a échoué (appelée depuis le thread de l'étape)"""
+        self.overlay.set("question", f"Erreur au démarrage: {name}")
+        self.overlay.set("answer", (str(error), "orange"))
+
+    def setup_tiktok_listeners(self):
+        """Configure les écouteurs d'événements TikTok"""
+        @self.tiktok_client.on(ConnectEvent)
+        async def on_connect(_):
+            print("✅ Connecté au live TikTok!")
+            startup_profile.mark("Connecté au live")
+            self.connection_supervisor.notify_connected()
+            
+        @self.tiktok_client.on(CommentEvent)
+        async def on_comment(event):
+            received_ns = time.perf_counter_ns()
+            self.metrics.comments += 1
+            if self.comment_recorder:
+                self.comment_recorder.record(event.user.unique_id, event.user.nickname, event.comment)
+            # Questions encore en cours de chargement: aucune question active
+            if (self.is_running and self.quiz_manager is not None and self.quiz_manager.current_question
+                    and self.quiz_manager.current_question.active):
+                print(f"💬 {event.user.nickname}: {event.comment}")
+                self.metrics.answers_checked += 1
+                question = self.quiz_manager.current_question
+                is_correct, points = self.quiz_manager.process_answer(
+                    event.user.unique_id,
+                    event.user.nickname,
+                    event.comment
+                )
+                self.metrics.verdict_latency.record(time.perf_counter_ns() - received_ns)
+                if is_correct:
+                    self.metrics.correct_answers += 1
+                    # Minuteur, timer_id et widgets ne se manipulent que dans le thread Tk
+                    self._verdicts.append((question, event.user.nickname, received_ns))
+                else:
+                    self.metrics.rejections += 1
+            else:
+                self.metrics.comments_ignored += 1
+                    
+        # Likes, cadeaux et follows: simples compteurs, l'overlay les lit à cadence limitée
+        @self.tiktok_client.on(LikeEvent)
+        async def on_like(event):
+            self.engagement.add_like_event(event)
+
+        @self.tiktok_client.on(GiftEvent)
+        async def on_gift(event):
+            self.engagement.add_gift_event(event)
+
+        @self.tiktok_client.on(FollowEvent)
+        async def on_follow(_):
+            self.engagement.add_follow()
+
+        @self.tiktok_client.on(DisconnectEvent)
+        async def on_disconnect(_):
+            # Le superviseur relance la connexion, la question en cours continue
+            print("❌ Déconnecté du live TikTok, reconnexion en cours...")
+            self.connection_supervisor.notify_disconnected()
+
+    def init_tts_engine(self):
+        """Démarre le thread de synthèse vocale (moteur choisi et configuré une seule fois)"""
+        if not TTS_ENABLED:
+            print("TTS: Désactivé dans la configuration")
+            return
+
+        self.tts_worker = TTSWorker(create_tts_backend)
+        self.tts_worker.start()
+        # Le moteur est créé dans le thread du worker: l'étape dure jusqu'à ce qu'il soit prêt
+        self.tts_worker.ready.wait()
+    
+    def clean_text_for_tts(self, text: str) -> str:
+        """Nettoie le texte pour la synthèse vocale"""
+        return clean_text_for_tts(text)
+
+    def prerender_tts(self, quiz_manager: Optional[QuizManager] = None):
+        """Pré-rend l'audio des questions restantes et des annonces pendant les silences"""
+        if self.tts_worker is None:
+            return
+        quiz_manager = quiz_manager or self.quiz_manager
+        remaining = quiz_manager.questions[quiz_manager.current_question_index + 1:]
+        themes = [entry.get("theme", "") for entry in self.questionnaire_manager.questionnaires_list]
+        self.tts_worker.prerender(texts_to_prerender(remaining, themes))
+
+    def speak_text(self, text, priority=PRIORITY_ANNOUNCEMENT, question_key=None):
+        """Lit le texte à voix haute (mis en file à priorité pour le thread TTS)"""
+        if not TTS_ENABLED or self.tts_worker is None:
+            return
+            
+        # Nettoyer le texte avant la lecture
+        text = self.clean_text_for_tts(text)
+        if not text.strip():
+            return
+            
+        self.tts_worker.speak(text, priority=priority, question_key=question_key)
+
+    def current_question_key(self):
+        """Identifie la question affichée (les lectures des questions passées sont abandonnées)"""
+        return (self.quiz_manager.questions_file, self.quiz_manager.current_question_index)
+    
+    def setup_gui(self):
+        # Création des polices
+        self.title_font = font.Font(family="Arial", size=12, weight="bold")
+        self.question_font = font.Font(family="Arial", size=18, weight="bold")
+        self.timer_font = font.Font(family="Arial", size=32, weight="bold")  # Augmentation de la taille
+        # Question et réponse: plus grande taille qui tient dans le label (métriques mises en cache)
+        self.question_layout = TextLayoutEngine(
+            lambda size: font.Font(family="Arial", size=size, weight="bold"),
+            QUESTION_TEXT_BOX, QUESTION_FONT_SIZES)
+        self.answer_layout = TextLayoutEngine(
+            lambda size: font.Font(family="Arial", size=size), ANSWER_TEXT_BOX, ANSWER_FONT_SIZES)
+        self.score_font = font.Font(family="Arial", size=10)
+        
+        # Création des frames avec un fond semi-transparent
+        self.header_frame = tk.Frame(self.root, bg="#232323", height=60)  # Augmentation de la hauteur
+        self.header_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        # Frame pour le timer et le compteur de questions
+        self.info_frame = tk.Frame(self.header_frame, bg="#232323")
+        self.info_frame.pack(side=tk.RIGHT, padx=15)  # Plus d'espace à droite
+        
+        self.question_frame = tk.Frame(self.root, bg="#232323")
+        self.question_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        self.answer_frame = tk.Frame(self.root, bg="#232323")
+        self.answer_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        # Frame pour l'objectif de likes
+        self.likes_frame = tk.Frame(self.root, bg="#232323")
+        self.likes_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        # Frame pour les scores placée après les likes
+        self.scores_frame = tk.Frame(self.root, bg="#232323")
+        self.scores_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        # Création des éléments d'interface
+        self.setup_interface()
+        
+    def setup_interface(self):
+        # Header
+        self.date_label = tk.Label(self.header_frame, text="", 
+                            bg="#232323", fg="white", font=self.title_font)
+        self.date_label.pack(side=tk.LEFT, padx=10, pady=5)
+        
+        # La date et l'heure sont mises à jour par render_tick
+        setup_french_locale()
+        
+        # Conteneur pour le compteur de questions et le timer
+        self.info_frame = tk.Frame(self.header_frame, bg="#232323")
+        self.info_frame.pack(side=tk.RIGHT, padx=15)  # Plus d'espace à droite
+        
+        self.question_count = tk.Label(self.info_frame, text="Question 1/65", 
+                               bg="#232323", fg="white", font=self.title_font)
+        self.question_count.pack(side=tk.LEFT, padx=(0,15))  # Plus d'espace entre le compteur et le timer
+        
+        # Timer à droite du compteur
+        self.timer_label = tk.Label(self.info_frame, text="40", 
+                            bg="#232323", fg="#FF3333", font=self.timer_font)
+        self.timer_label.pack(side=tk.LEFT, padx=(0,10), pady=5)  # Ajout de padding vertical
+        
+        # Question
+        self.question_label = tk.Label(self.question_frame, text="En attente de connexion...", 
+                               bg="#232323", fg="white", font=self.question_font,
+                               wraplength=QUESTION_TEXT_BOX[0], justify="center")
+        self.question_label.pack(padx=20, pady=30)
+        
+        # Réponse
+        self.answer_label = tk.Label(self.answer_frame, text="", 
+                              bg="#232323", fg="white", font=self.answer_layout.font(max(ANSWER_FONT_SIZES)),
+                              wraplength=ANSWER_TEXT_BOX[0], justify="center")
+        self.answer_label.pack(pady=20)
+        
+        # Titre de l'objectif
+        self.likes_title = tk.Label(self.likes_frame, text="OBJECTIF LIKES ❤️", 
+                             bg="#232323", fg="#FF69B4", font=self.title_font)
+        self.likes_title.pack(pady=(5,0))
+        
+        # Conteneur pour la barre de progression
+        self.likes_progress_frame = tk.Frame(self.likes_frame, bg="#232323")
+        self.likes_progress_frame.pack(fill=tk.X, padx=20, pady=5)
+        
+        # Objectif actuel / total
+        self.likes_count = tk.Label(self.likes_progress_frame, text=f"0 / {self.engagement.likes_goal}", 
+                             bg="#232323", fg="#FF69B4", font=self.title_font)
+        self.likes_count.pack(side=tk.TOP, pady=2)
+        
+        # Barre de progression avec coins arrondis
+        self.likes_progress = tk.Canvas(self.likes_progress_frame, 
+                                height=20, bg="#333333", highlightthickness=0)
+        self.likes_progress.pack(fill=tk.X, pady=2)
+        
+        # Rectangles créés une seule fois puis déplacés (coords) à chaque mise à jour
+        self.likes_bar_background = self.likes_progress.create_rectangle(0, 0, 0, 20, fill="#333333", outline="")
+        self.likes_bar_fill = self.likes_progress.create_rectangle(0, 0, 0, 20, fill="#FF69B4", outline="")
+        # Effet de brillance
+        self.likes_bar_shine = self.likes_progress.create_rectangle(0, 0, 0, 10, fill="#FF99CC",
+                                                                    outline="", stipple="gray50")
+        self.likes_progress.bind("<Configure>", lambda e: self.overlay.mark_all_dirty({"likes"}))
+        
+        # Scores
+        self.scores_title_frame = tk.Frame(self.scores_frame, bg="#232323")
+        self.scores_title_frame.pack(fill=tk.X, pady=(10, 5))
+        
+        self.scores_title = tk.Label(self.scores_title_frame, text="TOP SCORES", 
+                              bg="#232323", fg="gold", font=self.title_font)
+        self.scores_title.pack(side=tk.LEFT, padx=10)
+        
+        # Bouton de réinitialisation du classement
+        self.reset_scores_button = tk.Button(self.scores_title_frame, text="Réinitialiser", 
+                                    bg="#FF3333", fg="white", font=font.Font(family="Arial", size=8),
+                                    command=self.reset_scores)
+        self.reset_scores_button.pack(side=tk.RIGHT, padx=10)
+        
+        # Créer un canvas avec scrollbar pour les scores
+        self.scores_canvas = tk.Canvas(self.scores_frame, bg="#232323", 
+                                     highlightthickness=0, width=380)
+        self.scores_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
+        
+        # Ajouter une scrollbar
+        self.scores_scrollbar = tk.Scrollbar(self.scores_frame, orient="vertical", 
+                                           command=self.scores_canvas.yview)
+        self.scores_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # Configurer le canvas
+        self.scores_canvas.configure(yscrollcommand=self.scores_scrollbar.set)
+        
+        # Frame pour contenir les labels de score
+        self.scores_container = tk.Frame(self.scores_canvas, bg="#232323")
+        self.scores_canvas.create_window((380, 0), window=self.scores_container, anchor="ne")
+        
+        # Créer les labels pour les scores
+        self.score_labels = []
+        for i in range(10):
+            score_label = tk.Label(self.scores_container, 
+                                 text="...", 
+                                 bg="#232323", fg="white", font=self.score_font,
+                                 anchor="e", justify="right")
+            score_label.pack(pady=2)
+            self.score_labels.append(score_label)
+            
+        # Configurer le scrolling
+        self.scores_container.bind("<Configure>", lambda e: self.scores_canvas.configure(
+            scrollregion=self.scores_canvas.bbox("all")))
+
+    def render_tick(self):
+        """Applique une fois par image les changements de l'overlay aux widgets concernés"""
+        if not self.is_running:
+            return
+        self.drain_verdicts()
+        # Horloge: une seule écriture par seconde, ignorée si le texte n'a pas changé
+        now = datetime.now()
+        if now.second != self._last_clock_second:
+            self._last_clock_second = now.second
+            self.overlay.set("date", format_datetime_fr(now))
+        # Compte à rebours déduit de l'échéance de la question (ne dérive pas d'un tick à l'autre)
+        question = self.question_timer.question
+        if question is not None:
+            self.overlay.set("timer", str(display_seconds(question.deadline_ns)))
+        # Likes, cadeaux et follows: au plus ENGAGEMENT_REFRESH_INTERVAL mises à jour par seconde
+        self.engagement.publish(self.overlay)
+
+        changes = self.overlay.take_dirty()
+        if changes:
+            self.apply_overlay_changes(changes)
+            # Latence d'affichage des bonnes réponses: jusqu'au rendu effectif
+            if self._pending_overlay_ns:
+                rendered_ns = time.perf_counter_ns()
+                for received_ns in self._pending_overlay_ns:
+                    self.metrics.overlay_latency.record(rendered_ns - received_ns)
+                self._pending_overlay_ns.clear()
+        self.root.after(self.render_interval_ms, self.render_tick)
+
+    def drain_verdicts(self):
+        """Affiche les bonnes réponses reçues depuis l'image précédente (thread TikTok)"""
+        while self._verdicts:
+            question, username, received_ns = self._verdicts.popleft()
+            self.show_correct_answer(username, received_ns, question)
+
+    def apply_overlay_changes(self, changes: Dict[str, Any]):
+        """Met à jour uniquement les widgets dont l'état a changé"""
+        if "date" in changes:
+            self.date_label.config(text=changes["date"])
+        if "question_count" in changes:
+            self.question_count.config(text=changes["question_count"])
+        if "timer" in changes:
+            self.timer_label.config(text=changes["timer"])
+        if "question" in changes:
+            layout = self.question_layout.layout(changes["question"])
+            self.question_label.config(text=changes["question"], font=self.question_layout.font(layout.size),
+                                       wraplength=layout.wrap_width)
+        if "answer" in changes:
+            text, color = changes["answer"]
+            layout = self.answer_layout.layout(text)
+            self.answer_label.config(text=text, fg=color, font=self.answer_layout.font(layout.size),
+                                     wraplength=layout.wrap_width)
+        if "scores" in changes:
+            for i, (row, label) in enumerate(zip(changes["scores"], self.score_labels)):
+                if self._rendered_scores[i] != row:
+                    text, color = row
+                    label.config(text=text, fg=color)
+                    self._rendered_scores[i] = row
+        if "likes" in changes:
+            self.update_likes_progress(*changes["likes"])
+    
+    def start_quiz(self):
+        """Démarre le quiz"""
+        # Afficher l'information sur la validité des scores
+        if os.path.exists(self.quiz_manager.scores_file):
+            try:
+                with open(self.quiz_manager.scores_file, 'r', encoding='utf-8') as f:
+                    scores_data = json.load(f)
+                saved_time = datetime.fromtimestamp(scores_data["timestamp"])
+                current_time = datetime.now()
+                time_diff = (current_time - saved_time).total_seconds() / 3600  # en heures
+                if time_diff <= 24:
+                    self.overlay.set("question", f"Classement chargé!\nSauvegardé il y a {time_diff:.1f} heures")
+                    # Mise à jour immédiate des scores
+                    self.update_scores()
+                    self.root.after(3000, lambda: self.overlay.set("question", "Quiz démarré!"))
+                else:
+                    self.overlay.set("question", "Nouveau classement créé!")
+                    self.root.after(3000, lambda: self.overlay.set("question", "Quiz démarré!"))
+            except Exception:
+                self.overlay.set("question", "Nouveau classement créé!")
+                self.root.after(3000, lambda: self.overlay.set("question", "Quiz démarré!"))
+        else:
+            self.overlay.set("question", "Nouveau classement créé!")
+            self.root.after(3000, lambda: self.overlay.set("question", "Quiz démarré!"))
+            
+        # Démarrer à partir de la question spécifiée
+        if hasattr(self, 'start_question') and self.start_question > 1:
+            self.quiz_manager.start_from_question(self.start_question)
+        
+        # S'assurer que le quiz est bien en cours d'exécution
+        self.is_running = True
+        # Démarrer la première question après l'affichage du message
+        self.root.after(3500, self.next_question)
+
+    def get_appropriate_font(self, text):
+        """Retourne la plus grande police de réponse qui tient dans le label"""
+        return self.answer_layout.font(self.answer_layout.layout(text).size)
+
+    def prefetch_layouts(self, quiz_manager: Optional[QuizManager] = None):
+        """Calcule la mise en page des questions et réponses du questionnaire chargé (thread Tk)"""
+        quiz_manager = quiz_manager or self.quiz_manager
+        start = time.perf_counter()
+        texts = []
+        for question in quiz_manager.questions:
+            texts.append(question.get_masked_answer())
+            texts.append(question.answer)
+        computed = self.question_layout.prefetch(q.text for q in quiz_manager.questions)
+        computed += self.answer_layout.prefetch(texts)
+        logger.debug(f"Mise en page de {computed} textes en {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    def next_question(self):
+        """Affiche la prochaine question"""
+        # Annuler tout timer précédent
+        if self.timer_id is not None:
+            self.root.after_cancel(self.timer_id)
+            self.timer_id = None
+            
+        question = self.quiz_manager.next_question()
+        if question:
+            # Afficher la question immédiatement
+            self.overlay.set("winner", None)
+            self.overlay.set("question", question.text)
+            self.overlay.set("question_count", f"Question {self.quiz_manager.current_question_index+1}/{len(self.quiz_manager.questions)}")
+            
+            # Réponse masquée (la police est ajustée au rendu)
+            self.overlay.set("answer", (question.get_masked_answer(), "white"))
+            
+            # Le compte à rebours affiché est déduit de l'échéance par render_tick
+            self.overlay.set("timer", str(question.time_limit))
+            self.question_timer.start(question, self.on_question_expired)
+            
+            # Essayer de lire la question
+            try:
+                question_key = self.current_question_key()
+                if self.tts_worker is not None:
+                    self.tts_worker.set_current_question(question_key)
+                self.speak_text(question.text, PRIORITY_QUESTION, question_key)
+            except Exception as e:
+                print(f"TTS: Erreur lors de la lecture de la question: {e}")
+        else:
+            # Fin du quiz actuel
+            self.overlay.set("question", "Quiz terminé!")
+            self.overlay.set("answer", ("", "white"))
+            self.overlay.set("timer", "0")
+            
+            # Attendre un court instant avant de lire le message de fin
+            if self.tts_worker is not None:
+                self.tts_worker.set_current_question(None)
+            self.root.after(100, lambda: self.speak_text("Quiz terminé!"))
+            
+            # Attendre quelques secondes puis passer au questionnaire suivant
+            self.schedule_next_questionnaire()
+    
+    def load_next_questionnaire(self):
+        """Charge le questionnaire suivant hors du thread Tk, puis redémarre le quiz"""
+        self.timer_id = None
+        # Afficher un message de transition
+        self.overlay.set("question", "Chargement du prochain thème...")
+        self.build_questionnaire_graph().start()
+
+    def build_questionnaire_graph(self) -> StartupGraph:
+        """
+        Changement de questionnaire: mêmes étapes que le démarrage. Le nouveau quiz n'est
+        confié à l'interface qu'une fois prêt; le thread Tk ne fait que la mise en page.
+        """
+        graph = StartupGraph(dispatch_main=lambda action: self.root.after(0, action),
+                             on_error=self.on_questionnaire_error, name="Changement de questionnaire")
+        graph.add("Questionnaire suivant", self.load_next_quiz_manager)
+        if self.tts_worker is not None:
+            graph.add("Pré-rendu TTS", lambda: self.prerender_tts(graph.result("Questionnaire suivant")[0]),
+                      after=["Questionnaire suivant"])
+        graph.add("Mise en page", lambda: self.prefetch_layouts(graph.result("Questionnaire suivant")[0]),
+                  after=["Questionnaire suivant"], main_thread=True)
+        graph.add("Nouveau thème", lambda: self.begin_next_questionnaire(*graph.result("Questionnaire suivant")),
+                  after=["Mise en page"], main_thread=True)
+        return graph
+
+    def load_next_quiz_manager(self) -> Tuple[QuizManager, str]:
+        """Lit le questionnaire suivant (thread du graphe); retourne le quiz et son thème"""
+        questionnaire_file = self.questionnaire_manager.get_next_questionnaire_path()
+        theme = self.questionnaire_manager.get_current_theme()
+        return QuizManager(questionnaire_file), theme
+
+    def begin_next_questionnaire(self, quiz_manager: QuizManager, theme: str):
+        """Dernière étape du changement de questionnaire (thread Tk)"""
+        if not self.is_running:
+            return
+        # Informer l'utilisateur du changement de thème
+        message = f"Nouveau thème: {theme}"
+        self.overlay.set("question", message)
+        self.speak_text(message)
+        self.quiz_manager = quiz_manager
+        
+        # Attendre quelques secondes puis démarrer le nouveau quiz
+        self.timer_id = self.root.after(3000, self.start_quiz)
+
+    def on_questionnaire_error(self, name: str, error: BaseException):
+        """Chargement du questionnaire suivant en échec: nouvel essai avec celui d'après"""
+        self.overlay.set("question", f"Erreur de chargement: {name}")
+        self.overlay.set("answer", (str(error), "orange"))
+        # Signalée depuis le thread de l'étape: le minuteur se programme dans le thread Tk
+        self.root.after(0, self.schedule_next_questionnaire)
+
+    def schedule_next_questionnaire(self):
+        self.timer_id = self.root.after(5000, self.load_next_questionnaire)
+            
+    def on_question_expired(self, question):
+        """Échéance de la question atteinte (question déjà désactivée par le QuestionTimer)"""
+        if not self.is_running:
+            return
+        # Une bonne réponse comptée juste avant l'échéance attend encore son affichage:
+        # le gagnant est montré au lieu de "Temps écoulé!"
+        self.drain_verdicts()
+        if self.quiz_manager.correct_answer_found:
+            return
+        self.overlay.set("timer", "0")
+        self.overlay.set("answer", (question.answer, "orange"))
+        self.overlay.set("question", "Temps écoulé!")
+        # Passer à la question suivante après un délai
+        self.timer_id = self.root.after(3000, self.next_question)
+    
+    def show_correct_answer(self, username, received_ns: Optional[int] = None, question=None):
+        """
+        Affiche la réponse correcte et le gagnant (thread Tk uniquement).
+        received_ns: réception du commentaire; question: celle à laquelle il répondait
+        """
+        current_q = self.quiz_manager.current_question
+        if question is not None and question is not current_q:
+            # Le quiz est déjà passé à une autre question
+            return
+        if current_q:
+            # Arrêter le compte à rebours actuel
+            self.question_timer.cancel()
+            if self.timer_id is not None:
+                self.root.after_cancel(self.timer_id)
+                self.timer_id = None
+                
+            # Désactiver la question
+            current_q.deactivate()
+            
+            # Nettoyer le nom d'utilisateur pour l'affichage
+            clean_username = self.clean_text_for_tts(username)
+            
+            # La police de la réponse est ajustée au rendu
+            self.overlay.set("answer", (current_q.answer, "green"))
+            
+            display_message = f"{username} a trouvé la bonne réponse!"
+            self.overlay.set("question", display_message)
+            self.overlay.set("winner", {"username": username, "answer": current_q.answer,
+                                        "question": self.quiz_manager.current_question_index + 1})
+            
+            # Annoncer le gagnant et la bonne réponse
+            announcement = f"{clean_username} a trouvé la bonne réponse! La réponse était: {current_q.answer}"
+            print(f"TTS: Annonce de la bonne réponse: {announcement}")
+            
+            # L'annonce passe devant les autres textes et annule la lecture de la question
+            self.speak_text(announcement, PRIORITY_WINNER, self.current_question_key())
+            
+            # Mettre à jour l'affichage des scores
+            self.update_scores()
+            if received_ns is not None:
+                # Mesurée quand render_tick aura réellement affiché la réponse
+                self._pending_overlay_ns.append(received_ns)
+            
+            # Passer à la question suivante après un délai
+            self.timer_id = self.root.after(3000, self.next_question)
+    
+    def update_scores(self):
+        """Met à jour l'affichage des scores"""
+        leaderboard = self.quiz_manager.get_leaderboard(10)  # Augmenté à 10 joueurs
+        self.overlay.set("scores", format_leaderboard_rows(leaderboard, len(self.score_labels)))
+    
+    def reset_scores(self):
+        """Réinitialise le classement et met à jour l'affichage"""
+        if self.quiz_manager is not None and self.quiz_manager.reset_scores():
+            # Mettre à jour l'affichage
+            self.overlay.set("scores", format_leaderboard_rows([], len(self.score_labels)))
+            # Afficher un message de confirmation
+            self.overlay.set("question", "Classement réinitialisé!")
+            # Revenir à l'état normal après 3 secondes
+            if self.quiz_manager.current_question:
+                self.root.after(3000, lambda: self.overlay.set("question", self.quiz_manager.current_question.text))
+    
+    def cleanup_tts(self):
+        """Nettoie les ressources du TTS"""
+        if self.tts_worker is not None:
+            self.tts_worker.stop(timeout=1.0)
+
+    def profile_tag(self) -> str:
+        """Étiquette des fichiers de profilage: questionnaire et question en cours"""
+        return profile_tag_for(self.quiz_manager)
+
+    def create_profiler(self) -> RuntimeProfiler:
+        """Profileur exécuté dans le thread Tk (celui qui dessine l'overlay)"""
+        return RuntimeProfiler(self.profile_tag, dispatcher=lambda action: self.root.after(0, action))
+
+    def start(self):
+        """Démarre l'application"""
+        # Configurer la gestion de fermeture propre
+        def on_closing():
+            self.is_running = False
+            self.question_timer.cancel()
+            if self.timer_id is not None:
+                self.root.after_cancel(self.timer_id)
+            
+            # Nettoyer le moteur TTS avant de quitter
+            self.cleanup_tts()
+            
+            if self.comment_recorder:
+                self.comment_recorder.close()
+            if self.quiz_manager is not None:
+                self.quiz_manager.export_analytics()
+            if STALL_DETECTION_ENABLED:
+                stall_watchdog.log_report()
+            
+            # Fermer la connexion TikTok
+            if self.tiktok_loop is not None and self.tiktok_loop.is_running():
+                try:
+                    asyncio.run_coroutine_threadsafe(self.connection_supervisor.stop(), self.tiktok_loop)
+                except Exception:
+                    pass
+                
+            self.root.destroy()
+            
+        self.root.protocol("WM_DELETE_WINDOW", on_closing)
+        
+        # Surveiller la durée des callbacks Tk (render_tick, load_next_questionnaire...)
+        if STALL_DETECTION_ENABLED:
+            stall_watchdog.watch_tk(self.root, "tk")
+        
+        # Boucle de rendu; le quiz démarre à la fin du graphe de démarrage (begin_quiz)
+        self.render_tick()
+        self.root.after_idle(startup_profile.mark, "Fenêtre affichée")
+        
+        # Démarrer la boucle principale Tkinter
+        self.root.mainloop()
+
+    def update_likes_progress(self, current_likes: int, total_likes: int):
+        """Met à jour la barre de progression des likes (sans recréer les rectangles)"""
+        # Mettre à jour le texte
+        self.likes_count.config(text=f"{current_likes} / {total_likes}")
+        
+        # Calculer le pourcentage
+        progress = min(1.0, current_likes / total_likes) if total_likes > 0 else 1.0
+        
+        width = self.likes_progress.winfo_width()
+        if width > 0:  # S'assurer que le widget est visible
+            progress_width = int(width * progress)
+            self.likes_progress.coords(self.likes_bar_background, 0, 0, width, 20)
+            self.likes_progress.coords(self.likes_bar_fill, 0, 0, progress_width, 20)
+            self.likes_progress.coords(self.likes_bar_shine, 0, 0, progress_width, 10)
+
+    def on_like_event(self, likes_count: int):
+        """Appelé quand un nouveau like est reçu"""
+        self.engagement.add_likes(likes_count)
@@ -0,0 +1,102 @@
+"""
+Mode multi-live du Quiz TikTok.
+Fait tourner plusieurs sessions de quiz indépendantes (un compte TikTok chacune)
+sur une seule boucle asyncio, avec des banques de questions partagées.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from config import (
+    HOST_METRICS_INTERVAL, HOST_SCORES_FILE_PATTERN, COMMENT_RECORDING_ENABLED, STALL_DETECTION_ENABLED
+)
+from logger_setup import logger
+from metrics import aggregate_snapshots
+from quiz_live import TikTokQuiz
+from stall_detector import stall_watchdog
+
+
+def session_scores_file(tiktok_username: str) -> str:
+    """Retourne le fichier de scores propre à un compte TikTok"""
+    return HOST_SCORES_FILE_PATTERN.format(username=tiktok_username.lstrip("@"))
+
+
+class QuizHost:
+    """Héberge N sessions de quiz sur la même boucle d'événements"""
+    def __init__(self, usernames: List[str], questions_file: str,
+                 metrics_interval: float = HOST_METRICS_INTERVAL,
+                 record_comments: bool = COMMENT_RECORDING_ENABLED):
+        if len(set(usernames)) != len(usernames):
+            raise ValueError("Chaque compte TikTok ne peut être hébergé qu'une seule fois")
+        self.metrics_interval = metrics_interval
+        # Chaque session a son propre classement; la banque de questions est
+        # compilée une seule fois et partagée (voir question_bank.load_question_bank).
+        # Pas de serveur d'overlay par session: les ports entreraient en conflit
+        self.sessions: List[TikTokQuiz] = [
+            TikTokQuiz(username, questions_file, scores_file=session_scores_file(username),
+                       record_comments=record_comments, overlay_port=0)
+            for username in usernames
+        ]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Retourne les métriques par session et le total"""
+        per_session = []
+        for session in self.sessions:
+            snapshot = session.metrics.snapshot()
+            snapshot["connection"] = session.connection_supervisor.get_health()
+            per_session.append(snapshot)
+        return {"sessions": per_session, "total": aggregate_snapshots(per_session)}
+
+    def log_metrics(self):
+        """Écrit un résumé du débit dans les logs"""
+        metrics = self.get_metrics()
+        for snapshot in metrics["sessions"]:
+            state = "connecté" if snapshot["connection"]["connected"] else "déconnecté"
+            logger.info(
+                f"[{snapshot['name']}] {state} - {snapshot['comments']} commentaires "
+                f"({snapshot['comments_per_second']:.1f}/s), "
+                f"{snapshot['correct_answers']} bonnes réponses"
+            )
+        total = metrics["total"]
+        logger.info(
+            f"[total] {total['sessions']} sessions - {total['comments']} commentaires "
+            f"({total['comments_per_second']:.1f}/s), {total['answers_checked']} réponses vérifiées"
+        )
+
+    async def _report_metrics(self):
+        """Journalise périodiquement les métriques"""
+        while True:
+            await asyncio.sleep(self.metrics_interval)
+            self.log_metrics()
+
+    async def run_async(self):
+        """Lance toutes les sessions et attend leur fin"""
+        reporter: Optional[asyncio.Task] = None
+        if self.metrics_interval > 0:
+            reporter = asyncio.create_task(self._report_metrics())
+        try:
+            # Une session qui échoue ne doit pas arrêter les autres
+            results = await asyncio.gather(
+                *(session.run_async() for session in self.sessions),
+                return_exceptions=True
+            )
+            for session, result in zip(self.sessions, results):
+                if isinstance(result, Exception):
+                    logger.error(f"[{session.tiktok_username}] Session arrêtée: {result}")
+        finally:
+            if reporter:
+                reporter.cancel()
+
+    def run(self):
+        """Point d'entrée bloquant du mode multi-live"""
+        print(f"\n🎮 Connexion à {len(self.sessions)} lives TikTok...")
+        try:
+            asyncio.run(self.run_async())
+        except KeyboardInterrupt:
+            print("\nArrêt des quiz.")
+            for session in self.sessions:
+                session.quiz_manager.save_scores()
+        finally:
+            self.log_metrics()
+            if STALL_DETECTION_ENABLED:
+                stall_watchdog.log_report()
@@ -0,0 +1,354 @@
+"""
+Quiz en mode console connecté au live TikTok.
+TikTokLive n'est importé que par ce module et par l'interface graphique.
+"""
+
+from TikTokLive import TikTokLiveClient
+from TikTokLive.events import CommentEvent, ConnectEvent, DisconnectEvent
+import asyncio
+import random
+from typing import Optional
+import time
+
+# Importation des modules d'amélioration
+from config import COMMENT_RECORDING_ENABLED, STALL_DETECTION_ENABLED, OVERLAY_SERVER_PORT
+from logger_setup import logger
+from connection_supervisor import ConnectionSupervisor
+from metrics import SessionMetrics, registry as metrics_registry
+from comment_recorder import CommentRecorder
+from profiling import RuntimeProfiler
+from stall_detector import stall_watchdog
+from overlay_state import QuizOverlayFeed
+from overlay_server import OverlayServer
+from question_timer import QuestionTimer
+from quiz_manager import QuizManager, profile_tag_for
+from startup_profile import startup_profile
+
+
+class TikTokQuiz:
+    """Classe principale pour le quiz TikTok Live"""
+    def __init__(self, tiktok_username: str, questions_file: str, scores_file: Optional[str] = None,
+                 record_comments: bool = COMMENT_RECORDING_ENABLED, overlay_port: int = OVERLAY_SERVER_PORT):
+        self.tiktok_username = tiktok_username
+        with startup_profile.phase("Client TikTok"):
+            self.client = TikTokLiveClient(unique_id=tiktok_username)
+        with startup_profile.phase("Questions et scores"):
+            self.quiz_manager = QuizManager(questions_file, scores_file=scores_file)
+        self.metrics = SessionMetrics(tiktok_username)
+        metrics_registry.add_session(self.metrics)
+        # Enregistrement des commentaires pour un rejeu hors ligne
+        self.comment_recorder = CommentRecorder.for_stream(tiktok_username) if record_comments else None
+        self.quiz_running = False
+        self.quiz_task: Optional[asyncio.Task] = None
+        # Signalé par la bonne réponse ou par l'échéance de la question
+        self.question_done = asyncio.Event()
+        self.event_loop: Optional[asyncio.AbstractEventLoop] = None
+        # La reconnexion est entièrement gérée par le superviseur
+        self.connection_supervisor = ConnectionSupervisor(
+            self.client, name=tiktok_username,
+            on_circuit_open=self.print_connection_help
+        )
+        # Overlay navigateur pour OBS, alimenté par les événements du quiz
+        self.overlay_feed = QuizOverlayFeed(self.quiz_manager)
+        self.overlay_feed.attach_client(self.client)
+        self.overlay_server = OverlayServer(self.overlay_feed.overlay, tick=self.overlay_feed.tick,
+                                            port=overlay_port)
+        self.setup_listeners()
+        
+    def setup_listeners(self):
+        """Configure les écouteurs d'événements"""
+        @self.client.on(ConnectEvent)
+        async def on_connect(event: ConnectEvent):
+            print(f"\n✅ Connecté au live de @{event.unique_id}")
+            self.connection_supervisor.notify_connected()
+            
+            # Après une reconnexion, le quiz en cours continue là où il en était
+            if self.quiz_task and not self.quiz_task.done():
+                question = self.quiz_manager.current_question
+                if question and question.active:
+                    print(f"🔄 Reprise de la question {self.quiz_manager.current_question_index + 1} en cours")
+                return
+                
+            print("Démarrage automatique du quiz dans 10 secondes...")
+            self.quiz_task = asyncio.create_task(self._start_quiz_after_delay(10))
+            
+        @self.client.on(CommentEvent)
+        async def on_comment(event: CommentEvent):
+            received_ns = time.perf_counter_ns()
+            self.metrics.comments += 1
+            if self.comment_recorder:
+                self.comment_recorder.record(event.user.unique_id, event.user.nickname, event.comment)
+            try:
+                # Vérifier si le quiz est actif et si une question est en cours
+                if not self.quiz_running or not self.quiz_manager.current_question \
+                        or not self.quiz_manager.current_question.active:
+                    self.metrics.comments_ignored += 1
+                    return
+                
+                # Afficher le commentaire reçu
+                print(f"💬 {event.user.nickname}: '{event.comment}'")
+                
+                # Traiter la réponse
+                self.metrics.answers_checked += 1
+                is_correct, points = self.quiz_manager.process_answer(
+                    event.user.unique_id, 
+                    event.user.nickname,
+                    event.comment
+                )
+                self.metrics.verdict_latency.record(time.perf_counter_ns() - received_ns)
+                if not is_correct:
+                    self.metrics.rejections += 1
+                
+                if is_correct:
+                    self.metrics.correct_answers += 1
+                    # Afficher la réponse correcte
+                    print(f"\n✨ BONNE RÉPONSE! ✨")
+                    print(f"✅ {event.user.nickname} a trouvé la réponse et gagne {points} points!")
+                    print(f"📝 La réponse était: {self.quiz_manager.current_question.answer}")
+                    
+                    # Mettre à jour le score et désactiver la question
+                    self.quiz_manager.current_question.deactivate()
+                    self.question_done.set()
+                    self.quiz_manager.save_scores()  # Sauvegarder les scores immédiatement
+                    
+                    # Afficher le classement actuel
+                    print("\n🏆 CLASSEMENT ACTUEL:")
+                    leaderboard = self.quiz_manager.get_leaderboard(5)
+                    for i, (_, score, name) in enumerate(leaderboard, 1):
+                        if i == 1:
+                            print(f"🥇 {name}: {score} points")
+                        elif i == 2:
+                            print(f"🥈 {name}: {score} points")
+                        elif i == 3:
+                            print(f"🥉 {name}: {score} points")
+                        else:
+                            print(f"{i}. {name}: {score} points")
+                    self.metrics.overlay_latency.record(time.perf_counter_ns() - received_ns)
+                    
+                    # Attendre avant de passer à la question suivante
+                    print("\nPassage à la question suivante dans 3 secondes...")
+                    await asyncio.sleep(3)
+                    
+            except Exception as e:
+                logger.error(f"Erreur lors du traitement du commentaire: {e}")
+                print(f"⚠️ Erreur lors du traitement du commentaire: {e}")
+                    
+        @self.client.on(DisconnectEvent)
+        async def on_disconnect(_):
+            # Le quiz n'est pas interrompu: le superviseur se charge de la reconnexion
+            print("\n❌ Déconnecté du live TikTok, reconnexion en cours...")
+            self.connection_supervisor.notify_disconnected()
+                
+    async def _start_quiz_after_delay(self, delay: float):
+        """Attend quelques secondes après la connexion puis lance le quiz"""
+        await asyncio.sleep(delay)
+        await self.run_quiz()
+        
+    async def run_quiz(self):
+        """Exécute le quiz automatiquement"""
+        self.quiz_running = True
+        print("\n🎮 DÉBUT DU QUIZ AUTOMATIQUE 🎮\n")
+        
+        # Réinitialiser l'index des questions
+        self.quiz_manager.current_question_index = -1
+        question_timer = QuestionTimer.for_asyncio(asyncio.get_running_loop())
+        
+        # Boucle principale du quiz
+        while self.quiz_running:
+            try:
+                # Passer à la question suivante
+                question = self.quiz_manager.next_question()
+                
+                if not question:
+                    # Fin du quiz, toutes les questions ont été posées
+                    print("\n🏁 FIN DU QUIZ 🏁")
+                    await self.show_final_leaderboard()
+                    self.quiz_running = False
+                    break
+                    
+                self.metrics.questions_asked += 1
+                print(f"\n----- Question {self.quiz_manager.current_question_index + 1}/{len(self.quiz_manager.questions)} -----")
+                print(question)
+                print(f"Temps de réponse: {question.time_limit} secondes")
+                
+                # Attendre soit que la réponse correcte soit trouvée, soit l'échéance de la question
+                self.question_done.clear()
+                question_timer.start(question, lambda _: self.question_done.set())
+                try:
+                    await self.question_done.wait()
+                finally:
+                    question_timer.cancel()
+                
+                if not self.quiz_manager.correct_answer_found:
+                    question.deactivate()
+                    print(f"⏱️ Temps écoulé! La bonne réponse était: {question.answer}")
+                
+                # Afficher le classement après chaque question
+                await self.show_leaderboard()
+                
+                # Pause entre les questions
+                print("\nProchaine question dans 5 secondes...")
+                await asyncio.sleep(5)
+                
+            except Exception as e:
+                logger.error(f"Erreur pendant le quiz: {e}")
+                # Continuer avec la question suivante en cas d'erreur
+                continue
+    
+    async def show_leaderboard(self):
+        """Affiche le classement actuel"""
+        leaderboard = self.quiz_manager.get_leaderboard()
+        print("\n----- CLASSEMENT ACTUEL -----")
+        if not leaderboard:
+            print("Aucun score pour l'instant.")
+            return
+            
+        for i, (user_id, score, name) in enumerate(leaderboard):
+            print(f"{i+1}. {name}: {score} points")
+        
+    async def show_final_leaderboard(self):
+        """Affiche le classement final avec plus de détails"""
+        leaderboard = self.quiz_manager.get_leaderboard()
+        print("\n🏆 CLASSEMENT FINAL 🏆")
+        if not leaderboard:
+            print("Aucun participant n'a marqué de points.")
+            return
+            
+        for i, (user_id, score, name) in enumerate(leaderboard):
+            if i == 0:
+                print(f"🥇 1. {name}: {score} points")
+            elif i == 1:
+                print(f"🥈 2. {name}: {score} points")
+            elif i == 2:
+                print(f"🥉 3. {name}: {score} points")
+            else:
+                print(f"{i+1}. {name}: {score} points")
+        
+    async def run_quiz_demo(self):
+        """Version démo du quiz qui simule des réponses de spectateurs"""
+        self.quiz_running = True
+        print("\n🎮 DÉMO DU QUIZ - MODE SIMULATION 🎮\n")
+        
+        # Réinitialiser l'index des questions
+        self.quiz_manager.current_question_index = -1
+        
+        # Créer quelques utilisateurs fictifs pour la démo
+        demo_users = [
+            {"id": "user1", "name": "Sophie"},
+            {"id": "user2", "name": "Thomas"},
+            {"id": "user3", "name": "Julie"},
+            {"id": "user4", "name": "Lucas"},
+            {"id": "user5", "name": "Emma"}
+        ]
+        
+        # Boucle principale du quiz
+        while self.quiz_running:
+            # Passer à la question suivante
+            question = self.quiz_manager.next_question()
+            
+            if not question:
+                # Fin du quiz, toutes les questions ont été posées
+                print("\n🏁 FIN DU QUIZ DÉMO 🏁")
+                await self.show_final_leaderboard()
+                self.quiz_running = False
+                break
+            
+            print(f"\n----- Question {self.quiz_manager.current_question_index + 1}/{len(self.quiz_manager.questions)} -----")
+            print(question)
+            print(f"Temps de réponse: {question.time_limit} secondes")
+            
+            # Simuler des réponses aléatoires
+            await asyncio.sleep(random.randint(3, 10))  # Attente aléatoire
+            
+            # 50% de chance d'avoir une bonne réponse
+            if random.random() > 0.5:
+                random_user = random.choice(demo_users)
+                is_correct, points = self.quiz_manager.process_answer(
+                    random_user["id"],
+                    random_user["name"],
+                    question.answer
+                )
+                
+                if is_correct:
+                    print(f"✅ {random_user['name']} a répondu correctement et gagne {points} points!")
+            else:
+                # Simuler quelques mauvaises réponses
+                for _ in range(random.randint(1, 3)):
+                    random_user = random.choice(demo_users)
+                    bad_answer = question.answer + "X"  # Réponse incorrecte
+                    self.quiz_manager.process_answer(random_user["id"], random_user["name"], bad_answer)
+                    print(f"❌ {random_user['name']} a tenté une réponse incorrecte.")
+                    await asyncio.sleep(2)
+            
+            # Attendre la fin du temps
+            remaining_time = question.time_limit - random.randint(5, 15)
+            if remaining_time > 0:
+                await asyncio.sleep(remaining_time)
+            
+            # Terminer la question
+            question.deactivate()
+            print(f"⏱️ Temps écoulé! La bonne réponse était: {question.answer}")
+            
+            # Afficher le classement après chaque question
+            await self.show_leaderboard()
+            
+            # Pause entre les questions
+            print("\nProchaine question dans 5 secondes...")
+            await asyncio.sleep(5)
+        
+    def print_connection_help(self):
+        """Affiche les vérifications à faire quand la connexion échoue de façon répétée"""
+        print(f"\n❌ Connexion impossible après {self.connection_supervisor.consecutive_failures} tentatives. Veuillez vérifier:")
+        print("1. Que le stream TikTok est bien actif")
+        print("2. Que le nom d'utilisateur est correct")
+        print("3. Votre connexion internet")
+        print(f"\nNouvel essai automatique dans {self.connection_supervisor.circuit_cooldown} secondes...")
+        
+    async def run_async(self):
+        """Maintient la connexion au live jusqu'à l'arrêt du programme"""
+        loop = self.event_loop = asyncio.get_running_loop()
+        metrics_registry.add_gauge("quiz_event_loop_pending_tasks", lambda: len(asyncio.all_tasks(loop)),
+                                   "Tâches en attente sur la boucle asyncio")
+        # En mode multi-live, la boucle partagée n'est surveillée qu'une fois
+        heartbeat = stall_watchdog.watch_asyncio(loop, "asyncio") if STALL_DETECTION_ENABLED else None
+        overlay_task = asyncio.create_task(self.overlay_server.serve())
+        # Questions chargées, connexion lancée: le quiz démarre dès la connexion au live
+        startup_profile.ready("Quiz prêt")
+        try:
+            await self.connection_supervisor.run()
+        finally:
+            overlay_task.cancel()
+            stall_watchdog.unwatch(heartbeat)
+            if self.quiz_task and not self.quiz_task.done():
+                self.quiz_task.cancel()
+            if self.comment_recorder:
+                self.comment_recorder.close()
+            # Questions posées avant l'arrêt (le quiz n'est pas allé jusqu'au bout)
+            self.quiz_manager.export_analytics()
+                
+    def profile_tag(self) -> str:
+        """Étiquette des fichiers de profilage: questionnaire et question en cours"""
+        return profile_tag_for(self.quiz_manager)
+
+    def create_profiler(self) -> RuntimeProfiler:
+        """Profileur exécuté sur la boucle asyncio du quiz"""
+        def dispatch(action):
+            if self.event_loop is not None and self.event_loop.is_running():
+                self.event_loop.call_soon_threadsafe(action)
+            else:
+                action()
+        return RuntimeProfiler(self.profile_tag, dispatcher=dispatch)
+
+    def run(self):
+        """Lance le client TikTok Live"""
+        print(f"\n🎮 Connexion au live de @{self.tiktok_username}...")
+        print("En attente de la connexion au stream...")
+        
+        try:
+            asyncio.run(self.run_async())
+        except KeyboardInterrupt:
+            print("\nArrêt du quiz.")
+            self.quiz_manager.save_scores()
+        finally:
+            if STALL_DETECTION_ENABLED:
+                stall_watchdog.log_report()
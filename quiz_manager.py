@@ -0,0 +1,459 @@
+"""
+Logique du quiz, indépendante de TikTok Live et de l'interface graphique:
+questions, scores et enchaînement des questions. Les modes qui n'ont besoin ni
+de TikTokLive ni de tkinter (rejeu, test de charge, benchmarks) n'importent que ce module.
+"""
+
+import json
+import os
+import random
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Importation des modules d'amélioration
+from config import (
+    SCORES_FILE, DEFAULT_TIME_LIMIT, DEFAULT_POINTS, SCORE_EXPIRATION_HOURS, MAX_ANSWER_LENGTH,
+    ANALYTICS_DIR
+)
+from logger_setup import logger
+from validators import sanitize_input
+from question_bank import indices_to_mask, load_question_bank, mask_answer, mask_to_indices
+from question_timer import deadline_after, deadline_passed, remaining_seconds
+from quiz_analytics import QuizAnalytics
+
+
+class Question:
+    """Classe représentant une question du quiz avec réponse à compléter"""
+    # Pas de __dict__: les banques de centaines de milliers de questions restent compactes
+    __slots__ = ("text", "answer", "revealed_mask", "masked_answer", "points", "time_limit",
+                 "active", "deadline_ns")
+
+    def __init__(self, text: str, answer: str, 
+                revealed_indices: List[int] = None, 
+                points: int = DEFAULT_POINTS, time_limit: int = DEFAULT_TIME_LIMIT,
+                revealed_mask: Optional[int] = None, masked_answer: Optional[str] = None):
+        self.text = text
+        self.answer = answer
+        # Lettres révélées en masque de bits (bit i: lettre i); la réponse masquée est
+        # fournie par la banque ou calculée au premier affichage, puis conservée
+        if revealed_mask is None:
+            revealed_mask = indices_to_mask(revealed_indices or self.get_default_revealed_indices())
+        self.revealed_mask = revealed_mask
+        self.masked_answer = masked_answer
+        self.points = points
+        self.time_limit = time_limit
+        self.active = False
+        # Échéance absolue (time.monotonic_ns) fixée à l'activation
+        self.deadline_ns: Optional[int] = None
+        
+    def get_default_revealed_indices(self) -> List[int]:
+        """Génère aléatoirement les indices des lettres à révéler"""
+        answer_length = len(self.answer)
+        
+        # Ne pas révéler de lettres si la réponse est très courte (1 ou 2 caractères)
+        if answer_length <= 2:
+            return []
+            
+        # Pour les réponses courtes (3-4 caractères), révéler une seule lettre
+        if answer_length <= 4:
+            return [random.randrange(answer_length)]
+            
+        # Pour les réponses plus longues, révéler environ 25% des lettres
+        num_revealed = max(1, int(answer_length * 0.25))
+        revealed = random.sample(range(answer_length), num_revealed)
+        return revealed
+        
+    @property
+    def revealed_indices(self) -> List[int]:
+        """Indices des lettres révélées"""
+        return list(mask_to_indices(self.revealed_mask))
+
+    def get_masked_answer(self) -> str:
+        """Retourne la réponse avec des tirets et quelques lettres révélées"""
+        masked_answer = self.masked_answer
+        if masked_answer is None:
+            masked_answer = self.masked_answer = mask_answer(self.answer, self.revealed_mask)
+        return masked_answer
+        
+    def activate(self):
+        """Active la question et démarre le chronomètre"""
+        self.active = True
+        self.deadline_ns = deadline_after(self.time_limit)
+        
+    def deactivate(self):
+        """Désactive la question"""
+        self.active = False
+        
+    def deadline_passed(self, now_ns: Optional[int] = None) -> bool:
+        """Vérifie si l'échéance est atteinte, que la question soit encore active ou non"""
+        return self.deadline_ns is not None and deadline_passed(self.deadline_ns, now_ns)
+
+    def is_time_expired(self) -> bool:
+        """Vérifie si le temps de réponse est écoulé"""
+        return self.active and self.deadline_passed()
+
+    def remaining_seconds(self) -> float:
+        """Temps restant avant l'échéance (0 si la question n'est pas active)"""
+        if not self.active or self.deadline_ns is None:
+            return 0.0
+        return remaining_seconds(self.deadline_ns)
+    
+    def check_answer(self, answer: str) -> bool:
+        """Vérifie si la réponse donnée est correcte"""
+        # Liste des articles et mots à ignorer
+        articles = ['le ', 'la ', 'les ', 'un ', 'une ', 'des ', 'l\'', 'du ', 'de ', 'des ']
+        
+        # Limiter la longueur de la réponse
+        answer = sanitize_input(answer, max_length=MAX_ANSWER_LENGTH)
+        
+        # Nettoyer la réponse de l'utilisateur
+        user_answer = answer.strip().lower()  # Convertir en minuscules
+        # Supprimer les points et virgules à la fin
+        user_answer = user_answer.rstrip('.,')
+        
+        # Supprimer les articles au début de la réponse utilisateur
+        for article in articles:
+            if user_answer.startswith(article):
+                user_answer = user_answer[len(article):]
+                break
+        
+        # Nettoyer la réponse correcte
+        correct_answer = self.answer.strip().lower()  # Convertir en minuscules
+        # Supprimer les points et virgules à la fin
+        correct_answer = correct_answer.rstrip('.,')
+        
+        # Supprimer les articles au début de la réponse correcte
+        for article in articles:
+            if correct_answer.startswith(article):
+                correct_answer = correct_answer[len(article):]
+                break
+
+        # Vérification directe après suppression des articles
+        if user_answer == correct_answer:
+            return True
+
+        # Vérification avec les variations courantes
+        variations = {
+            correct_answer,
+            correct_answer.replace(' ', ''),  # Sans espaces
+            correct_answer.replace(' ', '-'),  # Avec tirets
+            correct_answer.replace('-', ' ')   # Espaces au lieu des tirets
+        }
+        
+        # Ajouter des variations avec les articles
+        for article in articles:
+            variations.add(article + correct_answer)
+        
+        # Vérifier si la réponse correspond à une des variations
+        if user_answer in variations:
+            return True
+            
+        # Vérification des mots individuels
+        user_words = set(user_answer.split())
+        correct_words = set(correct_answer.split())
+        
+        # Si tous les mots de la réponse correcte sont présents
+        if correct_words and user_words.issuperset(correct_words):
+            # Vérifier que la réponse n'est pas trop longue
+            if len(user_words) <= len(correct_words) + 2:
+                return True
+        
+        # Vérification de similarité pour les fautes de frappe
+        if len(user_answer) > 2 and len(correct_answer) > 2:
+            # Calculer la similarité
+            if abs(len(user_answer) - len(correct_answer)) <= 2:
+                common_chars = sum(1 for i in range(min(len(user_answer), len(correct_answer)))
+                                 if user_answer[i] == correct_answer[i])
+                if common_chars >= len(correct_answer) * 0.8:
+                    return True
+        
+        return False
+    
+    def __str__(self) -> str:
+        masked = self.get_masked_answer()
+        return f"{self.text}\nRéponse: {masked}\n"
+
+class QuizManager:
+    """Gestionnaire du quiz"""
+    def __init__(self, questions_file: str, scores_file: Optional[str] = None,
+                 analytics_dir: Optional[str] = ANALYTICS_DIR):
+        self.questions: List[Question] = []
+        self.current_question_index = -1
+        self.current_question: Optional[Question] = None
+        self.scores: Dict[str, Dict[str, int]] = {}  # {user_id: {"score": points, "name": nickname}}
+        self.answered_users: List[str] = []
+        self.correct_answer_found = False
+        # Abonnés aux événements du quiz: callback(event_type, data)
+        self.listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+        # Nom du fichier pour sauvegarder les scores (un fichier par session en mode multi-live)
+        self.scores_file = scores_file or SCORES_FILE
+        self.questions_file = questions_file
+        # Statistiques par question, exportées en fin de quiz (None: pas de capture)
+        self.analytics = QuizAnalytics(questionnaire_name(questions_file), analytics_dir) if analytics_dir else None
+        # Charger les scores existants s'ils sont valides (moins de 24h)
+        self.load_scores()
+        self.load_questions(questions_file)
+        
+    def add_listener(self, callback: Callable[[str, Dict[str, Any]], None]):
+        """Abonne une fonction aux événements du quiz (question_started, correct_answer...)"""
+        self.listeners.append(callback)
+        
+    def remove_listener(self, callback: Callable[[str, Dict[str, Any]], None]):
+        """Désabonne une fonction des événements du quiz"""
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+            
+    def emit(self, event_type: str, **data):
+        """Notifie les abonnés; une erreur d'un abonné n'interrompt jamais le quiz"""
+        for callback in self.listeners:
+            try:
+                callback(event_type, data)
+            except Exception as e:
+                logger.error(f"Erreur dans un abonné à l'événement {event_type}: {e}")
+                
+    def normalize_text(self, text: str) -> str:
+        """Normalise le texte en remplaçant les caractères spéciaux"""
+        replacements = {
+            'é': 'e', 'è': 'e', 'ê': 'e', 'ë': 'e',
+            'à': 'a', 'â': 'a', 'ä': 'a',
+            'î': 'i', 'ï': 'i',
+            'ô': 'o', 'ö': 'o',
+            'ù': 'u', 'û': 'u', 'ü': 'u',
+            'ç': 'c',
+            "'": '', '"': '', ' ': ''
+        }
+        text = text.lower()
+        for old, new in replacements.items():
+            text = text.replace(old, new)
+        return text
+
+    def load_questions(self, file_path: str):
+        """
+        Charge les questions depuis un fichier JSON après validation, ou depuis une
+        banque par thème: un thème (dossier/theme.jsonl), toute la banque (dossier)
+        ou un tirage parmi des thèmes (dossier?themes=a,b&sample=20)
+        """
+        try:
+            # La banque validée est partagée entre toutes les sessions du processus
+            question_bank = load_question_bank(file_path)
+                
+            # Lecture directe des colonnes de la banque, sans QuestionSpec intermédiaire
+            self.questions.extend(
+                Question(text, answer, points=points, time_limit=time_limit,
+                         revealed_mask=mask, masked_answer=masked)
+                for text, answer, mask, masked, points, time_limit in zip(
+                    question_bank.texts, question_bank.answers, question_bank.revealed_masks,
+                    question_bank.masked_answers, question_bank.points, question_bank.time_limits)
+            )
+                
+            logger.info(f"Quiz chargé avec {len(self.questions)} questions")
+        except (FileNotFoundError, json.JSONDecodeError, ValueError) as e:
+            logger.error(f"Erreur lors du chargement des questions: {e}")
+            raise
+    
+    def save_scores(self):
+        """Sauvegarde les scores actuels avec un timestamp"""
+        scores_data = {
+            "timestamp": datetime.now().timestamp(),
+            "scores": self.scores
+        }
+        try:
+            with open(self.scores_file, 'w', encoding='utf-8') as f:
+                json.dump(scores_data, f, ensure_ascii=False, indent=4)
+            logger.info(f"Scores sauvegardés dans {self.scores_file}")
+        except Exception as e:
+            logger.error(f"Erreur lors de la sauvegarde des scores: {e}")
+    
+    def load_scores(self):
+        """Charge les scores sauvegardés s'ils existent et sont valides (moins de 24h)"""
+        try:
+            if not os.path.exists(self.scores_file):
+                logger.info("Aucun fichier de scores existant.")
+                return
+                
+            with open(self.scores_file, 'r', encoding='utf-8') as f:
+                scores_data = json.load(f)
+                
+            # Vérifier si les scores sont encore valides (moins de 24h)
+            saved_time = datetime.fromtimestamp(scores_data["timestamp"])
+            current_time = datetime.now()
+            time_diff = (current_time - saved_time).total_seconds()
+            
+            # Utilisation de la constante pour la durée de validité
+            if time_diff <= SCORE_EXPIRATION_HOURS * 3600:
+                self.scores = scores_data["scores"]
+                logger.info(f"Scores chargés depuis {self.scores_file} (sauvegardés il y a {time_diff//3600:.1f} heures)")
+            else:
+                logger.info(f"Les scores sauvegardés ont expiré (plus de {SCORE_EXPIRATION_HOURS}h). Nouveau classement créé.")
+                # Supprimer le fichier de scores périmé
+                os.remove(self.scores_file)
+        except Exception as e:
+            logger.error(f"Erreur lors du chargement des scores: {e}")
+            logger.info("Création d'un nouveau classement.")
+    
+    def next_question(self) -> Optional[Question]:
+        """Passe à la question suivante"""
+        if self.current_question:
+            self.current_question.deactivate()
+            if self.analytics is not None:
+                self._end_question_analytics()
+            
+        self.current_question_index += 1
+        self.answered_users = []
+        self.correct_answer_found = False
+        
+        if self.current_question_index < len(self.questions):
+            self.current_question = self.questions[self.current_question_index]
+            self.current_question.activate()
+            if self.analytics is not None:
+                self.analytics.start_question(self.current_question_index, self.current_question)
+            if self.listeners:
+                self.emit("question_started", index=self.current_question_index,
+                          total=len(self.questions), question=self.current_question)
+            return self.current_question
+        else:
+            self.current_question = None
+            # Sauvegarder les scores et les statistiques à la fin du quiz
+            self.save_scores()
+            self.export_analytics()
+            if self.listeners:
+                self.emit("quiz_finished", total=len(self.questions))
+            return None
+    
+    def _end_question_analytics(self):
+        question = self.current_question
+        # La question est déjà désactivée ici: on ne regarde que l'échéance
+        expired = not self.correct_answer_found and question.deadline_passed()
+        self.analytics.end_question(expired)
+
+    def export_analytics(self, background: bool = True):
+        """Exporte les statistiques des questions posées (question en cours comprise)"""
+        if self.analytics is None:
+            return None
+        if self.analytics.question_open and self.current_question is not None:
+            self._end_question_analytics()
+        return self.analytics.export(background=background)
+
+    def _is_valid_context(self) -> bool:
+        """Vérifie si le contexte permet de traiter une réponse"""
+        return (self.current_question and 
+                self.current_question.active and 
+                not self.correct_answer_found)
+    
+    def process_answer(self, user_id: str, username: str, answer: str) -> Tuple[bool, int]:
+        """Traite la réponse d'un utilisateur"""
+        # Validation du contexte
+        if not self._is_valid_context():
+            return False, 0
+        analytics = self.analytics
+        if analytics is not None:
+            analytics.comment(user_id)
+            
+        # Vérifier que la question est toujours active
+        if not self.current_question or not self.current_question.active:
+            return False, 0
+            
+        if user_id in self.answered_users:
+            return False, 0
+            
+        if self.current_question.is_time_expired():
+            return False, 0
+            
+        # Ignorer les messages qui sont trop longs (plus de 3 mots)
+        words = answer.strip().split()
+        if len(words) > 3:
+            return False, 0
+            
+        # Ignorer les messages qui contiennent des mots de test courants
+        test_words = ["test", "essai", "fonctionne", "marche", "ok", "oui", "non", "bonjour", "salut", "hello"]
+        if any(word.lower() in test_words for word in words):
+            return False, 0
+            
+        # Ignorer uniquement les caractères spéciaux non autorisés (sauf apostrophes et accents)
+        allowed_chars = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 '-éèêëàâäîïôöùûüç")
+        if any(c not in allowed_chars for c in answer):
+            return False, 0
+            
+        # Vérifier que la question n'a pas déjà été résolue
+        if self.correct_answer_found:
+            return False, 0
+            
+        # Ajouter l'utilisateur à la liste des utilisateurs ayant répondu
+        self.answered_users.append(user_id)
+        
+        # Vérifier la réponse
+        is_correct = self.current_question.check_answer(answer)
+        if analytics is not None:
+            analytics.answer(is_correct)
+        if is_correct:
+            # Si c'est la première bonne réponse, marquer la question comme résolue
+            self.correct_answer_found = True
+            
+            # Calculer les points gagnés
+            points = self.current_question.points
+            
+            # Mettre à jour le score de l'utilisateur
+            if user_id not in self.scores:
+                self.scores[user_id] = {"score": 0, "name": username}
+            
+            self.scores[user_id]["score"] += points
+            self.scores[user_id]["name"] = username  # Mettre à jour le nom au cas où
+            
+            # Sauvegarder les scores
+            self.save_scores()
+            
+            logger.info(f"Réponse correcte de {username} ({user_id}): {points} points")
+            if self.listeners:
+                self.emit("correct_answer", user_id=user_id, username=username, points=points,
+                          total_score=self.scores[user_id]["score"],
+                          index=self.current_question_index, question=self.current_question)
+            return True, points
+        
+        return False, 0
+    
+    def get_leaderboard(self, limit: int = 10) -> List[Tuple[str, int, str]]:
+        """Retourne le classement des meilleurs scores"""
+        sorted_scores = sorted(
+            [(uid, data["score"], data["name"]) for uid, data in self.scores.items()],
+            key=lambda x: x[1],
+            reverse=True
+        )
+        return sorted_scores[:limit]
+    
+    def reset_scores(self) -> bool:
+        """Réinitialise tous les scores"""
+        try:
+            self.scores = {}
+            if os.path.exists(self.scores_file):
+                os.remove(self.scores_file)
+            logger.info("Classement réinitialisé avec succès")
+            if self.listeners:
+                self.emit("scores_reset")
+            return True
+        except Exception as e:
+            logger.error(f"Erreur lors de la réinitialisation des scores: {e}")
+            return False
+
+    def start_from_question(self, question_number: int):
+        """Reprend le quiz à partir d'une question spécifique"""
+        if 0 <= question_number < len(self.questions):
+            self.current_question_index = question_number - 1  # -1 car next_question() incrémente l'index
+            self.answered_users = []
+            self.correct_answer_found = False
+            # Sauvegarder les scores actuels
+            self.save_scores()
+            # Passer à la question spécifiée
+            return self.next_question()
+        return None
+
+def questionnaire_name(questions_file: str) -> str:
+    """Nom court d'un questionnaire pour nommer des fichiers ("questionnaire1", "history"...)"""
+    # Sans la sélection d'une banque par thème ("?themes=...&sample=...")
+    questions_path = questions_file.split("?", 1)[0].rstrip("/\\")
+    return os.path.splitext(os.path.basename(questions_path))[0]
+
+
+def profile_tag_for(quiz_manager: "QuizManager") -> str:
+    """Retourne "<questionnaire>_q<numéro>" pour nommer les fichiers de profilage"""
+    questionnaire = questionnaire_name(quiz_manager.questions_file)
+    return f"{questionnaire}_q{quiz_manager.current_question_index + 1}"
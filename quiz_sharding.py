@@ -0,0 +1,229 @@
+"""
+Mode multi-processus du Quiz TikTok.
+Répartit les sessions de quiz sur plusieurs processus pour contourner le GIL:
+chaque worker exécute son propre QuizHost (clients TikTok et QuizManager), et
+remonte scores et métriques par pipe au processus superviseur, qui tient le
+classement central et l'unique écriture des logs.
+"""
+
+import asyncio
+import json
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import time
+from datetime import datetime
+from multiprocessing.connection import wait
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config import (
+    SHARD_REPORT_INTERVAL, SHARD_SCORES_FILE, SHARD_METRICS_BASE_PORT, LEADERBOARD_SIZE,
+    METRICS_HTTP_PORT, PROFILE_CONTROL_PORT, OVERLAY_SERVER_PORT
+)
+from logger_setup import logger
+from metrics import aggregate_snapshots, start_metrics_server
+
+
+def split_sessions(usernames: List[str], workers: int) -> List[List[str]]:
+    """Répartit les comptes en lots équilibrés (round-robin), sans lot vide"""
+    workers = max(1, min(workers, len(usernames)))
+    shards: List[List[str]] = [[] for _ in range(workers)]
+    for i, username in enumerate(usernames):
+        shards[i % workers].append(username)
+    return shards
+
+
+def port_conflicts(workers: int, ports: Optional[Dict[str, Iterable[int]]] = None) -> List[str]:
+    """
+    Ports locaux utilisés par plusieurs serveurs du quiz (endpoints /metrics des
+    workers compris); liste vide si la configuration est cohérente.
+    """
+    if ports is None:
+        ports = {
+            "METRICS_HTTP_PORT": [METRICS_HTTP_PORT],
+            "PROFILE_CONTROL_PORT": [PROFILE_CONTROL_PORT],
+            "OVERLAY_SERVER_PORT": [OVERLAY_SERVER_PORT],
+            "SHARD_METRICS_BASE_PORT": range(SHARD_METRICS_BASE_PORT, SHARD_METRICS_BASE_PORT + workers)
+                                       if SHARD_METRICS_BASE_PORT else [],
+        }
+    owners: Dict[int, str] = {}
+    conflicts = []
+    for name, values in ports.items():
+        for port in values:
+            if not port:
+                continue  # serveur désactivé
+            if port in owners:
+                conflicts.append(f"{port} ({owners[port]} et {name})")
+            else:
+                owners[port] = name
+    return conflicts
+
+
+def _redirect_worker_logs(log_queue):
+    """Envoie les logs du worker au superviseur au lieu d'écrire dans les fichiers"""
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+
+def _worker_main(shard_id: int, usernames: List[str], questions_file: str,
+                 conn, log_queue, report_interval: float):
+    """Point d'entrée d'un processus worker"""
+    _redirect_worker_logs(log_queue)
+
+    # Import tardif: le superviseur n'a pas besoin du client TikTok
+    from quiz_host import QuizHost
+
+    host = QuizHost(usernames, questions_file, metrics_interval=0)
+    # Un endpoint /metrics par worker, sur une plage de ports qui lui est réservée
+    if SHARD_METRICS_BASE_PORT:
+        start_metrics_server(SHARD_METRICS_BASE_PORT + shard_id)
+
+    def forward_event(session_name):
+        def on_quiz_event(event_type: str, data: Dict[str, Any]):
+            if event_type == "correct_answer":
+                conn.send(("score", session_name, data["user_id"], data["username"], data["points"]))
+        return on_quiz_event
+
+    for session in host.sessions:
+        session.quiz_manager.add_listener(forward_event(session.tiktok_username))
+
+    async def report_metrics():
+        while True:
+            await asyncio.sleep(report_interval)
+            conn.send(("metrics", shard_id, time.process_time(), host.get_metrics()))
+
+    async def main():
+        reporter = asyncio.create_task(report_metrics())
+        try:
+            await host.run_async()
+        finally:
+            reporter.cancel()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for session in host.sessions:
+            session.quiz_manager.save_scores()
+        conn.send(("metrics", shard_id, time.process_time(), host.get_metrics()))
+        conn.close()
+
+
+class ShardSupervisor:
+    """Lance les workers, agrège leurs scores et écrit les logs de tous les processus"""
+    def __init__(self, usernames: List[str], questions_file: str, workers: int = 0,
+                 report_interval: float = SHARD_REPORT_INTERVAL,
+                 scores_file: str = SHARD_SCORES_FILE):
+        if not usernames:
+            raise ValueError("Aucun compte TikTok à héberger")
+        self.shards = split_sessions(usernames, workers or os.cpu_count() or 1)
+        conflicts = port_conflicts(len(self.shards))
+        if conflicts:
+            raise ValueError(f"Ports en conflit dans config.py: {', '.join(conflicts)}")
+        self.questions_file = questions_file
+        self.report_interval = report_interval
+        self.scores_file = scores_file
+        # Classement central: {user_id: {"score": points, "name": nickname}}
+        self.scores: Dict[str, Dict[str, Any]] = {}
+        # Dernières métriques reçues par worker: {shard_id: (cpu_time, metrics)}
+        self.worker_metrics: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+        self.started_at = time.monotonic()
+
+    def record_score(self, session_name: str, user_id: str, username: str, points: int):
+        """Ajoute des points au classement central"""
+        entry = self.scores.setdefault(user_id, {"score": 0, "name": username})
+        entry["score"] += points
+        entry["name"] = username
+        logger.info(f"[{session_name}] {username} +{points} points (total global: {entry['score']})")
+
+    def get_leaderboard(self, limit: int = LEADERBOARD_SIZE) -> List[Tuple[str, int, str]]:
+        """Retourne le classement central tous lives confondus"""
+        return sorted(
+            ((uid, data["score"], data["name"]) for uid, data in self.scores.items()),
+            key=lambda x: x[1],
+            reverse=True
+        )[:limit]
+
+    def save_scores(self):
+        """Sauvegarde le classement central"""
+        try:
+            with open(self.scores_file, 'w', encoding='utf-8') as f:
+                json.dump({"timestamp": datetime.now().timestamp(), "scores": self.scores},
+                          f, ensure_ascii=False, indent=4)
+        except Exception as e:
+            logger.error(f"Erreur lors de la sauvegarde du classement central: {e}")
+
+    def log_metrics(self):
+        """Résume le débit et l'utilisation CPU de l'ensemble des workers"""
+        sessions = [s for _, metrics in self.worker_metrics.values() for s in metrics["sessions"]]
+        total = aggregate_snapshots(sessions)
+        cpu_time = sum(cpu for cpu, _ in self.worker_metrics.values())
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        logger.info(
+            f"[superviseur] {len(self.worker_metrics)}/{len(self.shards)} workers, "
+            f"{total['sessions']} sessions - {total['comments']} commentaires "
+            f"({total['comments_per_second']:.1f}/s), "
+            f"CPU {cpu_time / elapsed:.2f} cœurs utilisés"
+        )
+
+    def _handle_message(self, message):
+        kind = message[0]
+        if kind == "score":
+            self.record_score(*message[1:])
+        elif kind == "metrics":
+            _, shard_id, cpu_time, metrics = message
+            self.worker_metrics[shard_id] = (cpu_time, metrics)
+
+    def run(self):
+        """Point d'entrée bloquant: démarre les workers et traite leurs messages"""
+        # Seul le superviseur écrit les logs (console et fichier)
+        log_queue = multiprocessing.Queue()
+        log_listener = logging.handlers.QueueListener(
+            log_queue, *logger.handlers, respect_handler_level=True)
+        log_listener.start()
+
+        processes = []
+        connections = []
+        for shard_id, usernames in enumerate(self.shards):
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(
+                target=_worker_main,
+                args=(shard_id, usernames, self.questions_file, sender, log_queue, self.report_interval),
+                name=f"quiz-shard-{shard_id}",
+                daemon=True
+            )
+            process.start()
+            # Fermer notre copie de l'extrémité d'écriture pour détecter la fin du worker
+            sender.close()
+            processes.append(process)
+            connections.append(receiver)
+            logger.info(f"Worker {shard_id} démarré (pid {process.pid}): {', '.join(usernames)}")
+
+        print(f"\n🎮 {sum(len(s) for s in self.shards)} lives répartis sur {len(processes)} processus")
+        next_report = time.monotonic() + self.report_interval
+        try:
+            while connections:
+                for conn in wait(connections, timeout=1.0):
+                    try:
+                        self._handle_message(conn.recv())
+                    except EOFError:
+                        connections.remove(conn)
+                if time.monotonic() >= next_report:
+                    next_report += self.report_interval
+                    self.save_scores()
+                    self.log_metrics()
+        except KeyboardInterrupt:
+            # Les workers reçoivent aussi l'interruption et sauvegardent leurs scores
+            print("\nArrêt des workers...")
+        finally:
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+            self.save_scores()
+            self.log_metrics()
+            log_listener.stop()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""
+Script pour exécuter les benchmarks de performance du projet Quiz TikTok
+
+Exemples:
+    python run_benchmarks.py                         # tous les benchmarks
+    python run_benchmarks.py --quick --filter check  # sous-ensemble rapide
+    python run_benchmarks.py --compare avant.json apres.json
+"""
+
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime
+
+from benchmarks.harness import compare_results, load_report, run_benchmarks, save_report
+
+RESULTS_DIR = os.path.join("benchmarks", "results")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks du Quiz TikTok")
+    parser.add_argument("--filter", default=None, help="n'exécuter que les benchmarks contenant ce texte")
+    parser.add_argument("--quick", action="store_true", help="ignorer les benchmarks les plus longs (1M joueurs...)")
+    parser.add_argument("--output", default=None, help="fichier JSON de résultats")
+    parser.add_argument("--compare", nargs=2, metavar=("AVANT", "APRES"),
+                        help="comparer deux fichiers de résultats au lieu d'exécuter les benchmarks")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="dégradation tolérée en pourcentage avant de signaler une régression")
+    args = parser.parse_args()
+
+    if args.compare:
+        regressions = compare_results(load_report(args.compare[0]), load_report(args.compare[1]),
+                                      threshold=args.threshold / 100)
+        if regressions:
+            print(f"\n{len(regressions)} régression(s): {', '.join(regressions)}")
+        # Sortir avec un code d'erreur si des régressions ont été détectées
+        sys.exit(1 if regressions else 0)
+
+    # Les logs du quiz fausseraient les mesures
+    from logger_setup import logger
+    logger.setLevel(logging.WARNING)
+
+    # Importer les modules de benchmarks pour les enregistrer
+    import benchmarks.bench_analytics  # noqa: F401
+    import benchmarks.bench_question_store  # noqa: F401
+    import benchmarks.bench_quiz  # noqa: F401
+    import benchmarks.bench_theme_bank  # noqa: F401
+    import benchmarks.bench_tts  # noqa: F401
+
+    report = run_benchmarks(name_filter=args.filter, quick=args.quick)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    save_report(report, output)
+    print(f"\nRésultats enregistrés dans {output}")
+
+
+if __name__ == "__main__":
+    main()
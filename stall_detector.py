@@ -0,0 +1,164 @@
+"""
+Détecteur de blocages des boucles d'événements (asyncio et Tkinter).
+Chaque boucle surveillée planifie un battement régulier; un thread de garde
+repère les battements en retard, capture la pile du thread bloqué et compte
+les blocages par site d'appel pour retrouver les saccades en production.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import STALL_THRESHOLD, STALL_HEARTBEAT_INTERVAL, STALL_STACK_DEPTH
+from logger_setup import logger
+from metrics import registry as metrics_registry
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class _Heartbeat:
+    """Battement d'une boucle surveillée"""
+
+    def __init__(self, name: str, thread_id: int, interval: float,
+                 schedule: Callable[[float, Callable[[], None]], None]):
+        self.name = name
+        self.thread_id = thread_id
+        self.interval = interval
+        self.schedule = schedule
+        self.expected_at = time.monotonic() + interval
+        self.stopped = False
+        # Blocage en cours: (site d'appel, début) une fois signalé par le thread de garde
+        self.current_stall: Optional[Tuple[str, float]] = None
+        self.max_lag = 0.0
+
+
+def _call_site(frame) -> str:
+    """Première frame du projet en partant de la plus profonde (ex: save_scores (quiz_manager.py:270))"""
+    fallback = None
+    while frame is not None:
+        code = frame.f_code
+        label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+        if fallback is None:
+            fallback = label
+        file_path = os.path.abspath(code.co_filename)
+        if file_path.startswith(PROJECT_DIR) and file_path != os.path.abspath(__file__):
+            return label
+        frame = frame.f_back
+    return fallback or "inconnu"
+
+
+class StallWatchdog:
+    """Surveille le retard des boucles asyncio et la durée des callbacks Tk"""
+
+    def __init__(self, threshold: float = STALL_THRESHOLD,
+                 interval: float = STALL_HEARTBEAT_INTERVAL):
+        self.threshold = threshold
+        self.interval = interval
+        self.heartbeats: List[_Heartbeat] = []
+        # Nombre de blocages par (boucle, site d'appel)
+        self.stall_counts: Counter = Counter()
+        self.stall_durations: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def _ensure_started(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._watch, name="stall-watchdog", daemon=True)
+            self._thread.start()
+
+    def _add(self, heartbeat: _Heartbeat) -> _Heartbeat:
+        with self._lock:
+            self.heartbeats.append(heartbeat)
+        self._ensure_started()
+        heartbeat.schedule(heartbeat.interval, lambda: self._beat(heartbeat))
+        return heartbeat
+
+    def watch_asyncio(self, loop: asyncio.AbstractEventLoop, name: str) -> Optional[_Heartbeat]:
+        """Surveille une boucle asyncio (à appeler depuis le thread de la boucle)"""
+        with self._lock:
+            if any(h.name == name and not h.stopped for h in self.heartbeats):
+                return None
+        return self._add(_Heartbeat(name, threading.get_ident(), self.interval,
+                                    lambda delay, beat: loop.call_later(delay, beat)))
+
+    def watch_tk(self, root, name: str = "tk") -> _Heartbeat:
+        """Surveille la boucle Tkinter (à appeler depuis le thread Tk)"""
+        return self._add(_Heartbeat(name, threading.get_ident(), self.interval,
+                                    lambda delay, beat: root.after(int(delay * 1000), beat)))
+
+    def unwatch(self, heartbeat: Optional[_Heartbeat]):
+        if heartbeat is None:
+            return
+        heartbeat.stopped = True
+        with self._lock:
+            if heartbeat in self.heartbeats:
+                self.heartbeats.remove(heartbeat)
+
+    def _beat(self, heartbeat: _Heartbeat):
+        """Exécuté par la boucle surveillée: mesure son retard et replanifie"""
+        if heartbeat.stopped:
+            return
+        now = time.monotonic()
+        lag = now - heartbeat.expected_at
+        if lag > heartbeat.max_lag:
+            heartbeat.max_lag = lag
+        stall = heartbeat.current_stall
+        if stall is not None and lag >= self.threshold:
+            site, _ = stall
+            key = (heartbeat.name, site)
+            self.stall_durations[key] = max(self.stall_durations.get(key, 0.0), lag)
+            logger.warning(f"[{heartbeat.name}] Boucle débloquée après {lag * 1000:.0f}ms ({site})")
+        heartbeat.current_stall = None
+        heartbeat.expected_at = now + heartbeat.interval
+        try:
+            heartbeat.schedule(heartbeat.interval, lambda: self._beat(heartbeat))
+        except Exception:
+            # Boucle fermée ou fenêtre détruite
+            self.unwatch(heartbeat)
+
+    def _watch(self):
+        """Thread de garde: capture la pile des boucles en retard"""
+        check_interval = min(self.interval, self.threshold / 2)
+        while True:
+            time.sleep(check_interval)
+            now = time.monotonic()
+            with self._lock:
+                heartbeats = list(self.heartbeats)
+            for heartbeat in heartbeats:
+                if heartbeat.current_stall is not None or now - heartbeat.expected_at < self.threshold:
+                    continue
+                frame = sys._current_frames().get(heartbeat.thread_id)
+                if frame is None:
+                    continue
+                site = _call_site(frame)
+                heartbeat.current_stall = (site, now)
+                self.stall_counts[(heartbeat.name, site)] += 1
+                stack = "".join(traceback.format_stack(frame, limit=STALL_STACK_DEPTH))
+                logger.warning(
+                    f"[{heartbeat.name}] Boucle bloquée depuis {(now - heartbeat.expected_at) * 1000:.0f}ms "
+                    f"dans {site} (blocage n°{self.stall_counts[(heartbeat.name, site)]} à cet endroit)\n{stack}"
+                )
+
+    def total_stalls(self) -> int:
+        return sum(self.stall_counts.values())
+
+    def log_report(self):
+        """Résume les blocages par site d'appel, du plus fréquent au plus rare"""
+        if not self.stall_counts:
+            logger.info("Aucun blocage de boucle détecté")
+            return
+        logger.info(f"Blocages de boucle détectés: {self.total_stalls()}")
+        for (name, site), count in self.stall_counts.most_common():
+            worst = self.stall_durations.get((name, site), 0.0)
+            logger.info(f"  [{name}] {count:5d}x  pire {worst * 1000:7.0f}ms  {site}")
+
+
+# Garde du processus, partagée par toutes les boucles (comme le logger)
+stall_watchdog = StallWatchdog()
+metrics_registry.add_gauge("quiz_loop_stalls_total", stall_watchdog.total_stalls,
+                           "Blocages des boucles asyncio/Tk détectés depuis le démarrage")
@@ -0,0 +1,185 @@
+"""
+Initialisation du quiz en graphe de dépendances.
+Chaque tâche démarre dès que celles dont elle dépend sont terminées: les tâches
+indépendantes (connexion au live, moteur TTS, chargement des questions) tournent
+en parallèle dans des threads, et celles qui touchent à l'interface sont confiées
+au thread principal (boucle Tk). La durée de chaque tâche est enregistrée dans
+le profil de démarrage et résumée dans les logs.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from logger_setup import logger
+from startup_profile import startup_profile
+
+PENDING = "en attente"
+RUNNING = "en cours"
+DONE = "terminée"
+FAILED = "échec"
+SKIPPED = "annulée"
+
+
+class StartupTask:
+    """Une étape de l'initialisation et son résultat"""
+
+    def __init__(self, name: str, func: Callable[[], Any], after: Iterable[str], main_thread: bool):
+        self.name = name
+        self.func = func
+        self.after = tuple(after)
+        self.main_thread = main_thread
+        self.waiting = set(self.after)
+        self.state = PENDING
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.duration = 0.0
+        self.finished = threading.Event()
+
+
+class StartupGraph:
+    """
+    Exécute les tâches d'initialisation dans l'ordre imposé par leurs dépendances.
+
+    Args:
+        dispatch_main: Exécute une fonction sur le thread principal (ex: lambda f: root.after(0, f));
+            sans lui, les tâches main_thread tournent dans le thread qui les débloque
+        on_error: Appelée avec (nom de la tâche, exception) quand une tâche échoue;
+            les tâches qui en dépendent ne sont pas exécutées
+        on_complete: Appelée une fois toutes les tâches terminées (ou annulées)
+        name: Nom du graphe dans les logs (ex: "Changement de questionnaire")
+    """
+
+    def __init__(self, dispatch_main: Optional[Callable[[Callable[[], None]], None]] = None,
+                 on_error: Optional[Callable[[str, BaseException], None]] = None,
+                 on_complete: Optional[Callable[[], None]] = None, name: str = "Démarrage"):
+        self.name = name
+        self.dispatch_main = dispatch_main
+        self.on_error = on_error
+        self.on_complete = on_complete
+        self.tasks: Dict[str, StartupTask] = {}
+        self.started_at = 0.0
+        self.elapsed = 0.0
+        self._remaining = 0
+        self._lock = threading.Lock()
+
+    def add(self, name: str, func: Callable[[], Any], after: Iterable[str] = (),
+            main_thread: bool = False) -> "StartupGraph":
+        if name in self.tasks:
+            raise ValueError(f"Tâche de démarrage en double: {name}")
+        self.tasks[name] = StartupTask(name, func, after, main_thread)
+        return self
+
+    def start(self):
+        """Vérifie le graphe puis lance les tâches sans dépendance"""
+        for task in self.tasks.values():
+            unknown = [name for name in task.after if name not in self.tasks]
+            if unknown:
+                raise ValueError(f"Tâche de démarrage {task.name}: dépendances inconnues {unknown}")
+        self._check_cycles()
+        self.started_at = time.perf_counter()
+        self._remaining = len(self.tasks)
+        ready = [task for task in self.tasks.values() if not task.waiting]
+        for task in ready:
+            self._launch(task)
+        if not self.tasks:
+            self._complete()
+
+    def _check_cycles(self):
+        visited: Dict[str, bool] = {}  # False: en cours de visite, True: sans cycle
+
+        def visit(name: str, path: List[str]):
+            if visited.get(name) is False:
+                raise ValueError(f"Cycle dans le graphe de démarrage: {' -> '.join(path + [name])}")
+            if name in visited:
+                return
+            visited[name] = False
+            for dependency in self.tasks[name].after:
+                visit(dependency, path + [name])
+            visited[name] = True
+
+        for name in self.tasks:
+            visit(name, [])
+
+    def _launch(self, task: StartupTask):
+        task.state = RUNNING
+        if task.main_thread and self.dispatch_main is not None:
+            self.dispatch_main(lambda: self._run(task))
+        else:
+            threading.Thread(target=self._run, args=(task,), name=f"init-{task.name}", daemon=True).start()
+
+    def _run(self, task: StartupTask):
+        start = time.perf_counter()
+        try:
+            with startup_profile.phase(task.name):
+                task.result = task.func()
+            task.state = DONE
+        except Exception as e:
+            task.error = e
+            task.state = FAILED
+            logger.error(f"{self.name}: échec de l'étape '{task.name}': {e}")
+            if self.on_error is not None:
+                self.on_error(task.name, e)
+        task.duration = time.perf_counter() - start
+        self._finish(task)
+
+    def _finish(self, task: StartupTask):
+        ready = []
+        finished = [task]
+        with self._lock:
+            index = 0
+            while index < len(finished):
+                current = finished[index]
+                index += 1
+                self._remaining -= 1
+                for dependent in self.tasks.values():
+                    if current.name not in dependent.waiting:
+                        continue
+                    dependent.waiting.discard(current.name)
+                    if current.state != DONE:
+                        # Une dépendance a échoué: l'étape et ses propres dépendants sont annulés
+                        if dependent.state == PENDING:
+                            dependent.state = SKIPPED
+                            dependent.error = current.error
+                            finished.append(dependent)
+                    elif not dependent.waiting and dependent.state == PENDING:
+                        ready.append(dependent)
+            complete = self._remaining == 0
+        for current in finished:
+            current.finished.set()
+        for dependent in ready:
+            self._launch(dependent)
+        if complete:
+            self._complete()
+
+    def _complete(self):
+        self.elapsed = time.perf_counter() - self.started_at
+        logger.info(f"{self.name} terminé en {self.elapsed * 1000:.0f}ms: {self.summary()}")
+        if self.on_complete is not None:
+            self.on_complete()
+
+    def wait(self, name: str, timeout: Optional[float] = None) -> Any:
+        """Attend la fin d'une tâche et retourne son résultat (depuis un autre thread que le principal)"""
+        task = self.tasks[name]
+        if not task.finished.wait(timeout):
+            raise TimeoutError(f"Étape de démarrage '{name}' toujours {task.state}")
+        return self.result(name)
+
+    def result(self, name: str) -> Any:
+        task = self.tasks[name]
+        if task.state != DONE:
+            raise RuntimeError(f"Étape de démarrage '{name}' {task.state}") from task.error
+        return task.result
+
+    def done(self, name: str) -> bool:
+        return self.tasks[name].state == DONE
+
+    def summary(self) -> str:
+        """Durée (ou état) de chaque étape, dans l'ordre de déclaration"""
+        parts = []
+        for task in self.tasks.values():
+            if task.state == DONE:
+                parts.append(f"{task.name} {task.duration * 1000:.0f}ms")
+            else:
+                parts.append(f"{task.name} ({task.state})")
+        return ", ".join(parts)
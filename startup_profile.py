@@ -0,0 +1,158 @@
+"""
+Profil de démarrage: durée des imports et des phases d'initialisation.
+Activé par l'option --startup-profile du point d'entrée, il mesure le temps
+passé dans chaque import (temps propre et cumulé, sous-imports compris) et
+dans chaque phase d'initialisation, jusqu'à ce que la première question soit
+prête; le détail est alors affiché dans la console.
+Sans l'option, les phases sont tout de même chronométrées (coût négligeable)
+mais rien n'est affiché.
+"""
+
+import builtins
+import importlib.util
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+
+class PhaseTiming(NamedTuple):
+    name: str
+    start: float  # secondes depuis le lancement du point d'entrée
+    duration: float
+    thread: str
+
+
+class ImportTiming:
+    __slots__ = ("name", "cumulative", "self_time")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.cumulative = 0.0
+        self.self_time = 0.0
+
+
+class StartupProfile:
+    """Chronomètre les imports et les phases du démarrage (un seul par processus)"""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.enabled = False
+        self.phases: List[PhaseTiming] = []
+        self.marks: Dict[str, float] = {}
+        self.imports: Dict[str, ImportTiming] = {}
+        self.reported = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._original_import = None
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.origin
+
+    def enable(self):
+        """Active l'affichage et chronomètre les imports à partir de maintenant"""
+        if self.enabled:
+            return
+        self.enabled = True
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def disable(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+        self.enabled = False
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import
+        if level:
+            try:
+                name_to_time = importlib.util.resolve_name("." * level + name, (globals or {}).get("__package__"))
+            except (ImportError, ValueError):
+                return original(name, globals, locals, fromlist, level)
+        else:
+            name_to_time = name
+        if name_to_time in sys.modules or original is None:
+            return original(name, globals, locals, fromlist, level)
+
+        # Pile des imports en cours dans ce thread: le temps des sous-imports est retiré du temps propre
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            duration = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += duration
+            with self._lock:
+                timing = self.imports.get(name_to_time)
+                if timing is None:
+                    timing = self.imports[name_to_time] = ImportTiming(name_to_time)
+                timing.cumulative += duration
+                timing.self_time += duration - children
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Chronomètre une phase d'initialisation (utilisable depuis n'importe quel thread)"""
+        start = self.elapsed()
+        try:
+            yield
+        finally:
+            timing = PhaseTiming(name, start, self.elapsed() - start, threading.current_thread().name)
+            with self._lock:
+                self.phases.append(timing)
+
+    def mark(self, name: str):
+        """Note l'instant d'un jalon (la première occurrence seulement)"""
+        with self._lock:
+            self.marks.setdefault(name, self.elapsed())
+
+    def ready(self, name: str = "Première question prête"):
+        """Jalon final: affiche le profil une seule fois si l'option est active"""
+        self.mark(name)
+        if self.enabled and not self.reported:
+            self.print_report()
+
+    def format_report(self, top: int = 15) -> str:
+        with self._lock:
+            phases = sorted(self.phases, key=lambda phase: phase.start)
+            imports = sorted(self.imports.values(), key=lambda timing: timing.self_time, reverse=True)
+            marks = sorted(self.marks.items(), key=lambda item: item[1])
+        lines = ["⏱️ Profil de démarrage"]
+        if imports:
+            total = sum(timing.self_time for timing in imports)
+            lines.append(f"  Imports: {total * 1000:.1f} ms pour {len(imports)} modules (les {min(top, len(imports))} plus lents)")
+            lines.append(f"    {'module':<40} {'propre':>10} {'cumulé':>10}")
+            for timing in imports[:top]:
+                lines.append(f"    {timing.name:<40} {timing.self_time * 1000:>7.1f} ms {timing.cumulative * 1000:>7.1f} ms")
+        if phases:
+            lines.append("  Phases d'initialisation:")
+            for phase in phases:
+                lines.append(f"    +{phase.start * 1000:>7.1f} ms  {phase.name:<36} {phase.duration * 1000:>7.1f} ms"
+                             f"  [{phase.thread}]")
+        for name, at in marks:
+            lines.append(f"  {name}: {at * 1000:.1f} ms après le lancement")
+        return "\n".join(lines)
+
+    def print_report(self):
+        self.reported = True
+        print(self.format_report())
+
+
+# Profil partagé par tout le processus
+startup_profile = StartupProfile()
+
+
+def enable_from_argv(argv: Optional[List[str]] = None) -> bool:
+    """Retire --startup-profile des arguments et active le profil s'il était présent"""
+    argv = sys.argv if argv is None else argv
+    if "--startup-profile" not in argv:
+        return False
+    argv.remove("--startup-profile")
+    startup_profile.enable()
+    return True
@@ -0,0 +1,116 @@
+"""
+Tests de l'enregistrement .qcr des commentaires: aller-retour écriture/lecture,
+fichiers tronqués et rejeu contre un QuizManager.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from comment_recorder import (CommentRecorder, CommentReplayer, RecordedComment,
+                              RECORDING_MAGIC, read_recording)
+from quiz_manager import QuizManager
+
+SECOND_NS = 1_000_000_000
+
+
+class RecordingTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "live", "stream.qcr")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, records):
+        recorder = CommentRecorder(self.path)
+        for record in records:
+            recorder.record(record.user_id, record.nickname, record.comment, timestamp_ns=record.timestamp_ns)
+        recorder.close()
+        return recorder
+
+    def test_round_trip(self):
+        records = [RecordedComment(1, "user1", "Élodie 🌸", "Paris"),
+                   RecordedComment(2, "user2", "", "c'est où?"),
+                   RecordedComment(3 * SECOND_NS, "7000000000000000000", "Bob", "")]
+        recorder = self.write(records)
+        self.assertEqual(recorder.records_written, 3)
+        self.assertEqual(list(read_recording(self.path)), records)
+
+    def test_none_and_oversized_fields(self):
+        recorder = CommentRecorder(self.path)
+        recorder.record("user1", None, "a" * 70000, timestamp_ns=5)
+        recorder.close()
+        (record,) = read_recording(self.path)
+        self.assertEqual((record.nickname, len(record.comment)), ("", 0xFFFF))
+
+    def test_reopen_appends_without_second_header(self):
+        first = [RecordedComment(1, "user1", "Alice", "Paris")]
+        second = [RecordedComment(2, "user2", "Bob", "Lyon")]
+        self.write(first)
+        self.write(second)
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read().count(RECORDING_MAGIC), 1)
+        self.assertEqual(list(read_recording(self.path)), first + second)
+
+    def test_truncated_file_stops_at_last_complete_record(self):
+        records = [RecordedComment(i, f"user{i}", f"Joueur {i}", "Paris") for i in range(3)]
+        self.write(records)
+        size = os.path.getsize(self.path)
+        for cut in (size - 1, size - len("Paris") - 3):
+            with self.subTest(cut=cut):
+                with open(self.path, "r+b") as f:
+                    f.truncate(cut)
+                self.assertEqual(list(read_recording(self.path)), records[:2])
+
+    def test_not_a_recording(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "wb") as f:
+            f.write(b"[{\"text\": \"pas un enregistrement\"}]")
+        with self.assertRaises(ValueError):
+            list(read_recording(self.path))
+
+
+class ReplayTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        questions_file = os.path.join(self.temp_dir.name, "questions.json")
+        with open(questions_file, "w", encoding="utf-8") as f:
+            json.dump([{"text": "Capitale de la France?", "answer": "Paris", "points": 10, "time_limit": 10},
+                       {"text": "Planète rouge?", "answer": "Mars", "points": 10, "time_limit": 10}], f)
+        self.quiz_manager = QuizManager(questions_file,
+                                        scores_file=os.path.join(self.temp_dir.name, "scores.json"),
+                                        analytics_dir=None)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def replay(self, records):
+        replayer = CommentReplayer(self.quiz_manager, speed=None, pause_between_questions=2, loop_questions=False)
+        return asyncio.run(replayer.replay(records))
+
+    def test_quiz_follows_recording_time(self):
+        records = [
+            RecordedComment(0, "user1", "Alice", "Lyon"),
+            RecordedComment(1 * SECOND_NS, "user2", "Bob", "Paris"),      # bonne réponse, pause de 2s
+            RecordedComment(2 * SECOND_NS, "user3", "Chloé", "Mars"),     # pendant la pause: ignoré
+            RecordedComment(4 * SECOND_NS, "user4", "David", "Vénus"),    # question 2
+            RecordedComment(15 * SECOND_NS, "user5", "Emma", "Mars"),     # après les 10s imparties
+        ]
+        stats = self.replay(records)
+        self.assertEqual((stats["comments"], stats["questions_asked"], stats["correct_answers"]), (5, 2, 1))
+        self.assertEqual(stats["latency"]["count"], 5)
+        self.assertEqual(list(self.quiz_manager.scores), ["user2"])
+
+    def test_stops_when_questions_run_out(self):
+        records = [RecordedComment(0, "user1", "Alice", "Paris"),
+                   RecordedComment(3 * SECOND_NS, "user2", "Bob", "Mars"),
+                   RecordedComment(6 * SECOND_NS, "user3", "Chloé", "Paris")]
+        stats = self.replay(records)
+        self.assertEqual((stats["comments"], stats["correct_answers"]), (2, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
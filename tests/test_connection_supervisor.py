@@ -0,0 +1,128 @@
+"""
+Tests de la supervision de la connexion TikTok: délais de reconnexion (backoff
+exponentiel avec jitter) et états du disjoncteur.
+"""
+
+import asyncio
+import unittest
+from unittest import mock
+
+from connection_supervisor import ConnectionSupervisor
+
+
+class FakeClient:
+    """Client TikTokLive dont connect() échoue un certain nombre de fois"""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.supervisor = None
+        self.connect_calls = 0
+        self.disconnect_calls = 0
+
+    async def connect(self):
+        self.connect_calls += 1
+        if self.connect_calls <= self.failures:
+            raise ConnectionError(f"hors ligne ({self.connect_calls})")
+        # Session établie puis arrêt demandé pendant la session
+        self.supervisor.notify_connected()
+        await self.supervisor.stop()
+
+    async def disconnect(self):
+        self.disconnect_calls += 1
+
+
+def make_supervisor(client=None, **kwargs):
+    options = dict(base_delay=1.0, max_delay=30.0, failure_threshold=3, circuit_cooldown=60.0)
+    options.update(kwargs)
+    return ConnectionSupervisor(client or FakeClient(0), name="test", **options)
+
+
+class BackoffTest(unittest.TestCase):
+    def test_delay_doubles_up_to_max(self):
+        supervisor = make_supervisor()
+        expected_caps = [1.0, 2.0, 4.0, 8.0, 16.0, 30.0, 30.0]
+        for failures, cap in enumerate(expected_caps):
+            supervisor.consecutive_failures = failures
+            with self.subTest(failures=failures):
+                # Bornes de l'"equal jitter": moitié fixe, moitié aléatoire
+                with mock.patch("random.uniform", side_effect=lambda low, high: low):
+                    self.assertEqual(supervisor.next_delay(), cap / 2)
+                with mock.patch("random.uniform", side_effect=lambda low, high: high):
+                    self.assertEqual(supervisor.next_delay(), cap)
+
+    def test_jitter_stays_in_bounds(self):
+        supervisor = make_supervisor()
+        supervisor.consecutive_failures = 3
+        delays = [supervisor.next_delay() for _ in range(200)]
+        self.assertTrue(all(4.0 <= delay <= 8.0 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+    def test_long_outage_does_not_overflow(self):
+        supervisor = make_supervisor()
+        supervisor.consecutive_failures = 10_000
+        self.assertLessEqual(supervisor.next_delay(), 30.0)
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def test_opens_after_threshold(self):
+        on_open = mock.Mock()
+        supervisor = make_supervisor(on_circuit_open=on_open)
+        for _ in range(2):
+            supervisor._record_failure(ConnectionError("hors ligne"))
+        self.assertEqual(supervisor.circuit_state, ConnectionSupervisor.CLOSED)
+        on_open.assert_not_called()
+
+        supervisor._record_failure(ConnectionError("hors ligne"))
+        self.assertEqual(supervisor.circuit_state, ConnectionSupervisor.OPEN)
+        self.assertEqual((supervisor.circuit_trips, supervisor.last_error), (1, "hors ligne"))
+        on_open.assert_called_once_with()
+
+    def test_half_open_failure_reopens(self):
+        supervisor = make_supervisor(failure_threshold=100)
+        supervisor.circuit_state = ConnectionSupervisor.HALF_OPEN
+        supervisor._record_failure(None)
+        self.assertEqual(supervisor.circuit_state, ConnectionSupervisor.OPEN)
+        self.assertEqual(supervisor.last_error, "Connexion terminée avant l'établissement")
+
+    def test_callback_error_does_not_propagate(self):
+        supervisor = make_supervisor(failure_threshold=1, on_circuit_open=mock.Mock(side_effect=RuntimeError))
+        supervisor._record_failure(ConnectionError("hors ligne"))
+        self.assertEqual(supervisor.circuit_state, ConnectionSupervisor.OPEN)
+
+    def test_connection_closes_circuit(self):
+        supervisor = make_supervisor()
+        supervisor.consecutive_failures = 5
+        supervisor.circuit_state = ConnectionSupervisor.HALF_OPEN
+        supervisor.notify_connected()
+        self.assertEqual(supervisor.circuit_state, ConnectionSupervisor.CLOSED)
+        self.assertEqual((supervisor.consecutive_failures, supervisor.successful_connections), (0, 1))
+        self.assertTrue(supervisor.connected)
+
+    def test_recovery_measured_only_after_real_outage(self):
+        supervisor = make_supervisor()
+        supervisor.notify_connected()
+        self.assertIsNone(supervisor.last_recovery_seconds)
+        supervisor.notify_disconnected()
+        supervisor.notify_disconnected()
+        self.assertEqual(supervisor.disconnects, 1)
+        supervisor.notify_connected()
+        self.assertIsNotNone(supervisor.last_recovery_seconds)
+
+    def test_run_trips_then_recovers_after_cooldown(self):
+        client = FakeClient(failures=2)
+        supervisor = make_supervisor(client, base_delay=0.001, max_delay=0.002,
+                                     failure_threshold=2, circuit_cooldown=0.01)
+        client.supervisor = supervisor
+        asyncio.run(asyncio.wait_for(supervisor.run(), timeout=5))
+
+        health = supervisor.get_health()
+        self.assertEqual(client.connect_calls, 3)
+        self.assertEqual(health["circuit_trips"], 1)
+        self.assertEqual(health["circuit_state"], ConnectionSupervisor.CLOSED)
+        self.assertEqual((health["failures"], health["successful_connections"]), (2, 1))
+        self.assertFalse(health["connected"])
+        self.assertEqual(client.disconnect_calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
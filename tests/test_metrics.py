@@ -0,0 +1,129 @@
+"""
+Tests des métriques: intervalles et centiles de l'histogramme de latence,
+débit calculé à la collecte et export au format Prometheus.
+"""
+
+import unittest
+from unittest import mock
+
+import metrics
+from metrics import LatencyHistogram, MetricsRegistry, SessionMetrics, percentile, start_metrics_server
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class LatencyHistogramTest(unittest.TestCase):
+    def test_small_values_are_exact(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 101):
+            histogram.record(value)
+        self.assertEqual((histogram.count, histogram.max, histogram.mean()), (100, 100, 50.5))
+        # Au-delà de 32 ns, borne basse d'un intervalle de 2 ou 4 ns
+        self.assertEqual(histogram.percentile(10), 10)
+        self.assertEqual(histogram.percentile(50), 50)
+        self.assertEqual(histogram.percentile(99), 96)
+        self.assertEqual(histogram.percentile(100), 100)
+
+    def test_relative_precision(self):
+        for value in (32, 33, 47, 1000, 12_345, 999_999, 2 ** 40 + 12_345):
+            with self.subTest(value=value):
+                histogram = LatencyHistogram()
+                histogram.record(value)
+                lower = histogram.percentile(50)
+                self.assertLessEqual(lower, value)
+                self.assertLess(value - lower, value / 16)
+
+    def test_bucket_bounds_round_trip(self):
+        for index in range(metrics._BUCKET_COUNT - 1):
+            lower = metrics._bucket_lower_bound(index)
+            with self.subTest(index=index):
+                self.assertLess(lower, metrics._bucket_lower_bound(index + 1))
+                histogram = LatencyHistogram()
+                histogram.record(lower)
+                self.assertEqual(histogram.counts.index(1), index)
+                histogram.record(metrics._bucket_lower_bound(index + 1) - 1)
+                self.assertEqual(histogram.counts[index], 2)
+
+    def test_percentile_capped_by_max(self):
+        histogram = LatencyHistogram()
+        histogram.record(1_000_000)
+        histogram.record(-5)
+        self.assertEqual(histogram.counts[0], 1)
+        self.assertLessEqual(histogram.percentile(100), 1_000_000)
+
+    def test_empty(self):
+        histogram = LatencyHistogram()
+        self.assertEqual((histogram.percentile(99), histogram.mean()), (0, 0.0))
+
+    def test_nearest_rank_percentile(self):
+        values = list(range(1, 11))
+        self.assertEqual([percentile(values, q) for q in (0, 10, 50, 91, 100)], [1, 1, 5, 10, 10])
+        self.assertEqual(percentile([], 50), 0.0)
+
+
+class ScrapeRateTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch("metrics.time.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.session = SessionMetrics("live")
+        self.registry = MetricsRegistry()
+        self.registry.add_session(self.session)
+
+    def test_rate_between_scrapes(self):
+        self.clock.now += 10
+        self.session.comments = 500
+        self.assertEqual(self.registry._scrape_rate(self.session), 50.0)
+
+        # Collecte rapprochée: débit précédent conservé
+        self.clock.now += 0.5
+        self.session.comments = 1000
+        self.assertEqual(self.registry._scrape_rate(self.session), 50.0)
+
+        self.clock.now += 0.5
+        self.assertEqual(self.registry._scrape_rate(self.session), 500.0)
+
+    def test_independent_of_log_summary(self):
+        self.clock.now += 2
+        self.session.comments = 100
+        self.session.update_recent_rate()
+        self.assertEqual(self.session.recent_comments_per_second, 50.0)
+        self.assertEqual(self.registry._scrape_rate(self.session), 50.0)
+
+    def test_render_prometheus(self):
+        self.clock.now += 4
+        self.session.name = 'live "test"'
+        self.session.comments = 40
+        self.session.correct_answers = 3
+        self.session.verdict_latency.record(20)
+        overlay_render = LatencyHistogram()
+        overlay_render.record(2_000_000)
+        self.registry.add_histogram("quiz_overlay_render_seconds", overlay_render, "Rendu d'une image")
+        self.registry.add_gauge("quiz_tts_queue_depth", lambda: 2, "File TTS")
+        self.registry.add_gauge("quiz_broken_gauge", lambda: 1 / 0, "Jauge en erreur")
+
+        lines = self.registry.render_prometheus().splitlines()
+        self.assertIn('quiz_comments_total{session="live \\"test\\""} 40', lines)
+        self.assertIn('quiz_correct_answers_total{session="live \\"test\\""} 3', lines)
+        self.assertIn('quiz_comments_per_second{session="live \\"test\\""} 10.000', lines)
+        self.assertIn('quiz_comment_verdict_seconds{session="live \\"test\\"",quantile="0.5"} 0.000000020', lines)
+        self.assertIn('quiz_comment_verdict_seconds_count{session="live \\"test\\""} 1', lines)
+        self.assertIn('quiz_overlay_render_seconds_count 1', lines)
+        self.assertIn("quiz_tts_queue_depth 2.0", lines)
+        self.assertFalse(any(line.startswith("quiz_broken_gauge") for line in lines))
+
+
+class MetricsServerTest(unittest.TestCase):
+    def test_disabled_with_port_zero(self):
+        self.assertIsNone(start_metrics_server(0, metrics_registry=MetricsRegistry()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+"""
+Tests des destinations d'images de l'overlay sans Tk.
+"""
+
+import unittest
+
+from overlay_renderer import FrameSink
+
+
+class FrameSinkTest(unittest.TestCase):
+    def test_sink_without_write_cannot_be_created(self):
+        class Incomplete(FrameSink):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_minimal_sink(self):
+        class ListSink(FrameSink):
+            def __init__(self):
+                self.frames = []
+
+            def write(self, image, dirty, frame_number):
+                self.frames.append((image, frame_number))
+
+        sink = ListSink()
+        sink.write("image", [], 0)
+        sink.close()
+        self.assertEqual(sink.frames, [("image", 0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Tests des banques de questions compilées: lettres révélées en masques de bits,
+réponse masquée calculée une fois et partage entre sessions.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from question_bank import (clear_question_bank_cache, compile_question_bank, indices_to_mask,
+                           load_question_bank, mask_answer, mask_to_indices)
+from quiz_manager import Question, QuizManager
+
+
+class RevealMaskTest(unittest.TestCase):
+    def test_indices_round_trip(self):
+        for indices in ((), (0,), (1, 4), (0, 2, 3, 70)):
+            with self.subTest(indices=indices):
+                self.assertEqual(mask_to_indices(indices_to_mask(indices)), indices)
+
+    def test_negative_and_duplicate_indices(self):
+        self.assertEqual(indices_to_mask([-1, 2, 2]), 0b100)
+
+    def test_masked_answer(self):
+        self.assertEqual(mask_answer("Tour Eiffel", indices_to_mask([0, 5])), "T _ _ _   E _ _ _ _ _")
+        self.assertEqual(mask_answer("Paris", 0), "_ _ _ _ _")
+        # Un indice au-delà de la réponse ne révèle rien
+        self.assertEqual(mask_answer("Mars", indices_to_mask([3, 10])), "_ _ _ s")
+
+    def test_question_computes_masked_answer_once(self):
+        question = Question("Capitale de la France?", "Paris", revealed_indices=[0, 4])
+        self.assertEqual(question.revealed_indices, [0, 4])
+        self.assertIsNone(question.masked_answer)
+        masked = question.get_masked_answer()
+        self.assertEqual(masked, "P _ _ _ s")
+        self.assertIs(question.get_masked_answer(), masked)
+
+    def test_default_reveal_depends_on_length(self):
+        self.assertEqual(Question("?", "Ra").revealed_indices, [])
+        self.assertEqual(len(Question("?", "Mars").revealed_indices), 1)
+        self.assertEqual(len(Question("?", "Constantinople").revealed_indices), 3)
+
+
+class QuestionStoreTest(unittest.TestCase):
+    QUESTIONS = [
+        {"text": "Capitale de la France?", "answer": "Paris", "revealed_indices": [0], "points": 20},
+        {"text": "Planète rouge?", "answer": "Mars", "time_limit": 15, "theme": "Espace"},
+        {"text": "Ville lumière?", "answer": "Paris", "revealed_indices": [0]},
+    ]
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.questions_file = os.path.join(self.temp_dir.name, "questions.json")
+        self.write_questions(self.QUESTIONS)
+        clear_question_bank_cache()
+        self.addCleanup(clear_question_bank_cache)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_questions(self, questions):
+        with open(self.questions_file, "w", encoding="utf-8") as f:
+            json.dump(questions, f)
+
+    def test_columns(self):
+        bank = compile_question_bank(self.QUESTIONS)
+        self.assertEqual(len(bank), 3)
+        self.assertEqual(bank.revealed_masks, (1, None, 1))
+        self.assertEqual(bank.masked_answers, ("P _ _ _ _", None, "P _ _ _ _"))
+        # Réponses et réponses masquées répétées: une seule chaîne
+        self.assertIs(bank.answers[0], bank.answers[2])
+        self.assertIs(bank.masked_answers[0], bank.masked_answers[2])
+
+    def test_specs(self):
+        bank = compile_question_bank(self.QUESTIONS)
+        first, second = bank[0], bank[-2]
+        self.assertEqual((first.revealed_indices, first.points), ((0,), 20))
+        self.assertEqual((second.revealed_indices, second.time_limit, second.theme), (None, 15, "Espace"))
+        self.assertEqual([spec.text for spec in bank[1:]], ["Planète rouge?", "Ville lumière?"])
+        self.assertEqual(list(bank), bank[:])
+
+    def test_bank_shared_until_file_changes(self):
+        bank = load_question_bank(self.questions_file)
+        self.assertIs(load_question_bank(self.questions_file), bank)
+        self.write_questions(self.QUESTIONS[:2])
+        self.assertEqual(len(load_question_bank(self.questions_file)), 2)
+
+    def test_sessions_share_masked_answers(self):
+        scores_file = os.path.join(self.temp_dir.name, "scores.json")
+        first = QuizManager(self.questions_file, scores_file=scores_file, analytics_dir=None)
+        second = QuizManager(self.questions_file, scores_file=scores_file, analytics_dir=None)
+        self.assertIs(first.questions[0].get_masked_answer(), second.questions[0].get_masked_answer())
+        # Sans lettres fixées par le fichier, chaque session tire les siennes
+        self.assertIsNone(first.questions[1].masked_answer)
+        self.assertEqual(len(first.questions[1].revealed_indices), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
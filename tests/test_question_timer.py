@@ -0,0 +1,134 @@
+"""
+Tests du chronométrage des questions: échéances sur l'horloge monotone,
+compte à rebours affiché et rappel unique à l'échéance.
+"""
+
+import unittest
+from unittest import mock
+
+from question_timer import NS_PER_SECOND, QuestionTimer, deadline_passed, display_seconds, remaining_seconds
+from quiz_manager import Question
+
+
+class FakeClock:
+    def __init__(self):
+        self.now_ns = 5 * NS_PER_SECOND
+
+    def __call__(self):
+        return self.now_ns
+
+    def advance(self, seconds):
+        self.now_ns += int(seconds * NS_PER_SECOND)
+
+
+class FakeScheduler:
+    """Rappels planifiés sans boucle: {identifiant: (délai en secondes, rappel)}"""
+
+    def __init__(self):
+        self.callbacks = {}
+        self._next_id = 0
+
+    def schedule(self, delay, callback):
+        self._next_id += 1
+        self.callbacks[self._next_id] = (delay, callback)
+        return self._next_id
+
+    def cancel(self, handle):
+        del self.callbacks[handle]
+
+    def run_next(self):
+        handle = min(self.callbacks)
+        delay, callback = self.callbacks.pop(handle)
+        callback()
+        return delay
+
+
+class DeadlineTest(unittest.TestCase):
+    def test_remaining_and_display(self):
+        deadline = 10 * NS_PER_SECOND
+        self.assertEqual(remaining_seconds(deadline, 7_500_000_000), 2.5)
+        self.assertEqual(remaining_seconds(deadline, 11 * NS_PER_SECOND), 0)
+        self.assertEqual(display_seconds(deadline, 7_500_000_000), 3)
+        self.assertEqual(display_seconds(deadline, deadline - 1), 1)
+        self.assertEqual(display_seconds(deadline, deadline), 0)
+
+    def test_deadline_passed_at_deadline(self):
+        self.assertFalse(deadline_passed(100, 99))
+        self.assertTrue(deadline_passed(100, 100))
+        self.assertTrue(deadline_passed(100, 101))
+
+
+class QuestionTimerTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch("question_timer.time.monotonic_ns", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.scheduler = FakeScheduler()
+        self.timer = QuestionTimer(self.scheduler.schedule, self.scheduler.cancel)
+        self.expired = []
+        self.question = Question("Capitale de la France?", "Paris", time_limit=40)
+        self.question.activate()
+
+    def test_fires_once_at_deadline(self):
+        self.timer.start(self.question, self.expired.append)
+        self.assertEqual(list(self.scheduler.callbacks.values())[0][0], 40)
+        self.clock.advance(40)
+        self.scheduler.run_next()
+        self.assertEqual(self.expired, [self.question])
+        self.assertFalse(self.question.active)
+        self.assertEqual((self.timer.expired_count, self.timer.remaining_seconds()), (1, 0.0))
+        self.assertEqual(self.scheduler.callbacks, {})
+
+    def test_early_callback_is_rescheduled(self):
+        self.timer.start(self.question, self.expired.append)
+        # Rappel en avance d'une demi-milliseconde (arrondi de la boucle)
+        self.clock.advance(40 - 0.0005)
+        self.scheduler.run_next()
+        self.assertEqual(self.expired, [])
+        self.assertTrue(self.question.active)
+        self.assertAlmostEqual(list(self.scheduler.callbacks.values())[0][0], 0.0005)
+        self.clock.advance(0.0005)
+        self.scheduler.run_next()
+        self.assertEqual(self.expired, [self.question])
+
+    def test_remaining_follows_clock(self):
+        self.timer.start(self.question, self.expired.append)
+        self.clock.advance(15.25)
+        self.assertEqual(self.timer.remaining_seconds(), 24.75)
+        self.assertEqual(self.question.remaining_seconds(), 24.75)
+
+    def test_cancel(self):
+        self.timer.start(self.question, self.expired.append)
+        self.timer.cancel()
+        self.assertEqual(self.scheduler.callbacks, {})
+        self.assertIsNone(self.timer.question)
+
+    def test_restart_replaces_previous_question(self):
+        self.timer.start(self.question, self.expired.append)
+        next_question = Question("Planète rouge?", "Mars", time_limit=20)
+        next_question.activate()
+        self.timer.start(next_question, self.expired.append)
+        self.assertEqual(len(self.scheduler.callbacks), 1)
+        self.clock.advance(20)
+        self.scheduler.run_next()
+        self.assertEqual(self.expired, [next_question])
+
+    def test_deactivated_question_is_ignored(self):
+        self.timer.start(self.question, self.expired.append)
+        self.question.deactivate()
+        self.clock.advance(40)
+        self.scheduler.run_next()
+        self.assertEqual((self.expired, self.timer.expired_count), ([], 0))
+
+    def test_tk_delay_rounds_up_to_milliseconds(self):
+        root = mock.Mock()
+        timer = QuestionTimer.for_tk(root)
+        timer.start(self.question, self.expired.append)
+        self.clock.advance(39.9999)
+        timer._fire()
+        self.assertEqual(root.after.call_args_list[-1][0][0], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+"""
+Tests des statistiques du quiz: capture par question, export CSV (ou Parquet)
+et expiration jugée selon la même échéance que le QuestionTimer et les réponses.
+"""
+
+import csv
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from quiz_analytics import NO_CORRECT_ANSWER, QuizAnalytics, load_pyarrow, write_analytics
+from quiz_manager import Question, QuizManager
+
+MS_NS = 1_000_000
+
+
+class FakeClock:
+    def __init__(self):
+        self.now_ns = 0
+
+    def __call__(self):
+        return self.now_ns
+
+
+class CaptureTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch("quiz_analytics.time.monotonic_ns", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.analytics = QuizAnalytics("capitales", output_dir=self.temp_dir.name, file_format="csv")
+
+    def play_two_questions(self):
+        """Question 3 trouvée après une erreur, puis question 7 expirée sans bonne réponse"""
+        analytics = self.analytics
+        analytics.start_question(3, Question("Capitale de la France?", "Paris", time_limit=40))
+        for user_id in ("user1", "user2", "user1"):
+            analytics.comment(user_id)
+        self.clock.now_ns = 1500 * MS_NS
+        analytics.answer(False)
+        self.clock.now_ns = 2250 * MS_NS
+        analytics.answer(True)
+        self.clock.now_ns = 3000 * MS_NS
+        analytics.answer(True)
+        analytics.end_question(expired=False)
+
+        analytics.start_question(7, Question("Capitale du Japon?", "Tokyo", time_limit=20))
+        analytics.comment("user3")
+        self.clock.now_ns += 500 * MS_NS
+        analytics.answer(False)
+        analytics.end_question(expired=True)
+
+    def read_csv(self, path):
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            return list(csv.DictReader(f))
+
+    def test_columns(self):
+        self.play_two_questions()
+        columns = self.analytics.columns
+        self.assertEqual(list(columns.questions), [3, 7])
+        self.assertEqual(list(columns.first_correct_ms), [2250, NO_CORRECT_ANSWER])
+        self.assertEqual((list(columns.attempts), list(columns.participants)), ([3, 1], [2, 1]))
+        self.assertEqual(list(columns.expired), [0, 1])
+        self.assertEqual(list(columns.answer_rows), [0, 0, 0, 1])
+        self.assertEqual(list(columns.answer_latency_ms), [1500, 2250, 3000, 500])
+        self.assertEqual(list(columns.answer_correct), [0, 1, 1, 0])
+        self.assertFalse(self.analytics.question_open)
+
+    def test_write_csv(self):
+        self.play_two_questions()
+        base_path = os.path.join(self.temp_dir.name, "export", "capitales")
+        questions_path, answers_path = write_analytics(self.analytics.columns, base_path, "csv")
+        self.assertEqual(questions_path, base_path + "_questions.csv")
+
+        questions = self.read_csv(questions_path)
+        self.assertEqual([(row["question_index"], row["answer"], row["time_limit"]) for row in questions],
+                         [("3", "Paris", "40"), ("7", "Tokyo", "20")])
+        # Sans bonne réponse: cellule vide plutôt que -1
+        self.assertEqual([row["first_correct_ms"] for row in questions], ["2250", ""])
+        self.assertEqual([row["expired"] for row in questions], ["0", "1"])
+        self.assertEqual([row["participants"] for row in questions], ["2", "1"])
+
+        answers = self.read_csv(answers_path)
+        self.assertEqual([(row["question_row"], row["latency_ms"], row["correct"]) for row in answers],
+                         [("0", "1500", "0"), ("0", "2250", "1"), ("0", "3000", "1"), ("1", "500", "0")])
+
+    @unittest.skipIf(load_pyarrow() is None, "pyarrow indisponible")
+    def test_write_parquet(self):
+        self.play_two_questions()
+        questions_path, _ = write_analytics(self.analytics.columns,
+                                            os.path.join(self.temp_dir.name, "capitales"), "parquet")
+        questions = load_pyarrow()[1].read_table(questions_path).to_pydict()
+        self.assertEqual(questions["first_correct_ms"], [2250, None])
+        self.assertEqual(questions["expired"], [False, True])
+
+    def test_write_error_returns_no_paths(self):
+        self.play_two_questions()
+        not_a_directory = os.path.join(self.temp_dir.name, "fichier")
+        open(not_a_directory, "w").close()
+        self.assertEqual(write_analytics(self.analytics.columns, os.path.join(not_a_directory, "x"), "csv"), [])
+
+    def test_export_waits_for_question_end(self):
+        self.analytics.start_question(0, Question("Capitale de la France?", "Paris"))
+        self.assertIsNone(self.analytics.export(background=False))
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+        self.analytics.end_question(expired=False)
+        self.analytics.export(background=False)
+        self.assertEqual(len(self.analytics.columns), 0)
+        self.assertEqual(sorted(name.rsplit("_", 1)[1] for name in os.listdir(self.temp_dir.name)),
+                         ["answers.csv", "questions.csv"])
+
+
+class ExpiredQuestionTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        questions_file = os.path.join(self.temp_dir.name, "questions.json")
+        with open(questions_file, "w", encoding="utf-8") as f:
+            json.dump([{"text": "Capitale de la France?", "answer": "Paris", "points": 10, "time_limit": 40},
+                       {"text": "Planète rouge?", "answer": "Mars", "points": 10, "time_limit": 40}], f)
+        self.quiz_manager = QuizManager(questions_file,
+                                        scores_file=os.path.join(self.temp_dir.name, "scores.json"),
+                                        analytics_dir=os.path.join(self.temp_dir.name, "analytics"))
+        self.question = self.quiz_manager.next_question()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_deadline_boundary(self):
+        deadline = self.question.deadline_ns
+        self.assertFalse(self.question.deadline_passed(deadline - 1))
+        self.assertTrue(self.question.deadline_passed(deadline))
+
+    def test_expired_at_deadline_even_once_deactivated(self):
+        # Ce que fait le QuestionTimer à l'échéance avant de passer à la question suivante
+        self.question.deadline_ns = time.monotonic_ns()
+        self.assertTrue(self.question.is_time_expired())
+        self.question.deactivate()
+        self.assertFalse(self.question.is_time_expired())
+        self.quiz_manager.next_question()
+        self.assertEqual(self.quiz_manager.analytics.columns.expired[0], 1)
+
+    def test_not_expired_when_answered(self):
+        self.quiz_manager.process_answer("1", "alice", "paris")
+        self.question.deadline_ns = time.monotonic_ns()
+        self.quiz_manager.next_question()
+        self.assertEqual(self.quiz_manager.analytics.columns.expired[0], 0)
+
+    def test_not_expired_before_deadline(self):
+        self.quiz_manager.next_question()
+        self.assertEqual(self.quiz_manager.analytics.columns.expired[0], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
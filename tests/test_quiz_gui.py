@@ -0,0 +1,111 @@
+"""
+Tests de l'ordre d'affichage de l'overlay Tk: une bonne réponse comptée dans le
+thread TikTok juste avant l'échéance l'emporte sur "Temps écoulé!".
+"""
+
+import collections
+import json
+import os
+import tempfile
+import unittest
+
+try:
+    import quiz_gui
+except ImportError:  # TikTokLive ou tkinter absent
+    quiz_gui = None
+
+from overlay_state import OverlayState
+from question_timer import QuestionTimer
+from quiz_manager import QuizManager
+
+
+class FakeRoot:
+    """Rappels Tk enregistrés sans boucle: (délai en ms, fonction)"""
+
+    def __init__(self):
+        self.callbacks = {}
+        self._next_id = 0
+
+    def after(self, delay_ms, callback, *args):
+        self._next_id += 1
+        self.callbacks[self._next_id] = (delay_ms, callback)
+        return self._next_id
+
+    def after_cancel(self, callback_id):
+        self.callbacks.pop(callback_id, None)
+
+
+@unittest.skipIf(quiz_gui is None, "TikTokLive ou tkinter indisponible")
+class QuestionExpiryTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        questions_file = os.path.join(self.temp_dir.name, "questions.json")
+        with open(questions_file, "w", encoding="utf-8") as f:
+            json.dump([{"text": "Capitale de la France?", "answer": "Paris", "points": 10, "time_limit": 40},
+                       {"text": "Planète rouge?", "answer": "Mars", "points": 10, "time_limit": 40}], f)
+        quiz_manager = QuizManager(questions_file, scores_file=os.path.join(self.temp_dir.name, "scores.json"),
+                                   analytics_dir=None)
+
+        # Interface sans fenêtre: seuls les attributs utilisés par les rappels du quiz
+        gui = quiz_gui.TikTokQuizGUI.__new__(quiz_gui.TikTokQuizGUI)
+        gui.root = FakeRoot()
+        gui.quiz_manager = quiz_manager
+        gui.overlay = OverlayState()
+        gui.question_timer = QuestionTimer.for_tk(gui.root)
+        gui.tts_worker = None
+        gui.is_running = True
+        gui.timer_id = None
+        gui.score_labels = [None] * 10
+        gui._verdicts = collections.deque()
+        gui._pending_overlay_ns = []
+        self.gui = gui
+
+        self.question = quiz_manager.next_question()
+        gui.question_timer.start(self.question, gui.on_question_expired)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def expire(self):
+        """Échéance atteinte: ce que fait le QuestionTimer dans le thread Tk"""
+        self.gui.question_timer.cancel()
+        self.question.deactivate()
+        self.gui.on_question_expired(self.question)
+
+    def scheduled_next_questions(self):
+        return [callback for _, callback in self.gui.root.callbacks.values()
+                if callback == self.gui.next_question]
+
+    def test_correct_answer_waiting_for_render_tick_wins(self):
+        # Thread TikTok: réponse comptée, affichage laissé à render_tick
+        is_correct, _ = self.gui.quiz_manager.process_answer("u1", "Alice", "Paris")
+        self.assertTrue(is_correct)
+        self.gui._verdicts.append((self.question, "Alice", 0))
+
+        self.expire()
+        self.assertEqual(self.gui.overlay.get("question"), "Alice a trouvé la bonne réponse!")
+        self.assertEqual(self.gui.overlay.get("answer"), ("Paris", "green"))
+        self.assertEqual(len(self.scheduled_next_questions()), 1)
+        self.assertFalse(self.gui._verdicts)
+
+    def test_correct_answer_not_yet_queued(self):
+        # Réponse comptée mais pas encore mise en file: pas de "Temps écoulé!" entre-temps
+        self.gui.quiz_manager.process_answer("u1", "Alice", "Paris")
+        self.expire()
+        self.assertNotEqual(self.gui.overlay.get("question"), "Temps écoulé!")
+        self.assertEqual(self.scheduled_next_questions(), [])
+
+        self.gui._verdicts.append((self.question, "Alice", 0))
+        self.gui.drain_verdicts()
+        self.assertEqual(self.gui.overlay.get("question"), "Alice a trouvé la bonne réponse!")
+        self.assertEqual(len(self.scheduled_next_questions()), 1)
+
+    def test_time_up_without_answer(self):
+        self.expire()
+        self.assertEqual(self.gui.overlay.get("question"), "Temps écoulé!")
+        self.assertEqual(self.gui.overlay.get("answer"), ("Paris", "orange"))
+        self.assertEqual(len(self.scheduled_next_questions()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+"""
+Tests du mode multi-processus: répartition des comptes et ports des serveurs locaux.
+"""
+
+import unittest
+
+from quiz_sharding import port_conflicts, split_sessions
+
+
+class SplitSessionsTest(unittest.TestCase):
+    def test_round_robin_without_empty_shard(self):
+        self.assertEqual(split_sessions(["a", "b", "c", "d", "e"], 2), [["a", "c", "e"], ["b", "d"]])
+        self.assertEqual(split_sessions(["a", "b"], 8), [["a"], ["b"]])
+
+
+class PortConflictsTest(unittest.TestCase):
+    def test_default_configuration(self):
+        self.assertEqual(port_conflicts(64), [])
+
+    def test_worker_range_overlapping_another_server(self):
+        ports = {"METRICS_HTTP_PORT": [9108], "PROFILE_CONTROL_PORT": [9109], "OVERLAY_SERVER_PORT": [9110],
+                 "SHARD_METRICS_BASE_PORT": range(9109, 9111)}
+        self.assertEqual(port_conflicts(2, ports), ["9109 (PROFILE_CONTROL_PORT et SHARD_METRICS_BASE_PORT)",
+                                                    "9110 (OVERLAY_SERVER_PORT et SHARD_METRICS_BASE_PORT)"])
+
+    def test_disabled_servers_are_ignored(self):
+        self.assertEqual(port_conflicts(1, {"METRICS_HTTP_PORT": [0], "OVERLAY_SERVER_PORT": [0]}), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+"""
+Tests du graphe de démarrage: ordre des dépendances, tâches en parallèle,
+tâches du thread principal et propagation des échecs.
+"""
+
+import queue
+import threading
+import unittest
+
+from startup_graph import DONE, FAILED, SKIPPED, StartupGraph
+
+
+class StartupGraphTest(unittest.TestCase):
+    def setUp(self):
+        self.order = []
+        self.order_lock = threading.Lock()
+        self.completed = threading.Event()
+        self.errors = []
+
+    def make_graph(self, **kwargs):
+        return StartupGraph(on_error=lambda name, error: self.errors.append((name, error)),
+                            on_complete=self.completed.set, **kwargs)
+
+    def step(self, name, result=None):
+        def run():
+            with self.order_lock:
+                self.order.append(name)
+            return result
+        return run
+
+    def run_graph(self, graph):
+        graph.start()
+        self.assertTrue(self.completed.wait(timeout=5))
+
+    def test_dependencies_run_first(self):
+        graph = self.make_graph()
+        graph.add("questions", self.step("questions", 3))
+        graph.add("tts", self.step("tts"), after=["questions"])
+        graph.add("connexion", self.step("connexion"), after=["questions"])
+        graph.add("interface", lambda: graph.result("questions") + 1, after=["tts", "connexion"])
+        self.run_graph(graph)
+        self.assertEqual(self.order[0], "questions")
+        self.assertEqual(sorted(self.order[1:]), ["connexion", "tts"])
+        self.assertEqual(graph.result("interface"), 4)
+        self.assertEqual(graph.wait("interface", timeout=1), 4)
+        self.assertTrue(all(graph.done(name) for name in graph.tasks))
+
+    def test_independent_tasks_run_in_parallel(self):
+        # Deux tâches qui s'attendent mutuellement: bloquerait si elles étaient exécutées l'une après l'autre
+        barrier = threading.Barrier(2, timeout=5)
+        graph = self.make_graph()
+        graph.add("tts", barrier.wait)
+        graph.add("connexion", barrier.wait)
+        self.run_graph(graph)
+        self.assertEqual(self.errors, [])
+
+    def test_main_thread_tasks_are_dispatched(self):
+        dispatched = queue.Queue()
+        threads = {}
+        graph = self.make_graph(dispatch_main=dispatched.put)
+        graph.add("questions", lambda: threads.setdefault("questions", threading.current_thread()))
+        graph.add("fenêtre", lambda: threads.setdefault("fenêtre", threading.current_thread()),
+                  after=["questions"], main_thread=True)
+        graph.start()
+        # Boucle du "thread principal": exécute ce que le graphe lui confie
+        dispatched.get(timeout=5)()
+        self.assertTrue(self.completed.wait(timeout=5))
+        self.assertIs(threads["fenêtre"], threading.current_thread())
+        self.assertIsNot(threads["questions"], threading.current_thread())
+
+    def test_failure_skips_dependents(self):
+        error = OSError("micro introuvable")
+
+        def fail():
+            raise error
+
+        graph = self.make_graph()
+        graph.add("tts", fail)
+        graph.add("pré-rendu", self.step("pré-rendu"), after=["tts"])
+        graph.add("annonce", self.step("annonce"), after=["pré-rendu"])
+        graph.add("questions", self.step("questions"))
+        self.run_graph(graph)
+
+        self.assertEqual(self.order, ["questions"])
+        self.assertEqual(self.errors, [("tts", error)])
+        states = {name: task.state for name, task in graph.tasks.items()}
+        self.assertEqual(states, {"tts": FAILED, "pré-rendu": SKIPPED, "annonce": SKIPPED, "questions": DONE})
+        with self.assertRaises(RuntimeError) as context:
+            graph.wait("annonce", timeout=1)
+        self.assertIs(context.exception.__cause__, error)
+        self.assertIn("annonce (annulée)", graph.summary())
+
+    def test_invalid_graphs(self):
+        graph = StartupGraph()
+        graph.add("a", self.step("a"))
+        with self.assertRaises(ValueError):
+            graph.add("a", self.step("a"))
+
+        graph = StartupGraph()
+        graph.add("a", self.step("a"), after=["inconnue"])
+        with self.assertRaises(ValueError):
+            graph.start()
+
+        graph = StartupGraph()
+        graph.add("a", self.step("a"), after=["c"])
+        graph.add("b", self.step("b"), after=["a"])
+        graph.add("c", self.step("c"), after=["b"])
+        with self.assertRaisesRegex(ValueError, "Cycle"):
+            graph.start()
+        self.assertEqual(self.order, [])
+
+    def test_empty_graph_completes(self):
+        self.run_graph(self.make_graph())
+
+    def test_wait_timeout(self):
+        release = threading.Event()
+        graph = self.make_graph()
+        graph.add("lent", release.wait)
+        graph.start()
+        with self.assertRaises(TimeoutError):
+            graph.wait("lent", timeout=0.01)
+        release.set()
+        self.assertTrue(self.completed.wait(timeout=5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+Tests des banques par thème: découpage d'un thème trop gros en parties et
+reconstruction d'une banque existante.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from theme_bank import ThemeBank, ThemeBankWriter, build_theme_bank
+
+
+def make_question(number, theme="History"):
+    return {"text": f"Question {number} " + "x" * 200, "answer": f"Réponse {number}",
+            "points": 10, "time_limit": 40, "theme": theme}
+
+
+class ThemeBankTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.bank_dir = os.path.join(self.temp_dir.name, "bank")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_source(self, name, questions):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(questions, f)
+        return path
+
+    def test_large_theme_is_split_under_size_cap(self):
+        writer = ThemeBankWriter(self.bank_dir, max_size=1000)
+        for number in range(20):
+            writer.write("History", make_question(number))
+        entries = writer.close()
+        self.assertGreater(len(entries), 1)
+        self.assertTrue(all(entry["size"] <= 1000 for entry in entries))
+        self.assertEqual([entry["file"] for entry in entries[:2]], ["history.jsonl", "history_2.jsonl"])
+
+        bank = ThemeBank(self.bank_dir)
+        self.assertEqual([question["answer"] for question in bank.read_themes()],
+                         [f"Réponse {number}" for number in range(20)])
+        self.assertEqual(len(bank.sample(2, ["History (2)"])), 2)
+
+    def test_part_names_do_not_collide_with_close_themes(self):
+        writer = ThemeBankWriter(self.bank_dir, max_count=1)
+        writer.write("History", make_question(1))
+        writer.write("History 2", make_question(2, "History 2"))
+        writer.write("History", make_question(3))
+        files = {entry["theme"]: entry["file"] for entry in writer.close()}
+        self.assertEqual(files, {"History": "history.jsonl", "History 2": "history_2.jsonl",
+                                 "History (2)": "history_2_2.jsonl"})
+
+    def test_rebuild_removes_stale_parts(self):
+        build_theme_bank([self.write_source("a.json", [make_question(n) for n in range(3)] +
+                                            [make_question(9, "Art")])], self.bank_dir)
+        build_theme_bank([self.write_source("b.json", [make_question(n) for n in range(2)])], self.bank_dir)
+        self.assertEqual(ThemeBank(self.bank_dir).themes, ["History"])
+        self.assertEqual(sorted(os.listdir(self.bank_dir)), ["catalog.json", "history.idx", "history.jsonl"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Tests de l'import de dumps Open Trivia DB: lecture par morceaux des tableaux
+JSON et ajout à des banques par thème existantes.
+"""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from theme_bank import ThemeBank
+from trivia_importer import TriviaImporter, iter_json_array, iter_dump_records
+
+
+def make_record(number, category="History"):
+    return {"type": "multiple", "category": category,
+            "question": f"Question &quot;{number}&quot; d&#039;histoire?",
+            "correct_answer": f"Réponse {number}"}
+
+
+class IterJsonArrayTest(unittest.TestCase):
+    def test_tiny_chunks_keep_values_whole(self):
+        values = [12345, 67890, -1.5e3, True, None, "a,]b", {"k": [1, 2, {"x": "é"}]}, [], 7]
+        text = json.dumps(values, ensure_ascii=False)
+        for chunk_size in range(1, 9):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(list(iter_json_array(io.StringIO(text), chunk_size)), values)
+
+    def test_number_cut_at_chunk_boundary(self):
+        self.assertEqual(list(iter_json_array(io.StringIO("[12345, 67890]"), 4)), [12345, 67890])
+
+    def test_results_wrapper(self):
+        text = json.dumps({"response_code": 0, "results": [make_record(1), make_record(2)]})
+        records = list(iter_json_array(io.StringIO(text), 5))
+        self.assertEqual([record["correct_answer"] for record in records], ["Réponse 1", "Réponse 2"])
+
+    def test_truncated_file(self):
+        text = json.dumps([make_record(1), make_record(2)])
+        for cut in (len(text) - 1, len(text) // 2):
+            with self.subTest(cut=cut):
+                with self.assertRaises(ValueError):
+                    list(iter_json_array(io.StringIO(text[:cut]), 16))
+
+
+class TriviaImporterTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.questionnaires_dir = os.path.join(self.temp_dir.name, "questionnaires")
+        self.bank_dir = os.path.join(self.questionnaires_dir, "trivia")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_dump(self, name, records, wrapped=False):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"response_code": 0, "results": records} if wrapped else records, f)
+        return path
+
+    def run_import(self, *paths, shard_size=100):
+        importer = TriviaImporter(self.bank_dir, workers=1, batch_size=3, shard_size=shard_size,
+                                  questionnaires_dir=self.questionnaires_dir)
+        return importer.run(paths)
+
+    def read_index(self):
+        with open(os.path.join(self.questionnaires_dir, "index.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_wrapped_dump_is_cleaned(self):
+        path = self.write_dump("dump.json", [make_record(1), {"type": "boolean", "question": "Vrai?",
+                                                              "correct_answer": "True"}], wrapped=True)
+        self.assertEqual([record["question"] for record in iter_dump_records(path)][0],
+                         "Question &quot;1&quot; d&#039;histoire?")
+        report = self.run_import(path)
+        self.assertEqual((report.read, report.imported), (2, 1))
+        self.assertEqual(ThemeBank(self.bank_dir).read_theme("History")[0]["text"], 'Question "1" d\'histoire?')
+
+    def test_reimport_appends_to_existing_bank(self):
+        first = self.write_dump("first.json", [make_record(i) for i in range(5)])
+        self.assertEqual(self.run_import(first).imported, 5)
+
+        # Mêmes questions plus trois nouvelles: seules les nouvelles sont ajoutées, après les anciennes
+        second = self.write_dump("second.json", [make_record(i) for i in range(8)])
+        report = self.run_import(second)
+        self.assertEqual((report.imported, report.duplicates), (3, 5))
+        bank = ThemeBank(self.bank_dir)
+        self.assertEqual([question["answer"] for question in bank.read_theme("History")],
+                         [f"Réponse {i}" for i in range(8)])
+        self.assertEqual([entry["file"] for entry in self.read_index()], ["trivia/history.jsonl"])
+
+    def test_reimport_keeps_parts(self):
+        self.run_import(self.write_dump("first.json", [make_record(i) for i in range(5)]), shard_size=2)
+        report = self.run_import(self.write_dump("second.json", [make_record(i) for i in range(7)]), shard_size=2)
+        self.assertEqual((report.imported, report.duplicates), (2, 5))
+        bank = ThemeBank(self.bank_dir)
+        self.assertEqual(bank.themes, ["History", "History (2)", "History (3)", "History (4)"])
+        self.assertEqual([question["answer"] for question in bank.read_themes()],
+                         [f"Réponse {i}" for i in range(7)])
+        self.assertEqual([entry["theme"] for entry in self.read_index()], bank.themes)
+
+
+if __name__ == "__main__":
+    unittest.main()
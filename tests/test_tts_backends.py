@@ -0,0 +1,46 @@
+"""
+Tests des moteurs de synthèse vocale: moteur muet et interface commune.
+"""
+
+import os
+import tempfile
+import unittest
+import wave
+
+from tts_backends import NullBackend, TTSBackend
+
+
+class NullBackendTest(unittest.TestCase):
+    def test_speak_records_text_and_timing(self):
+        backend = NullBackend()
+        backend.speak("Bonjour")
+        backend.speak("Question suivante")
+        self.assertEqual(backend.spoken, ["Bonjour", "Question suivante"])
+        self.assertEqual(backend.synthesis_time.count, 2)
+
+    def test_save_to_file_writes_wav(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "silence.wav")
+            self.assertTrue(NullBackend().save_to_file("Bonjour", path))
+            with wave.open(path, "rb") as wav:
+                self.assertEqual(wav.getframerate(), 16000)
+
+
+class TTSBackendInterfaceTest(unittest.TestCase):
+    def test_backend_without_speak_cannot_be_created(self):
+        class Incomplete(TTSBackend):
+            name = "incomplet"
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_save_to_file_is_optional(self):
+        class SpeakOnly(TTSBackend):
+            def _speak(self, text):
+                pass
+
+        self.assertFalse(SpeakOnly().save_to_file("Bonjour", "inutilise.wav"))
+
+
+if __name__ == "__main__":
+    unittest.main()
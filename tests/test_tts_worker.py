@@ -0,0 +1,96 @@
+"""
+Tests de la file de lecture vocale: ordre des priorités, fusion des textes
+identiques et abandon des textes périmés.
+"""
+
+import threading
+import time
+import unittest
+
+from tts_backends import NullBackend
+from tts_worker import PRIORITY_ANNOUNCEMENT, PRIORITY_QUESTION, PRIORITY_WINNER, TTSWorker
+
+
+class BlockingBackend(NullBackend):
+    """Moteur muet qui bloque sur "Bienvenue" le temps de remplir la file"""
+
+    def __init__(self):
+        super().__init__()
+        self.speaking = threading.Event()
+        self.release = threading.Event()
+        self.finished = threading.Event()
+
+    def _speak(self, text):
+        super()._speak(text)
+        if text == "Bienvenue":
+            self.speaking.set()
+            self.release.wait(timeout=5)
+        elif text == "Fin":
+            self.finished.set()
+
+
+class TTSWorkerQueueTest(unittest.TestCase):
+    def start_worker(self, max_delay=30.0):
+        self.backend = BlockingBackend()
+        self.worker = TTSWorker(backend_factory=lambda: self.backend, use_cache=False, max_delay=max_delay)
+        self.worker.start()
+        self.addCleanup(self.worker.stop)
+        self.worker.speak("Bienvenue")
+        self.assertTrue(self.backend.speaking.wait(timeout=5))
+
+    def finish(self):
+        """Débloque le moteur et retourne les textes lus (hors "Bienvenue" et "Fin")"""
+        self.worker.speak("Fin", PRIORITY_QUESTION)
+        self.backend.release.set()
+        self.assertTrue(self.backend.finished.wait(timeout=5))
+        return self.backend.spoken[1:-1]
+
+    def test_priority_order(self):
+        self.start_worker()
+        self.worker.set_current_question(1)
+        self.worker.speak("Question 1", PRIORITY_QUESTION, question_key=1)
+        self.worker.speak("Thème suivant", PRIORITY_ANNOUNCEMENT)
+        self.worker.speak("Réponses possibles", PRIORITY_QUESTION, question_key=1)
+        self.worker.speak("Bravo Alice", PRIORITY_WINNER, question_key=0)
+        self.assertEqual(self.finish(), ["Bravo Alice", "Thème suivant", "Question 1", "Réponses possibles"])
+
+    def test_identical_pending_texts_are_merged(self):
+        self.start_worker()
+        for _ in range(3):
+            self.worker.speak("Quiz terminé!")
+        self.assertEqual(self.finish(), ["Quiz terminé!"])
+        self.assertEqual(self.worker.dropped, 2)
+
+    def test_winner_cancels_pending_question(self):
+        self.start_worker()
+        self.worker.set_current_question(1)
+        self.worker.speak("Question 1", PRIORITY_QUESTION, question_key=1)
+        self.worker.speak("Bravo Alice", PRIORITY_WINNER, question_key=1)
+        # L'annonce du gagnant survit à l'affichage de la question suivante
+        self.worker.set_current_question(2)
+        self.worker.speak("Question 2", PRIORITY_QUESTION, question_key=2)
+        self.assertEqual(self.finish(), ["Bravo Alice", "Question 2"])
+
+    def test_previous_question_is_dropped(self):
+        self.start_worker()
+        self.worker.set_current_question(1)
+        self.worker.speak("Question 1", PRIORITY_QUESTION, question_key=1)
+        self.worker.set_current_question(2)
+        self.assertEqual(self.finish(), [])
+        self.assertEqual(self.worker.dropped, 1)
+
+    def test_expired_text_is_dropped(self):
+        self.start_worker(max_delay=0.05)
+        self.worker.speak("Trop tard", PRIORITY_ANNOUNCEMENT)
+        time.sleep(0.1)
+        self.assertEqual(self.finish(), [])
+        self.assertEqual(self.worker.dropped, 1)
+
+    def test_speak_without_thread_is_ignored(self):
+        worker = TTSWorker(backend_factory=NullBackend, use_cache=False)
+        worker.speak("Bonjour")
+        self.assertEqual(worker.pending, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+"""
+Mise en page du texte de l'overlay: choix de la plus grande police qui tient
+dans la zone d'un label, à partir des métriques réelles de la police.
+Les largeurs de caractères sont mesurées une seule fois par police et mises en
+cache; la mise en page de chaque question et de chaque réponse masquée est
+calculée au chargement du questionnaire, pas au changement de question.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+from config import TEXT_LAYOUT_CACHE_SIZE
+
+
+class FontMetrics:
+    """Largeurs de caractères (mesurées une fois) et hauteur de ligne d'une police"""
+
+    def __init__(self, font: Any):
+        # Objet police exposant measure(texte) et metrics("linespace") (tkinter.font.Font)
+        self.font = font
+        self.linespace = font.metrics("linespace")
+        self._widths: Dict[str, int] = {}
+        self.measured = 0  # appels réels à font.measure, pour vérifier le cache
+
+    def char_width(self, char: str) -> int:
+        width = self._widths.get(char)
+        if width is None:
+            width = self.font.measure(char)
+            self._widths[char] = width
+            self.measured += 1
+        return width
+
+    def text_width(self, text: str) -> int:
+        widths = self._widths
+        total = 0
+        for char in text:
+            width = widths.get(char)
+            if width is None:
+                width = self.char_width(char)
+            total += width
+        return total
+
+
+class TextLayout(NamedTuple):
+    """Résultat de la mise en page d'un texte dans une zone"""
+    size: int  # taille de police retenue
+    wrap_width: int  # largeur de retour à la ligne à donner au label
+    lines: Tuple[str, ...]
+    width: int  # largeur de la ligne la plus longue
+    height: int  # hauteur totale du bloc
+    fits: bool  # False si même la plus petite taille déborde
+
+
+def wrap_text(text: str, metrics: FontMetrics, max_width: int) -> List[str]:
+    """Retour à la ligne par mots comme un label Tk (les mots trop longs sont coupés)"""
+    space = metrics.char_width(" ")
+    lines: List[str] = []
+    for paragraph in text.split("\n"):
+        line = ""
+        line_width = 0
+        for word in paragraph.split():
+            word_width = metrics.text_width(word)
+            if line and line_width + space + word_width <= max_width:
+                line += " " + word
+                line_width += space + word_width
+                continue
+            if line:
+                lines.append(line)
+            # Mot plus large que la zone: coupé caractère par caractère
+            while word_width > max_width and len(word) > 1:
+                cut = 1
+                cut_width = metrics.char_width(word[0])
+                while cut < len(word) and cut_width + metrics.char_width(word[cut]) <= max_width:
+                    cut_width += metrics.char_width(word[cut])
+                    cut += 1
+                lines.append(word[:cut])
+                word = word[cut:]
+                word_width -= cut_width
+            line, line_width = word, word_width
+        lines.append(line)
+    return lines
+
+
+class TextLayoutEngine:
+    """
+    Ajuste la taille de police d'un texte à une zone (largeur x hauteur en pixels).
+
+    Args:
+        font_factory: Crée la police d'une taille donnée (ex: lambda size: font.Font(..., size=size))
+        box: Largeur et hauteur disponibles
+        sizes: Tailles candidates, essayées de la plus grande à la plus petite
+    """
+
+    def __init__(self, font_factory: Callable[[int], Any], box: Tuple[int, int],
+                 sizes: Sequence[int], cache_size: int = TEXT_LAYOUT_CACHE_SIZE):
+        self.font_factory = font_factory
+        self.box_width, self.box_height = box
+        self.sizes = sorted(set(sizes), reverse=True)
+        self.cache_size = cache_size
+        self._metrics: Dict[int, FontMetrics] = {}
+        self._layouts: Dict[str, TextLayout] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def metrics(self, size: int) -> FontMetrics:
+        metrics = self._metrics.get(size)
+        if metrics is None:
+            metrics = FontMetrics(self.font_factory(size))
+            self._metrics[size] = metrics
+        return metrics
+
+    def font(self, size: int) -> Any:
+        """Police (partagée) d'une taille donnée"""
+        return self.metrics(size).font
+
+    def layout(self, text: str) -> TextLayout:
+        """Mise en page du texte (calculée une seule fois par texte)"""
+        layout = self._layouts.get(text)
+        if layout is not None:
+            self.hits += 1
+            return layout
+        self.misses += 1
+        layout = self._compute(text)
+        if len(self._layouts) >= self.cache_size:
+            self._layouts.clear()
+        self._layouts[text] = layout
+        return layout
+
+    def prefetch(self, texts: Iterable[str]) -> int:
+        """Calcule à l'avance la mise en page des textes; retourne le nombre de nouveaux textes"""
+        computed = 0
+        for text in texts:
+            if text not in self._layouts:
+                self.layout(text)
+                computed += 1
+        return computed
+
+    def _compute(self, text: str) -> TextLayout:
+        layout = None
+        for size in self.sizes:
+            metrics = self.metrics(size)
+            lines = wrap_text(text, metrics, self.box_width)
+            width = max((metrics.text_width(line) for line in lines), default=0)
+            height = len(lines) * metrics.linespace
+            layout = TextLayout(size, self.box_width, tuple(lines), width, height,
+                                width <= self.box_width and height <= self.box_height)
+            if layout.fits:
+                return layout
+        # Rien ne tient: la plus petite taille, qui déborde le moins
+        return layout
@@ -0,0 +1,451 @@
+"""
+Banques de questions découpées par thème.
+Une banque est un dossier qui contient un fichier JSONL par thème (une question
+par ligne), l'index des positions de chaque question dans ce fichier (<thème>.idx,
+entiers 64 bits) et un catalogue (catalog.json) avec le nombre de questions, la
+taille et l'empreinte du contenu de chaque thème. Un thème plus gros que
+THEME_BANK_PART_SIZE_MB continue dans <thème>_2.jsonl, <thème>_3.jsonl...
+Charger un thème ne lit que son fichier; tirer quelques questions parmi
+plusieurs thèmes ne lit que les lignes tirées, sans décoder le reste de la banque.
+
+Chemins acceptés partout où un fichier de questions est attendu:
+    questionnaires/anglais                               toute la banque
+    questionnaires/anglais/history.jsonl                 un seul thème
+    questionnaires/anglais?themes=history,art&sample=20  20 questions tirées parmi ces thèmes
+
+    python quiz_tiktok.py build_bank questionsAnglais.json [--output questionnaires/anglais] [--register]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import struct
+import sys
+import unicodedata
+from array import array
+from typing import Any, Dict, IO, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+from urllib.parse import parse_qs
+
+from config import QUESTIONNAIRES_DIR, THEME_BANK_CATALOG, THEME_BANK_PART_SIZE_MB
+from logger_setup import logger
+from validators import validate_question_format, validate_questions_file
+
+CATALOG_FORMAT = "theme_bank"
+CATALOG_VERSION = 1
+OFFSET = struct.Struct("<Q")
+OFFSET_PAIR = struct.Struct("<QQ")
+
+_NOT_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def theme_slug(theme: str) -> str:
+    """Nom de fichier d'un thème: minuscules ASCII, chiffres et _"""
+    ascii_theme = unicodedata.normalize("NFKD", theme).encode("ascii", "ignore").decode("ascii")
+    return _NOT_ALNUM.sub("_", ascii_theme.lower()).strip("_") or "divers"
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def catalog_path(bank_dir: str) -> str:
+    return os.path.join(bank_dir, THEME_BANK_CATALOG)
+
+
+class BankSelection(NamedTuple):
+    """Partie d'une banque désignée par un chemin (voir parse_bank_path)"""
+    bank_dir: str
+    themes: Optional[Tuple[str, ...]]  # None: tous les thèmes
+    sample: Optional[int]  # None: toutes les questions, dans l'ordre de la banque
+
+
+def parse_bank_path(path: str) -> Optional[BankSelection]:
+    """Reconnaît un chemin de banque par thème; None pour un fichier de questions ordinaire"""
+    if "?" in path:
+        bank_dir, query = path.split("?", 1)
+        params = parse_qs(query)
+        themes = tuple(theme for value in params.get("themes", []) for theme in value.split(",") if theme)
+        sample = params.get("sample")
+        return BankSelection(bank_dir, themes or None, int(sample[0]) if sample else None)
+    if path.endswith(".jsonl"):
+        bank_dir = os.path.dirname(path)
+        if os.path.exists(catalog_path(bank_dir)):
+            return BankSelection(bank_dir, (os.path.basename(path)[:-len(".jsonl")],), None)
+        return None
+    if os.path.isdir(path) and os.path.exists(catalog_path(path)):
+        return BankSelection(path, None, None)
+    return None
+
+
+def bank_selection_path(bank_dir: str, themes: Optional[Iterable[str]] = None,
+                        sample: Optional[int] = None) -> str:
+    """Chemin désignant un tirage parmi des thèmes (inverse de parse_bank_path)"""
+    params = []
+    if themes:
+        params.append("themes=" + ",".join(themes))
+    if sample is not None:
+        params.append(f"sample={sample}")
+    return bank_dir + ("?" + "&".join(params) if params else "")
+
+
+class ThemeEntry(NamedTuple):
+    theme: str
+    file: str
+    index: str
+    count: int
+    size: int
+    hash: str
+
+
+class ThemeBank:
+    """
+    Lecture d'une banque par thème à partir de son catalogue.
+
+    Les thèmes se désignent par leur nom ("Science: Computers") ou leur nom de
+    fichier ("science_computers").
+
+    Raises:
+        FileNotFoundError: Si le dossier n'a pas de catalogue
+        ValueError: Si le catalogue est invalide
+    """
+
+    def __init__(self, bank_dir: str):
+        self.bank_dir = bank_dir
+        with open(catalog_path(bank_dir), "r", encoding="utf-8") as f:
+            try:
+                catalog = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Catalogue invalide {catalog_path(bank_dir)}: {e}")
+        if not isinstance(catalog, dict) or catalog.get("format") != CATALOG_FORMAT:
+            raise ValueError(f"{catalog_path(bank_dir)} n'est pas un catalogue de banque par thème")
+        if catalog.get("version") != CATALOG_VERSION:
+            raise ValueError(f"Version de catalogue non prise en charge: {catalog.get('version')}")
+        self.entries: List[ThemeEntry] = [ThemeEntry(**entry) for entry in catalog["themes"]]
+        self._by_key: Dict[str, ThemeEntry] = {}
+        for entry in self.entries:
+            self._by_key[entry.theme] = entry
+            self._by_key[entry.file[:-len(".jsonl")]] = entry
+
+    @property
+    def themes(self) -> List[str]:
+        return [entry.theme for entry in self.entries]
+
+    def entry(self, theme: str) -> ThemeEntry:
+        entry = self._by_key.get(theme)
+        if entry is None:
+            raise ValueError(f"Thème inconnu dans la banque {self.bank_dir}: {theme}")
+        return entry
+
+    def select(self, themes: Optional[Iterable[str]] = None) -> List[ThemeEntry]:
+        return list(self.entries) if themes is None else [self.entry(theme) for theme in themes]
+
+    def count(self, themes: Optional[Iterable[str]] = None) -> int:
+        return sum(entry.count for entry in self.select(themes))
+
+    def _data_path(self, entry: ThemeEntry) -> str:
+        return os.path.join(self.bank_dir, entry.file)
+
+    def _check_size(self, entry: ThemeEntry, path: str):
+        size = os.path.getsize(path)
+        if size != entry.size:
+            raise ValueError(f"{path} modifié depuis la création du catalogue ({size} octets au lieu de "
+                             f"{entry.size}): reconstruire la banque avec build_bank")
+
+    def read_theme(self, theme: str) -> List[Dict[str, Any]]:
+        """Questions validées d'un thème, dans l'ordre du fichier (seul ce fichier est lu)"""
+        entry = self.entry(theme)
+        path = self._data_path(entry)
+        self._check_size(entry, path)
+        with open(path, "rb") as f:
+            data = f.read()
+        if content_hash(data) != entry.hash:
+            raise ValueError(f"{path}: contenu différent du catalogue, reconstruire la banque avec build_bank")
+        return [_parse_line(line, path, number) for number, line in enumerate(data.splitlines(), 1)]
+
+    def read_themes(self, themes: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        questions: List[Dict[str, Any]] = []
+        for entry in self.select(themes):
+            questions.extend(self.read_theme(entry.theme))
+        return questions
+
+    def sample(self, count: int, themes: Optional[Iterable[str]] = None,
+               rng: Optional[random.Random] = None) -> List[Dict[str, Any]]:
+        """
+        Tire `count` questions au hasard parmi les thèmes (tous par défaut).
+
+        Seules les positions et les lignes tirées sont lues. L'empreinte du contenu
+        ne peut pas être vérifiée sans tout relire: seule la taille des fichiers l'est.
+        """
+        rng = rng or random
+        entries = self.select(themes)
+        total = sum(entry.count for entry in entries)
+        picks = rng.sample(range(total), min(count, total))
+
+        # Numéro global -> (thème, position dans le thème)
+        wanted: Dict[int, List[Tuple[int, int]]] = {}
+        for order, pick in enumerate(picks):
+            for entry_number, entry in enumerate(entries):
+                if pick < entry.count:
+                    wanted.setdefault(entry_number, []).append((pick, order))
+                    break
+                pick -= entry.count
+
+        questions: List[Optional[Dict[str, Any]]] = [None] * len(picks)
+        for entry_number, positions in wanted.items():
+            entry = entries[entry_number]
+            path = self._data_path(entry)
+            self._check_size(entry, path)
+            positions.sort()  # lectures dans l'ordre du fichier
+            with open(os.path.join(self.bank_dir, entry.index), "rb") as index_file, open(path, "rb") as data_file:
+                for position, order in positions:
+                    index_file.seek(position * OFFSET.size)
+                    start, end = OFFSET_PAIR.unpack(index_file.read(OFFSET_PAIR.size))
+                    data_file.seek(start)
+                    questions[order] = _parse_line(data_file.read(end - start), path, position + 1)
+        return questions  # type: ignore[return-value]
+
+    def load(self, selection: BankSelection, rng: Optional[random.Random] = None) -> List[Dict[str, Any]]:
+        if selection.sample is not None:
+            return self.sample(selection.sample, selection.themes, rng)
+        return self.read_themes(selection.themes)
+
+
+def _parse_line(line: bytes, path: str, number: int) -> Dict[str, Any]:
+    try:
+        question = json.loads(line)
+        validate_question_format(question)
+    except (json.JSONDecodeError, TypeError, ValueError) as e:
+        raise ValueError(f"{path}, question {number} invalide: {e}")
+    return question
+
+
+def load_bank_questions(path: str, rng: Optional[random.Random] = None) -> List[Dict[str, Any]]:
+    """Questions validées désignées par un chemin de banque (voir parse_bank_path)"""
+    selection = parse_bank_path(path)
+    if selection is None:
+        raise ValueError(f"{path} ne désigne pas une banque par thème")
+    return ThemeBank(selection.bank_dir).load(selection, rng)
+
+
+# --- Construction ----------------------------------------------------------------
+
+class _ThemeWriter:
+    """Fichier JSONL d'une partie de thème en cours d'écriture, avec ses positions et son empreinte"""
+
+    def __init__(self, bank_dir: str, theme: str, slug: str):
+        self.theme = theme
+        self.file = slug + ".jsonl"
+        self.index = slug + ".idx"
+        self.path = os.path.join(bank_dir, self.file)
+        self.index_path = os.path.join(bank_dir, self.index)
+        self.data: IO[bytes] = open(self.path + ".tmp", "wb")
+        self.offsets = array("Q", [0])
+        self.hasher = hashlib.blake2b(digest_size=16)
+
+    @property
+    def count(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def size(self) -> int:
+        return self.offsets[-1]
+
+    def write(self, line: bytes):
+        self.data.write(line)
+        self.hasher.update(line)
+        self.offsets.append(self.offsets[-1] + len(line))
+
+    def close(self) -> Dict[str, Any]:
+        """Termine les fichiers temporaires; retourne l'entrée du catalogue"""
+        self.data.close()
+        offsets = array("Q", self.offsets)
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        with open(self.index_path + ".tmp", "wb") as f:
+            offsets.tofile(f)
+        return {"theme": self.theme, "file": self.file, "index": self.index,
+                "count": self.count, "size": self.size, "hash": self.hasher.hexdigest()}
+
+    def commit(self):
+        os.replace(self.path + ".tmp", self.path)
+        os.replace(self.index_path + ".tmp", self.index_path)
+
+    def abort(self):
+        self.data.close()
+        for path in (self.path + ".tmp", self.index_path + ".tmp"):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class ThemeBankWriter:
+    """
+    Écriture d'une banque par thème, question par question.
+
+    Un thème continue dans une nouvelle partie ("History (2)" dans history_2.jsonl)
+    dès que son fichier dépasserait max_size octets ou max_count questions: chaque
+    fichier reste sous la limite de taille des questionnaires. Les fichiers sont
+    écrits à côté de ceux de la banque et ne les remplacent qu'à close(), qui écrit
+    le catalogue en dernier: une banque en cours de reconstruction reste lisible
+    dans son ancien état.
+    """
+
+    def __init__(self, bank_dir: str, max_size: int = int(THEME_BANK_PART_SIZE_MB * 1024 * 1024),
+                 max_count: Optional[int] = None):
+        os.makedirs(bank_dir, exist_ok=True)
+        self.bank_dir = bank_dir
+        self.max_size = max_size
+        self.max_count = max_count
+        self.parts: Dict[str, List[_ThemeWriter]] = {}  # thème -> parties, la dernière en cours
+        self.slugs: Set[str] = set()
+
+    def _slug(self, base: str) -> str:
+        """Nom de fichier libre: base, puis base_2, base_3... (thèmes aux noms proches)"""
+        slug = base
+        suffix = 2
+        while slug in self.slugs:
+            slug = f"{base}_{suffix}"
+            suffix += 1
+        self.slugs.add(slug)
+        return slug
+
+    def write(self, theme: str, question: Dict[str, Any]):
+        line = json.dumps(question, ensure_ascii=False).encode("utf-8") + b"\n"
+        parts = self.parts.setdefault(theme, [])
+        writer = parts[-1] if parts else None
+        if writer is not None and writer.count and (writer.size + len(line) > self.max_size or
+                                                    (self.max_count and writer.count >= self.max_count)):
+            writer = None
+        if writer is None:
+            number = len(parts) + 1
+            if number == 1:
+                writer = _ThemeWriter(self.bank_dir, theme, self._slug(theme_slug(theme)))
+            else:
+                writer = _ThemeWriter(self.bank_dir, f"{theme} ({number})",
+                                      self._slug(f"{theme_slug(theme)}_{number}"))
+            parts.append(writer)
+        writer.write(line)
+
+    def close(self) -> List[Dict[str, Any]]:
+        """
+        Remplace la banque par les questions écrites.
+
+        Returns:
+            list: Entrées du catalogue, une par partie de thème
+        """
+        writers = [writer for parts in self.parts.values() for writer in parts]
+        entries = [writer.close() for writer in writers]
+        previous_files = set()
+        if os.path.exists(catalog_path(self.bank_dir)):
+            try:
+                previous_files = {name for entry in ThemeBank(self.bank_dir).entries
+                                  for name in (entry.file, entry.index)}
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning(f"Ancien catalogue illisible, remplacé: {e}")
+        for writer in writers:
+            writer.commit()
+        self.parts = {}
+
+        catalog = {"format": CATALOG_FORMAT, "version": CATALOG_VERSION,
+                   "total": sum(entry["count"] for entry in entries), "themes": entries}
+        temp_path = catalog_path(self.bank_dir) + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(catalog, f, ensure_ascii=False, indent=4)
+        os.replace(temp_path, catalog_path(self.bank_dir))
+
+        # Thèmes qui ne font plus partie de la banque
+        current_files = {name for entry in entries for name in (entry["file"], entry["index"])}
+        for name in previous_files - current_files:
+            try:
+                os.remove(os.path.join(self.bank_dir, name))
+            except OSError:
+                pass
+        return entries
+
+    def abort(self):
+        for parts in self.parts.values():
+            for writer in parts:
+                writer.abort()
+        self.parts = {}
+
+
+def build_theme_bank(sources: Sequence[str], bank_dir: str) -> List[Dict[str, Any]]:
+    """
+    Construit (ou reconstruit) une banque par thème à partir de fichiers de questions.
+
+    Les questions sans thème prennent le nom de leur fichier.
+
+    Returns:
+        list: Entrées du catalogue, une par partie de thème
+    """
+    bank = ThemeBankWriter(bank_dir)
+    try:
+        for source in sources:
+            default_theme = os.path.splitext(os.path.basename(source))[0]
+            for question in validate_questions_file(source):
+                bank.write(question.get("theme") or default_theme, question)
+    except BaseException:
+        bank.abort()
+        raise
+    return bank.close()
+
+
+def update_index(questionnaires_dir: str, files: Iterable[Tuple[str, str]]) -> int:
+    """Ajoute à <questionnaires_dir>/index.json les fichiers qui n'y sont pas; retourne le nombre ajouté"""
+    index_path = os.path.join(questionnaires_dir, "index.json")
+    entries: List[Dict[str, Any]] = []
+    if os.path.exists(index_path):
+        with open(index_path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    known = {entry.get("file") for entry in entries}
+    next_id = max((entry.get("id", 0) for entry in entries), default=0) + 1
+    added = 0
+    for file_name, theme in files:
+        if file_name in known:
+            continue
+        entries.append({"id": next_id, "theme": theme, "file": file_name})
+        known.add(file_name)
+        next_id += 1
+        added += 1
+    os.makedirs(questionnaires_dir, exist_ok=True)
+    temp_path = index_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(entries, f, ensure_ascii=False, indent=4)
+    os.replace(temp_path, index_path)
+    return added
+
+
+def register_bank(bank_dir: str, entries: Iterable[Dict[str, Any]],
+                  questionnaires_dir: str = QUESTIONNAIRES_DIR) -> int:
+    """Ajoute chaque partie de thème de la banque à l'index des questionnaires"""
+    relative_dir = os.path.relpath(bank_dir, questionnaires_dir)
+    return update_index(questionnaires_dir, [(f"{relative_dir}/{entry['file']}", entry["theme"])
+                                             for entry in entries])
+
+
+def main(argv: Optional[List[str]] = None):
+    """Commande `build_bank`: découpe des fichiers de questions en banque par thème"""
+    parser = argparse.ArgumentParser(prog="quiz_tiktok.py build_bank",
+                                     description="Construit une banque de questions découpée par thème")
+    parser.add_argument("sources", nargs="+", help="fichiers de questions JSON")
+    parser.add_argument("--output", help="dossier de la banque (par défaut: questionnaires/<premier fichier>)")
+    parser.add_argument("--register", action="store_true",
+                        help="ajoute chaque thème à l'index des questionnaires")
+    args = parser.parse_args(argv)
+
+    bank_dir = args.output or os.path.join(QUESTIONNAIRES_DIR, os.path.splitext(os.path.basename(args.sources[0]))[0])
+    try:
+        entries = build_theme_bank(args.sources, bank_dir)
+    except (OSError, ValueError) as e:
+        print(f"❌ Construction de la banque interrompue: {e}")
+        raise SystemExit(1)
+    print(f"📚 Banque {bank_dir}: {sum(entry['count'] for entry in entries)} questions en {len(entries)} thèmes")
+    for entry in sorted(entries, key=lambda item: -item["count"]):
+        print(f"   {entry['theme']}: {entry['count']}")
+
+    if args.register:
+        added = register_bank(bank_dir, entries)
+        print(f"   Index des questionnaires: {added} thèmes ajoutés")
+
@@ -0,0 +1,332 @@
+"""
+Import hors live de dumps de questions (format Open Trivia DB) dans une banque par
+thème (voir theme_bank, par défaut questionnaires/trivia).
+Les dumps JSON, JSONL ou CSV (éventuellement .gz) sont lus au fil de l'eau:
+entités HTML décodées, réponses normalisées, doublons écartés par empreinte du
+texte normalisé, validation par lots dans un pool de processus, puis écriture
+directe dans la banque (un thème continue dans une nouvelle partie au-delà de
+TRIVIA_IMPORT_SHARD_SIZE questions) et mise à jour de questionnaires/index.json.
+Les questions déjà présentes dans la banque sont recopiées en tête de leur thème.
+Seules les empreintes (64 bits) des questions déjà vues restent en mémoire: le
+reste de la mémoire utilisée ne dépend pas de la taille du dump.
+
+    python quiz_tiktok.py import_trivia dump.json [autre.jsonl ...] [--workers 4]
+"""
+
+import argparse
+import collections
+import csv
+import gzip
+import hashlib
+import html
+import io
+import json
+import os
+import re
+import time
+import unicodedata
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Dict, IO, Iterable, Iterator, List, Optional, Set, Tuple
+
+from config import (
+    QUESTIONNAIRES_DIR, DEFAULT_POINTS, DEFAULT_TIME_LIMIT, MAX_ANSWER_LENGTH,
+    TRIVIA_IMPORT_BATCH_SIZE, TRIVIA_IMPORT_DIR, TRIVIA_IMPORT_SHARD_SIZE, TRIVIA_IMPORT_READ_CHUNK
+)
+from logger_setup import logger
+from theme_bank import ThemeBank, ThemeBankWriter, catalog_path, register_bank
+from validators import validate_question_format
+
+_WHITESPACE = re.compile(r"\s+")
+_NOT_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+# --- Lecture des dumps ---------------------------------------------------------
+
+def open_dump(path: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8", newline="")
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def iter_json_array(file: IO[str], chunk_size: int = TRIVIA_IMPORT_READ_CHUNK) -> Iterator[Any]:
+    """
+    Éléments du premier tableau JSON du fichier, lus par morceaux (liste brute, ou
+    {"response_code": 0, "results": [...]} tel que renvoyé par l'API Open Trivia DB).
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return
+        start = chunk.find("[")
+        if start >= 0:
+            buffer = chunk[start + 1:]
+            break
+
+    position = 0
+    eof = False
+    while True:
+        # Séparateurs entre éléments: blancs et virgules
+        while position < len(buffer) and (buffer[position].isspace() or buffer[position] == ","):
+            position += 1
+        if position < len(buffer) and buffer[position] == "]":
+            return
+        if position < len(buffer):
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+                # Un nombre coupé en fin de morceau se décode sans erreur ("123" de "12345",
+                # "1.5" de "1.5e3"): une valeur n'est sûre que suivie de "," ou "]", ou en fin de fichier
+                after = end
+                while after < len(buffer) and buffer[after].isspace():
+                    after += 1
+                if eof or (after < len(buffer) and buffer[after] in ",]"):
+                    position = end
+                    yield item
+                    continue
+            except json.JSONDecodeError:
+                if eof:
+                    raise ValueError(f"JSON invalide près du caractère {position} du morceau en cours")
+        elif eof:
+            raise ValueError("Fin de fichier avant la fin du tableau JSON")
+        # Élément incomplet: lire la suite (seul le reste non décodé est conservé)
+        chunk = file.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+def iter_dump_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Enregistrements bruts d'un dump, selon son extension (.json, .jsonl/.ndjson, .csv)"""
+    name = path[:-3] if path.endswith(".gz") else path
+    extension = os.path.splitext(name)[1].lower()
+    with open_dump(path) as file:
+        if extension in (".jsonl", ".ndjson"):
+            for line in file:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        elif extension == ".csv":
+            yield from csv.DictReader(file)
+        else:
+            yield from iter_json_array(file)
+
+
+# --- Normalisation ---------------------------------------------------------------
+
+def clean_text(value: Any) -> str:
+    """Entités HTML décodées (&amp;, &#039;...), blancs regroupés"""
+    if not isinstance(value, str):
+        return ""
+    return _WHITESPACE.sub(" ", html.unescape(value)).strip()
+
+
+def normalize_answer(value: Any) -> str:
+    """Réponse telle qu'affichée: nettoyée et sans guillemets ni point final superflus"""
+    answer = clean_text(value)
+    if len(answer) > 1 and answer[0] == answer[-1] and answer[0] in "\"'":
+        answer = answer[1:-1].strip()
+    return answer.rstrip(".").strip()
+
+
+def text_fingerprint(text: str) -> int:
+    """Empreinte du texte normalisé (casse, accents et ponctuation ignorés)"""
+    normalized = unicodedata.normalize("NFKD", text.lower())
+    normalized = "".join(char for char in normalized if not unicodedata.combining(char))
+    normalized = _NOT_ALNUM.sub("", normalized)
+    return int.from_bytes(hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _as_int(value: Any, default: int) -> Any:
+    if value in (None, ""):
+        return default
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    return value  # laissé tel quel: la validation le rejettera s'il n'est pas entier
+
+
+def normalize_record(record: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Convertit un enregistrement (champs Open Trivia DB ou du quiz) en question du quiz.
+
+    Returns:
+        (question, None), ou (None, raison) si l'enregistrement est écarté d'office
+    """
+    if not isinstance(record, dict):
+        return None, "enregistrement qui n'est pas un objet"
+    if str(record.get("type", "")).lower() == "boolean":
+        return None, "question vrai/faux"
+    text = clean_text(record.get("text", record.get("question")))
+    answer = normalize_answer(record.get("answer", record.get("correct_answer")))
+    if answer.lower() in ("true", "false"):
+        return None, "question vrai/faux"
+    if len(answer) > MAX_ANSWER_LENGTH:
+        return None, "réponse trop longue"
+    question = {
+        "text": text,
+        "answer": answer,
+        "points": _as_int(record.get("points"), DEFAULT_POINTS),
+        "time_limit": _as_int(record.get("time_limit"), DEFAULT_TIME_LIMIT),
+        "theme": clean_text(record.get("theme", record.get("category"))) or "Divers",
+    }
+    return question, None
+
+
+def validate_batch(questions: List[Dict[str, Any]]) -> List[Optional[str]]:
+    """Exécutée dans les processus du pool: message d'erreur (ou None) pour chaque question"""
+    errors: List[Optional[str]] = []
+    for question in questions:
+        try:
+            validate_question_format(question)
+            errors.append(None)
+        except ValueError as e:
+            errors.append(str(e))
+    return errors
+
+
+# --- Import ------------------------------------------------------------------------
+
+class ImportReport:
+    def __init__(self):
+        self.read = 0
+        self.imported = 0
+        self.duplicates = 0
+        self.skipped: collections.Counter = collections.Counter()
+        self.invalid: collections.Counter = collections.Counter()
+        self.per_theme: Dict[str, int] = {}
+        self.index_added = 0
+        self.elapsed = 0.0
+
+
+class TriviaImporter:
+    """
+    Importe des dumps dans une banque par thème et l'ajoute à l'index des questionnaires.
+
+    Args:
+        workers: Processus de validation (0: un par cœur, 1: validation dans le processus courant)
+        shard_size: Questions maximum par fichier de thème
+    """
+
+    def __init__(self, bank_dir: str = TRIVIA_IMPORT_DIR, workers: int = 0,
+                 batch_size: int = TRIVIA_IMPORT_BATCH_SIZE, shard_size: int = TRIVIA_IMPORT_SHARD_SIZE,
+                 questionnaires_dir: str = QUESTIONNAIRES_DIR):
+        self.bank_dir = bank_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.shard_size = shard_size
+        self.questionnaires_dir = questionnaires_dir
+        self.report = ImportReport()
+        self.fingerprints: Set[int] = set()
+        self.bank: Optional[ThemeBankWriter] = None
+
+    def run(self, paths: Iterable[str]) -> ImportReport:
+        start = time.perf_counter()
+        self.bank = ThemeBankWriter(self.bank_dir, max_count=self.shard_size)
+        try:
+            self._copy_existing()
+            if self.workers > 1:
+                with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                    self._pipeline(paths, pool)
+            else:
+                self._pipeline(paths, None)
+        except BaseException:
+            self.bank.abort()
+            raise
+        entries = self.bank.close()
+        self.report.index_added = register_bank(self.bank_dir, entries, self.questionnaires_dir)
+        self.report.elapsed = time.perf_counter() - start
+        return self.report
+
+    def _copy_existing(self):
+        """Recopie les questions de la banque existante et relève leurs empreintes"""
+        if not os.path.exists(catalog_path(self.bank_dir)):
+            return
+        bank = ThemeBank(self.bank_dir)
+        for entry in bank.entries:
+            for question in bank.read_theme(entry.theme):
+                self.fingerprints.add(text_fingerprint(clean_text(question["text"])))
+                self.bank.write(question.get("theme") or entry.theme, question)
+
+    def _batches(self, paths: Iterable[str]) -> Iterator[List[Dict[str, Any]]]:
+        batch: List[Dict[str, Any]] = []
+        for path in paths:
+            logger.info(f"Import de {path}")
+            for record in iter_dump_records(path):
+                self.report.read += 1
+                question, reason = normalize_record(record)
+                if question is None:
+                    self.report.skipped[reason] += 1
+                    continue
+                batch.append(question)
+                if len(batch) >= self.batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def _pipeline(self, paths: Iterable[str], pool: Optional[ProcessPoolExecutor]):
+        if pool is None:
+            for batch in self._batches(paths):
+                self._store(batch, validate_batch(batch))
+            return
+        # Nombre borné de lots en vol: la lecture n'avance pas plus vite que l'écriture
+        in_flight: Deque[Tuple[List[Dict[str, Any]], Future]] = collections.deque()
+        for batch in self._batches(paths):
+            in_flight.append((batch, pool.submit(validate_batch, batch)))
+            if len(in_flight) >= self.workers * 2:
+                done_batch, future = in_flight.popleft()
+                self._store(done_batch, future.result())
+        while in_flight:
+            done_batch, future = in_flight.popleft()
+            self._store(done_batch, future.result())
+
+    def _store(self, batch: List[Dict[str, Any]], errors: List[Optional[str]]):
+        """Écrit les questions valides et nouvelles, dans l'ordre du dump"""
+        for question, error in zip(batch, errors):
+            if error is not None:
+                self.report.invalid[error] += 1
+                continue
+            fingerprint = text_fingerprint(question["text"])
+            if fingerprint in self.fingerprints:
+                self.report.duplicates += 1
+                continue
+            self.fingerprints.add(fingerprint)
+            theme = question["theme"]
+            self.bank.write(theme, question)
+            self.report.per_theme[theme] = self.report.per_theme.get(theme, 0) + 1
+            self.report.imported += 1
+
+
+def print_import_report(report: ImportReport):
+    rate = report.read / report.elapsed if report.elapsed else 0
+    print(f"\n📥 Import terminé en {report.elapsed:.1f}s ({rate:.0f} enregistrements/s)")
+    print(f"   Lus: {report.read}  importés: {report.imported}  doublons: {report.duplicates}")
+    for reason, count in report.skipped.most_common():
+        print(f"   Écartés ({reason}): {count}")
+    for reason, count in report.invalid.most_common(5):
+        print(f"   Invalides ({reason}): {count}")
+    for theme, count in sorted(report.per_theme.items(), key=lambda item: -item[1]):
+        print(f"   {theme}: {count}")
+    print(f"   Index des questionnaires: {report.index_added} thèmes ajoutés")
+
+
+def main(argv: Optional[List[str]] = None):
+    """Commande `import_trivia`: importe des dumps dans les banques par thème"""
+    parser = argparse.ArgumentParser(prog="quiz_tiktok.py import_trivia",
+                                     description="Import de dumps Open Trivia DB en banques par thème")
+    parser.add_argument("dumps", nargs="+", help="fichiers .json, .jsonl ou .csv (éventuellement .gz)")
+    parser.add_argument("--output", default=TRIVIA_IMPORT_DIR, help="dossier de la banque par thème")
+    parser.add_argument("--workers", type=int, default=0, help="processus de validation (0: un par cœur)")
+    parser.add_argument("--batch-size", type=int, default=TRIVIA_IMPORT_BATCH_SIZE)
+    parser.add_argument("--shard-size", type=int, default=TRIVIA_IMPORT_SHARD_SIZE,
+                        help="questions maximum par fichier de thème")
+    args = parser.parse_args(argv)
+
+    importer = TriviaImporter(args.output, workers=args.workers, batch_size=args.batch_size,
+                              shard_size=args.shard_size)
+    try:
+        report = importer.run(args.dumps)
+    except (OSError, ValueError) as e:
+        print(f"❌ Import interrompu: {e}")
+        raise SystemExit(1)
+    print_import_report(report)
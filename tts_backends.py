@@ -0,0 +1,226 @@
+"""
+Moteurs de synthèse vocale interchangeables du Quiz TikTok.
+Le moteur est choisi une seule fois au démarrage: SAPI5 (pyttsx3, Windows),
+espeak/espeak-ng (Linux) ou un moteur muet qui enregistre les textes, pour
+faire tourner et mesurer toute la chaîne TTS sur les machines sans audio.
+"""
+
+import abc
+import os
+import shutil
+import subprocess
+import sys
+import time
+import wave
+from typing import List, Optional
+
+from config import TTS_BACKEND, TTS_ESPEAK_VOICE, TTS_VOICE_RATE, TTS_VOICE_VOLUME
+from logger_setup import logger
+from metrics import LatencyHistogram, registry as metrics_registry
+
+
+class TTSBackend(abc.ABC):
+    """
+    Interface commune des moteurs TTS.
+    Les sous-classes implémentent `_speak` et `_save_to_file`; chaque appel
+    est chronométré dans `synthesis_time` (nanosecondes).
+    """
+
+    name = "base"
+    # Les fichiers pré-rendus du cache audio peuvent remplacer la synthèse directe
+    uses_audio_cache = True
+
+    def __init__(self):
+        self.synthesis_time = LatencyHistogram()
+        self.last_duration = 0.0
+
+    @property
+    def voice_id(self) -> str:
+        """Identifiant de la voix (entre dans la clé du cache audio)"""
+        return ""
+
+    def _timed(self, action, text: str):
+        start = time.perf_counter_ns()
+        try:
+            return action(text)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            self.synthesis_time.record(elapsed)
+            self.last_duration = elapsed / 1e9
+            logger.debug(f"TTS [{self.name}]: {self.last_duration * 1000:.0f}ms pour '{text[:40]}'")
+
+    def speak(self, text: str):
+        """Lit le texte et attend la fin de la lecture"""
+        self._timed(self._speak, text)
+
+    def save_to_file(self, text: str, file_path: str) -> bool:
+        """Synthétise le texte dans un fichier WAV; retourne False si non supporté"""
+        return bool(self._timed(lambda t: self._save_to_file(t, file_path), text))
+
+    def close(self):
+        pass
+
+    @abc.abstractmethod
+    def _speak(self, text: str):
+        """Lit le texte (appelée par speak, dans le thread du worker TTS)"""
+
+    def _save_to_file(self, text: str, file_path: str) -> bool:
+        return False
+
+
+class Sapi5Backend(TTSBackend):
+    """Voix Windows via pyttsx3 (à créer dans le thread qui l'utilise: contrainte COM)"""
+
+    name = "sapi5"
+
+    def __init__(self):
+        super().__init__()
+        import pyttsx3
+
+        self._warn_if_not_admin()
+        self.engine = pyttsx3.init(driverName='sapi5')
+
+        # Configurer le taux de parole et le volume
+        try:
+            self.engine.setProperty('rate', TTS_VOICE_RATE)
+            self.engine.setProperty('volume', TTS_VOICE_VOLUME)
+        except Exception as e:
+            print(f"TTS: Erreur lors de la configuration des propriétés: {e}")
+
+        # Essayer de configurer une voix française si disponible
+        try:
+            voices = self.engine.getProperty('voices')
+            print(f"TTS: {len(voices)} voix trouvées")
+
+            for voice in voices:
+                print(f"TTS: Voix disponible - {voice.id}")
+                if 'french' in voice.id.lower() or 'fr' in voice.id.lower():
+                    try:
+                        self.engine.setProperty('voice', voice.id)
+                        print(f"TTS: Voix française sélectionnée: {voice.id}")
+                        break
+                    except Exception as e:
+                        print(f"TTS: Erreur lors de la configuration de la voix {voice.id}: {e}")
+                        continue
+        except Exception as e:
+            print(f"TTS: Erreur lors de la configuration de la voix: {e}")
+
+    @staticmethod
+    def _warn_if_not_admin():
+        import ctypes
+
+        try:
+            is_admin = ctypes.windll.shell32.IsUserAnAdmin()
+        except Exception:
+            is_admin = False
+        if not is_admin:
+            print("TTS: Attention - L'application n'a pas les droits administrateur")
+            print("TTS: Certaines fonctionnalités vocales pourraient ne pas fonctionner")
+
+    @property
+    def voice_id(self) -> str:
+        try:
+            return str(self.engine.getProperty('voice') or "")
+        except Exception:
+            return ""
+
+    def _speak(self, text: str):
+        self.engine.say(text)
+        self.engine.runAndWait()
+
+    def _save_to_file(self, text: str, file_path: str) -> bool:
+        self.engine.save_to_file(text, file_path)
+        self.engine.runAndWait()
+        return os.path.exists(file_path) and os.path.getsize(file_path) > 0
+
+    def close(self):
+        try:
+            self.engine.stop()
+        except Exception:
+            pass
+
+
+class EspeakBackend(TTSBackend):
+    """espeak-ng / espeak en ligne de commande (Linux)"""
+
+    name = "espeak"
+
+    def __init__(self, executable: Optional[str] = None, voice: str = TTS_ESPEAK_VOICE):
+        super().__init__()
+        self.executable = executable or shutil.which("espeak-ng") or shutil.which("espeak")
+        if self.executable is None:
+            raise RuntimeError("espeak-ng/espeak introuvable")
+        self.voice = voice
+        # pyttsx3 exprime le débit en mots/minute comme espeak; volume 0-1 -> amplitude 0-200
+        self.base_args = [self.executable, "-v", voice, "-s", str(TTS_VOICE_RATE),
+                          "-a", str(int(TTS_VOICE_VOLUME * 200))]
+
+    @property
+    def voice_id(self) -> str:
+        return f"espeak:{self.voice}"
+
+    def _speak(self, text: str):
+        subprocess.run(self.base_args + [text], check=False,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def _save_to_file(self, text: str, file_path: str) -> bool:
+        result = subprocess.run(self.base_args + ["-w", file_path, text], check=False,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return result.returncode == 0 and os.path.exists(file_path)
+
+
+class NullBackend(TTSBackend):
+    """Moteur muet: enregistre les textes et écrit des WAV silencieux (tests, benchmarks)"""
+
+    name = "null"
+    uses_audio_cache = False
+
+    def __init__(self, speak_delay: float = 0.0):
+        super().__init__()
+        self.speak_delay = speak_delay
+        self.spoken: List[str] = []
+
+    @property
+    def voice_id(self) -> str:
+        return "null"
+
+    def _speak(self, text: str):
+        self.spoken.append(text)
+        if self.speak_delay:
+            time.sleep(self.speak_delay)
+
+    def _save_to_file(self, text: str, file_path: str) -> bool:
+        with wave.open(file_path, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(16000)
+            wav.writeframes(b"\x00\x00" * 160)
+        return True
+
+
+BACKENDS = {"sapi5": Sapi5Backend, "espeak": EspeakBackend, "null": NullBackend}
+
+
+def create_tts_backend(name: str = TTS_BACKEND) -> TTSBackend:
+    """
+    Crée le moteur configuré ("auto": SAPI5 sous Windows, sinon espeak, sinon muet).
+    À appeler dans le thread qui utilisera le moteur.
+    """
+    if name != "auto":
+        backend = BACKENDS[name]()
+    else:
+        candidates = ["sapi5", "espeak"] if sys.platform == "win32" else ["espeak"]
+        backend = None
+        for candidate in candidates:
+            try:
+                backend = BACKENDS[candidate]()
+                break
+            except Exception as e:
+                logger.info(f"TTS: moteur {candidate} indisponible: {e}")
+        if backend is None:
+            backend = NullBackend()
+    print(f"TTS: Moteur '{backend.name}' initialisé")
+    metrics_registry.add_gauge("quiz_tts_synthesis_p99_seconds",
+                               lambda: backend.synthesis_time.percentile(99) / 1e9,
+                               f"Temps de synthèse par phrase, p99 (moteur {backend.name})")
+    return backend
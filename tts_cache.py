@@ -0,0 +1,166 @@
+"""
+Cache audio des textes lus par la synthèse vocale.
+Les questions sont connues bien avant d'être lues: elles sont synthétisées à
+l'avance (en tâche de fond ou par la commande `tts_cache`) dans des fichiers
+WAV nommés d'après une empreinte du texte, de la voix et du débit. Pendant
+le live, lire une question se limite à jouer un fichier.
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import time
+from typing import Any, Iterable, List, Optional
+
+from config import TTS_CACHE_DIR, TTS_VOICE_RATE, TTS_BACKEND, DEFAULT_QUESTIONNAIRE
+from logger_setup import logger
+
+# Annonces standard lues à chaque partie
+STANDARD_ANNOUNCEMENTS = ("Quiz terminé!",)
+
+try:
+    import winsound
+except ImportError:  # Linux/macOS: lecteur en ligne de commande
+    winsound = None
+
+
+def _command_line_player() -> Optional[List[str]]:
+    for player in (["aplay", "-q"], ["paplay"], ["afplay"]):
+        if shutil.which(player[0]):
+            return player
+    return None
+
+
+def play_audio_file(file_path: str):
+    """Joue un fichier WAV et attend la fin de la lecture"""
+    if winsound is not None:
+        winsound.PlaySound(file_path, winsound.SND_FILENAME)
+        return
+    player = _command_line_player()
+    if player is None:
+        raise RuntimeError("aucun lecteur audio disponible (aplay, paplay, afplay)")
+    subprocess.run(player + [file_path], check=False)
+
+
+class TTSCache:
+    """Fichiers audio pré-rendus, indexés par empreinte (texte, voix, débit)"""
+
+    def __init__(self, cache_dir: str = TTS_CACHE_DIR, voice: str = "", rate: int = TTS_VOICE_RATE):
+        self.cache_dir = cache_dir
+        self.voice = voice or ""
+        self.rate = rate
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @classmethod
+    def for_backend(cls, backend: Any, cache_dir: str = TTS_CACHE_DIR) -> "TTSCache":
+        """Cache correspondant à la voix du moteur et au débit configuré"""
+        return cls(cache_dir, voice=backend.voice_id, rate=TTS_VOICE_RATE)
+
+    def key(self, text: str) -> str:
+        digest = hashlib.sha256(f"{self.voice}\x00{self.rate}\x00{text}".encode("utf-8"))
+        return digest.hexdigest()[:32]
+
+    def path_for(self, text: str) -> str:
+        return os.path.join(self.cache_dir, f"{self.key(text)}.wav")
+
+    def get(self, text: str) -> Optional[str]:
+        """Retourne le fichier audio du texte s'il a déjà été rendu"""
+        path = self.path_for(text)
+        if os.path.exists(path):
+            self.hits += 1
+            return path
+        self.misses += 1
+        return None
+
+    def render(self, backend: Any, text: str) -> Optional[str]:
+        """Synthétise `text` dans le cache avec le moteur (thread du moteur uniquement)"""
+        path = self.path_for(text)
+        if os.path.exists(path):
+            return path
+        temp_path = f"{path}.{os.getpid()}.tmp.wav"
+        if not backend.save_to_file(text, temp_path) or not os.path.exists(temp_path) \
+                or os.path.getsize(temp_path) == 0:
+            return None
+        # Un fichier à moitié écrit n'est jamais visible sous son nom définitif
+        os.replace(temp_path, path)
+        return path
+
+
+def texts_to_prerender(questions: Iterable[Any], themes: Iterable[str] = ()) -> List[str]:
+    """Textes à rendre pour un questionnaire: questions et annonces standard (nettoyés)"""
+    from tts_worker import clean_text_for_tts
+
+    texts = [question.text for question in questions]
+    texts.extend(STANDARD_ANNOUNCEMENTS)
+    texts.extend(f"Nouveau thème: {theme}" for theme in themes)
+    seen = set()
+    cleaned = []
+    for text in texts:
+        text = clean_text_for_tts(text)
+        if text.strip() and text not in seen:
+            seen.add(text)
+            cleaned.append(text)
+    return cleaned
+
+
+def main(argv: Optional[List[str]] = None):
+    """Commande `tts_cache`: rend tous les textes des questionnaires hors live"""
+    from question_bank import load_question_bank
+    from tts_backends import BACKENDS, create_tts_backend
+
+    parser = argparse.ArgumentParser(prog="quiz_tiktok.py tts_cache",
+                                     description="Pré-rendu audio des questions du quiz")
+    parser.add_argument("files", nargs="*", default=[DEFAULT_QUESTIONNAIRE],
+                        help="questionnaires JSON à rendre")
+    parser.add_argument("--cache-dir", default=TTS_CACHE_DIR)
+    parser.add_argument("--backend", default=TTS_BACKEND, choices=["auto"] + sorted(BACKENDS))
+    args = parser.parse_args(argv)
+
+    try:
+        backend = create_tts_backend(args.backend)
+    except Exception as e:
+        print(f"❌ Moteur TTS indisponible: {e}")
+        sys.exit(1)
+    cache = TTSCache.for_backend(backend, args.cache_dir)
+
+    texts: List[str] = []
+    for file_path in args.files:
+        try:
+            texts.extend(texts_to_prerender(load_question_bank(file_path)))
+        except Exception as e:
+            logger.error(f"Questionnaire ignoré {file_path}: {e}")
+    texts = list(dict.fromkeys(texts))
+
+    rendered = skipped = failed = 0
+    start = time.perf_counter()
+    for i, text in enumerate(texts, 1):
+        if os.path.exists(cache.path_for(text)):
+            skipped += 1
+            continue
+        try:
+            if cache.render(backend, text):
+                rendered += 1
+            else:
+                failed += 1
+        except Exception as e:
+            failed += 1
+            logger.error(f"Échec du rendu de '{text[:40]}': {e}")
+        if i % 50 == 0:
+            print(f"  {i}/{len(texts)} textes traités...")
+
+    backend.close()
+    synthesis = backend.synthesis_time
+    print(f"\n🔊 Cache TTS: {rendered} rendus, {skipped} déjà présents, {failed} échecs "
+          f"en {time.perf_counter() - start:.1f}s ({args.cache_dir})")
+    if synthesis.count:
+        print(f"   Synthèse ({backend.name}): p50 {synthesis.percentile(50) / 1e6:.0f}ms, "
+              f"p99 {synthesis.percentile(99) / 1e6:.0f}ms par phrase")
+
+
+if __name__ == "__main__":
+    main()
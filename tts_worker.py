@@ -0,0 +1,218 @@
+"""
+Synthèse vocale du Quiz TikTok dans un thread dédié.
+Un seul thread possède le moteur TTS (voir tts_backends, créé et configuré une fois) et lit les
+textes reçus par une file d'attente à priorités, au lieu de recréer un moteur et un
+thread à chaque annonce. Quand la file est vide, il pré-rend les prochaines
+questions dans le cache audio.
+"""
+
+import collections
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Deque, Hashable, Iterable, List, Optional
+
+from config import TTS_CACHE_ENABLED, TTS_MAX_QUEUE_DELAY
+from logger_setup import logger
+from tts_backends import TTSBackend, create_tts_backend
+from tts_cache import TTSCache, play_audio_file
+
+
+def clean_text_for_tts(text: str) -> str:
+    """Nettoie le texte pour la synthèse vocale"""
+    # Supprimer les emojis et autres caractères spéciaux
+    cleaned = ""
+    for char in text:
+        # Ne garder que les caractères imprimables de base et les accents français
+        if char.isprintable() and (char.isascii() or char in "éèêëàâäîïôöùûüçÉÈÊËÀÂÄÎÏÔÖÙÛÜÇ"):
+            cleaned += char
+    return cleaned
+
+
+# Priorités de la file de lecture (la plus petite passe en premier)
+PRIORITY_WINNER = 0  # annonce du gagnant
+PRIORITY_ANNOUNCEMENT = 1  # fin de quiz, changement de thème
+PRIORITY_QUESTION = 2  # lecture d'une question
+
+
+class SpeechItem:
+    """Texte en attente de lecture"""
+
+    __slots__ = ("priority", "sequence", "text", "queued_at", "question_key")
+
+    def __init__(self, priority: int, sequence: int, text: str, question_key: Optional[Hashable]):
+        self.priority = priority
+        self.sequence = sequence
+        self.text = text
+        self.queued_at = time.perf_counter()
+        self.question_key = question_key
+
+    def __lt__(self, other: "SpeechItem") -> bool:
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+
+class TTSWorker:
+    """
+    Thread de lecture vocale alimenté par une file à priorités.
+
+    Les textes identiques en attente sont fusionnés, l'annonce d'un gagnant
+    annule la lecture encore en attente de la question, et tout texte lié à une
+    question déjà passée ou trop ancien est abandonné au lieu d'être lu en retard.
+
+    Args:
+        backend_factory: Crée et configure le moteur; appelée une seule fois, dans le
+            thread du worker (SAPI5 exige que le moteur reste dans son thread COM)
+        use_cache: Jouer les fichiers pré-rendus et pré-rendre pendant les silences
+        max_delay: Âge maximal (secondes) d'un texte en attente avant abandon
+    """
+
+    def __init__(self, backend_factory: Callable[[], TTSBackend] = create_tts_backend,
+                 use_cache: bool = TTS_CACHE_ENABLED, max_delay: float = TTS_MAX_QUEUE_DELAY):
+        self.backend_factory = backend_factory
+        self.use_cache = use_cache
+        self.max_delay = max_delay
+        self.pending: List[SpeechItem] = []
+        self.condition = threading.Condition()
+        self.current_question_key: Optional[Hashable] = None
+        self.dropped = 0
+        self._sequence = itertools.count()
+        self._stopping = False
+        self.backend: Optional[TTSBackend] = None
+        self.cache: Optional[TTSCache] = None
+        # Textes à pré-rendre quand aucune annonce n'est en attente
+        self.prerender_queue: Deque[str] = collections.deque()
+        self.ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="tts-worker", daemon=True)
+        self._thread.start()
+
+    def speak(self, text: str, priority: int = PRIORITY_ANNOUNCEMENT,
+              question_key: Optional[Hashable] = None):
+        """
+        Met un texte en file; retourne immédiatement.
+
+        Args:
+            priority: PRIORITY_WINNER, PRIORITY_ANNOUNCEMENT ou PRIORITY_QUESTION
+            question_key: Question à laquelle le texte se rapporte (abandonné quand elle est passée)
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return
+        with self.condition:
+            # Le même texte déjà en attente n'est lu qu'une fois ("Quiz terminé!" répété...)
+            if any(item.text == text for item in self.pending):
+                self.dropped += 1
+                return
+            if priority == PRIORITY_WINNER:
+                # La question est résolue: inutile de finir de la lire. L'annonce
+                # elle-même reste lue même si la question suivante s'affiche entre-temps
+                self._remove_pending(lambda item: item.priority == PRIORITY_QUESTION
+                                     and item.question_key == question_key)
+                question_key = None
+            heapq.heappush(self.pending, SpeechItem(priority, next(self._sequence), text, question_key))
+            self.condition.notify()
+
+    def set_current_question(self, question_key: Optional[Hashable]):
+        """Indique la question affichée; les textes des questions précédentes sont abandonnés"""
+        with self.condition:
+            self.current_question_key = question_key
+            self._remove_pending(lambda item: item.question_key is not None
+                                 and item.question_key != question_key)
+
+    def _remove_pending(self, predicate: Callable[[SpeechItem], bool]):
+        kept = [item for item in self.pending if not predicate(item)]
+        if len(kept) != len(self.pending):
+            self.dropped += len(self.pending) - len(kept)
+            heapq.heapify(kept)
+            self.pending = kept
+
+    def prerender(self, texts: Iterable[str]):
+        """Programme le rendu audio de textes qui seront lus plus tard (ex: questions)"""
+        if self.use_cache:
+            self.prerender_queue.extend(texts)
+
+    def stop(self, timeout: float = 1.0):
+        """Arrête le worker après la phrase en cours"""
+        if self._thread is None:
+            return
+        with self.condition:
+            self._stopping = True
+            self.pending.clear()
+            self.condition.notify()
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def _next_item(self) -> Optional[SpeechItem]:
+        """Attend le prochain texte à lire encore d'actualité (None: arrêt ou pré-rendu à faire)"""
+        with self.condition:
+            while True:
+                if self._stopping:
+                    return None
+                while self.pending:
+                    item = heapq.heappop(self.pending)
+                    stale = (item.question_key is not None
+                             and item.question_key != self.current_question_key)
+                    if stale or time.perf_counter() - item.queued_at > self.max_delay:
+                        self.dropped += 1
+                        logger.debug(f"TTS: texte abandonné (périmé): {item.text[:40]}")
+                        continue
+                    return item
+                if self.prerender_queue and self.cache is not None:
+                    # Sans annonce en attente, le temps libre sert au pré-rendu
+                    if not self.condition.wait(timeout=0.05):
+                        return None
+                else:
+                    self.condition.wait()
+
+    def _play(self, text: str):
+        """Joue le fichier pré-rendu s'il existe, sinon synthétise en direct"""
+        path = self.cache.get(text) if self.cache is not None else None
+        if path is not None:
+            try:
+                play_audio_file(path)
+                return
+            except Exception as e:
+                logger.warning(f"TTS: lecture du fichier en cache impossible ({e}), synthèse directe")
+        self.backend.speak(text)
+
+    def _prerender_next(self):
+        text = self.prerender_queue.popleft()
+        try:
+            self.cache.render(self.backend, text)
+        except Exception as e:
+            logger.warning(f"TTS: pré-rendu impossible, cache désactivé: {e}")
+            self.cache = None
+            self.prerender_queue.clear()
+
+    def _run(self):
+        try:
+            self.backend = self.backend_factory()
+        except Exception as e:
+            print(f"TTS: Erreur lors de l'initialisation du moteur: {e}")
+            self.backend = None
+        finally:
+            self.ready.set()
+        if self.backend is None:
+            print("TTS: Échec de l'initialisation du moteur, synthèse vocale désactivée")
+            return
+        if self.use_cache and self.backend.uses_audio_cache:
+            self.cache = TTSCache.for_backend(self.backend)
+
+        while True:
+            item = self._next_item()
+            if item is None:
+                if self._stopping:
+                    break
+                if self.prerender_queue:
+                    self._prerender_next()
+                continue
+            logger.debug(f"TTS: lecture après {(time.perf_counter() - item.queued_at) * 1000:.0f}ms d'attente")
+            try:
+                self._play(item.text)
+            except Exception as e:
+                print(f"TTS: Erreur lors de la lecture: {e}")
+
+        self.backend.close()